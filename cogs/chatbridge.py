@@ -1,32 +1,223 @@
+import heapq
+import asyncio
 import discord
 import logging
+from collections import deque
 from discord.ext import commands
 
-from core import EventManager, EventType
+from models import AppState
+from core import EventManager, EventType, metrics
 
 logger = logging.getLogger(__name__)
 
+BACKFILL_LIMIT = 100 # 재연결 후 채널마다 가져올 최대 메시지 수
+BACKFILL_CONCURRENCY = 4 # 동시에 기록을 가져올 채널 수
+RECENT_ID_LIMIT = 5000 # 중복 전달을 막기 위해 기억할 최근 메시지 ID 수
+
+_MESSAGES_RECEIVED = metrics.counter(
+    "discord_messages_received_total", "Messages delivered to the app, by source ('duplicate' for dropped redeliveries).",
+    ("account", "source"),
+)
+
 class ChatBridge(commands.Cog):
-    def __init__(self, bot: commands.Bot, event_manager: EventManager):
+    def __init__(self, bot: commands.Bot, event_manager: EventManager, app_state: AppState):
         self.bot = bot
         self.event_manager = event_manager
-    
+        self.app_state = app_state
+        # 채널별 마지막으로 전달한 메시지 ID. 재연결 후 이 ID 이후의 메시지를 가져옵니다.
+        self.last_seen: dict[int, int] = {}
+        self._recent_ids: set[int] = set()
+        self._recent_order: deque[int] = deque()
+        # 연결이 끊긴 시점의 (Snowflake, 채널별 마지막 메시지 ID). 재연결 직후 도착한 메시지가
+        # last_seen을 앞당겨도 끊긴 구간을 빠뜨리지 않도록 끊긴 시점의 값을 따로 보관합니다.
+        self._gap: tuple[int, dict[int, int]] | None = None
+        self._backfill_task: asyncio.Task | None = None
+        self._backfill_gap: tuple[int, dict[int, int]] | None = None
+        self._backfill_channels: dict[int, discord.abc.Messageable] = {}
+        # 보충 중인 채널에 새로 도착한 메시지. 보충한 메시지보다 먼저 전달되지 않도록 붙잡아 두었다가 ID 순서로 함께 전달합니다.
+        self._held: dict[int, list[discord.Message]] | None = None
+        account = event_manager.name
+        self._received = {source: _MESSAGES_RECEIVED.labels(account, source) for source in ('gateway', 'backfill', 'duplicate')}
+
+    def _remember(self, message: discord.Message) -> bool:
+        """처음 보는 메시지면 기록하고 True를, 이미 전달한 메시지면 False를 반환합니다."""
+        if message.id in self._recent_ids:
+            return False
+        self._recent_ids.add(message.id)
+        self._recent_order.append(message.id)
+        if len(self._recent_order) > RECENT_ID_LIMIT:
+            self._recent_ids.discard(self._recent_order.popleft())
+        if message.id > self.last_seen.get(message.channel.id, 0):
+            self.last_seen[message.channel.id] = message.id
+        return True
+
     @commands.Cog.listener()
     async def on_ready(self):
-        """봇이 Discord에 연결될 때 호출됩니다."""
+        """봇이 Discord에 연결될 때 호출됩니다. (세션을 새로 만든 재연결 시에도 호출됨)"""
         logger.info("Bot is ready and connected to Discord as %s (ID: %s)", self.bot.user, self.bot.user.id)
+        self.app_state.is_bot_ready = True
         await self.event_manager.publish(EventType.BOT_STATUS_READY, self.bot.user)
         # 이 시점에서 bot_service가 Discord Bot 객체를 통해 데이터에 접근할 준비가 됩니다.
-    
+        self._schedule_backfill()
+
+    @commands.Cog.listener()
+    async def on_disconnect(self):
+        """연결이 끊긴 시점을 기록합니다. 여러 번 끊기면 가장 처음 시점을 유지합니다."""
+        if self._gap is None:
+            self._gap = (discord.utils.time_snowflake(discord.utils.utcnow()), dict(self.last_seen))
+
+    @commands.Cog.listener()
+    async def on_resumed(self):
+        """세션이 재개될 때 호출됩니다."""
+        self._schedule_backfill()
+
+    def _schedule_backfill(self):
+        if self._gap is None:
+            return
+        gap, self._gap = self._gap, None
+        channels = {ch.id: ch for ch in [self.app_state.current_channel, *self.app_state.pane_channels] if ch}
+        if self._backfill_task and not self._backfill_task.done():
+            # 진행 중인 보충이 있으면 취소하고, 두 구간 중 더 이른 시점부터 두 보충의 채널을 모두 다시 가져옵니다.
+            # 붙잡아 둔 메시지는 새 보충이 이어받아 전달합니다.
+            self._backfill_task.cancel()
+            previous_start, previous_seen = self._backfill_gap
+            seen = {ch: min(msg_id, previous_seen.get(ch, previous_start)) for ch, msg_id in gap[1].items()}
+            gap = (min(gap[0], previous_start), {**previous_seen, **seen})
+            channels = {**self._backfill_channels, **channels}
+        if not channels:
+            return
+        self._backfill_gap = gap
+        self._backfill_channels = channels
+        # 태스크가 시작되기 전에 도착하는 메시지도 붙잡도록 여기서 바로 설정합니다.
+        self._held = self._held or {}
+        for channel_id in channels:
+            self._held.setdefault(channel_id, [])
+        self._backfill_task = asyncio.create_task(self._backfill(channels, *gap))
+
+    async def _fetch_missed(self, channel: discord.TextChannel, after_id: int, semaphore: asyncio.Semaphore) -> list[discord.Message]:
+        after = discord.Object(id=after_id)
+        async with semaphore:
+            try:
+                return [msg async for msg in channel.history(limit=BACKFILL_LIMIT, after=after, oldest_first=True)]
+            except discord.HTTPException as e:
+                logger.warning("Failed to backfill channel #%s: %s", channel.name, e)
+                return []
+
+    async def _backfill(self, channels: dict[int, discord.TextChannel], gap_start: int, seen_at_gap: dict[int, int]):
+        """
+        연결이 끊긴 동안 놓친 메시지를 보고 있는 채널(현재 채널, 추가 창)마다 가져와 전달합니다.
+        채널들은 동시에(최대 BACKFILL_CONCURRENCY개) 가져오고, 이미 전달한 메시지는 제외한 뒤 그동안 붙잡아 둔
+        실시간 메시지와 함께 Snowflake 순서로 합쳐 전달합니다. 취소되면 붙잡아 둔 메시지는 다음 보충이 전달합니다.
+        """
+        logger.info("Backfilling %d channels after reconnect.", len(channels))
+        missed, truncated = [], []
+        try:
+            semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+            results = await asyncio.gather(*(
+                self._fetch_missed(ch, seen_at_gap.get(ch.id, gap_start), semaphore) for ch in channels.values()
+            ))
+            missed = [message for message in heapq.merge(*results, key=lambda msg: msg.id) if self._remember(message)]
+            truncated = [ch.name for ch, messages in zip(channels.values(), results) if len(messages) >= BACKFILL_LIMIT]
+        except Exception:
+            logger.exception("Backfill failed; delivering held messages only.")
+        self._received['backfill'].inc(len(missed))
+        await self._release_held(missed)
+
+        logger.info("Backfill recovered %d messages (truncated channels: %s)", len(missed), truncated)
+        if missed:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 연결이 끊긴 동안의 메시지 {len(missed)}개를 가져왔습니다.")
+        if truncated:
+            names = ", ".join(f"#{name}" for name in truncated)
+            await self.event_manager.publish(
+                EventType.UI_TEXT_SHOW_REQUEST,
+                f"[정보] {names} 채널은 놓친 메시지가 {BACKFILL_LIMIT}개를 넘어 일부만 가져왔습니다. '/read'로 확인하세요.",
+            )
+
+    async def _release_held(self, missed: list[discord.Message]):
+        """
+        보충한 메시지와 붙잡아 둔 메시지를 ID 순서로 전달합니다. 전달하는 동안 새로 붙잡힌 메시지도 이어서 전달하고,
+        더 없을 때 (사이에 await 없이) 붙잡기를 끝내므로 이후의 실시간 메시지가 앞의 메시지를 앞지르지 않습니다.
+        """
+        while True:
+            held = sorted((message for messages in self._held.values() for message in messages), key=lambda msg: msg.id)
+            for messages in self._held.values():
+                messages.clear()
+            if not missed and not held:
+                self._held = None
+                return
+            pending = list(heapq.merge(missed, held, key=lambda msg: msg.id))
+            missed = []
+            for position, message in enumerate(pending):
+                try:
+                    await self.event_manager.publish(EventType.MESSAGE_RECEIVED, message)
+                except asyncio.CancelledError:
+                    # 다음 보충이 이어서 전달하도록 아직 전달하지 않은 메시지를 되돌려 놓습니다.
+                    for rest in pending[position + 1:]:
+                        self._held.setdefault(rest.channel.id, []).append(rest)
+                    raise
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         """새로운 메시지가 도착할 때 호출됩니다."""
+        if not self._remember(message):
+            self._received['duplicate'].inc()
+            return # 재개 시 재전송되었거나 보충으로 이미 전달한 메시지
 
-        await self.event_manager.publish(EventType.MESSAGE_RECEIVED, message)
+        self._received['gateway'].inc()
+        held = self._held.get(message.channel.id) if self._held else None
+        if held is not None:
+            held.append(message) # 보충이 끝나면 보충한 메시지와 함께 ID 순서로 전달됩니다.
+        else:
+            await self.event_manager.publish(EventType.MESSAGE_RECEIVED, message)
 
-        if message.author != self.bot.user:
+        if message.author != self.bot.user and logger.isEnabledFor(logging.DEBUG):
             logger.debug(
                 "New message received in #%s from %s",
                 message.channel.name,
-                message.author.name
+                message.author.name,
+                extra={
+                    'event': 'MESSAGE_RECEIVED',
+                    'guild_id': message.guild.id if message.guild else None,
+                    'channel_id': message.channel.id,
+                    'message_id': message.id,
+                    'rate_key': ('message_received', message.channel.id), # 채널별로 빈도 제한
+                },
             )
+
+    @commands.Cog.listener()
+    async def on_message_edit(self, before: discord.Message, after: discord.Message):
+        """캐시된 메시지가 수정될 때 호출됩니다."""
+        await self.event_manager.publish(EventType.MESSAGE_UPDATED, after)
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        """메시지가 삭제될 때 호출됩니다. (캐시 여부와 무관)"""
+        await self.event_manager.publish(EventType.MESSAGE_DELETED, payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        """서버 멤버 정보가 바뀔 때 호출됩니다. 표시 이름이 바뀐 경우에만 알립니다."""
+        if before.display_name != after.display_name:
+            logger.debug("Member %s display name changed", after.id)
+            await self.event_manager.publish(EventType.DISPLAY_NAMES_UPDATED)
+
+    @commands.Cog.listener()
+    async def on_user_update(self, before: discord.User, after: discord.User):
+        """유저 정보가 바뀔 때 호출됩니다. 표시 이름이 바뀐 경우에만 알립니다."""
+        if before.display_name != after.display_name:
+            logger.debug("User %s display name changed", after.id)
+            await self.event_manager.publish(EventType.DISPLAY_NAMES_UPDATED)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role):
+        """역할 정보가 바뀔 때 호출됩니다. 이름이 바뀐 경우에만 알립니다."""
+        if before.name != after.name:
+            logger.debug("Role %s renamed", after.id)
+            await self.event_manager.publish(EventType.DISPLAY_NAMES_UPDATED)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        """채널 정보가 바뀔 때 호출됩니다. 이름이 바뀐 경우에만 알립니다."""
+        if before.name != after.name:
+            logger.debug("Channel %s renamed", after.id)
+            await self.event_manager.publish(EventType.DISPLAY_NAMES_UPDATED)
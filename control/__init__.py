@@ -0,0 +1,2 @@
+from .protocol import DEFAULT_SOCKET_PATH
+from .client import ControlClient
@@ -0,0 +1,103 @@
+import json
+import asyncio
+import itertools
+from typing import AsyncIterator
+
+from .protocol import DEFAULT_SOCKET_PATH, MAX_LINE_BYTES, encode
+
+class ControlClient:
+    """
+    로컬 제어 API 클라이언트입니다. 하나의 연결로 여러 요청을 동시에 보낼 수 있습니다.
+    (discord.py 등 봇 의존성 없이 사용할 수 있습니다.)
+
+        async with ControlClient() as client:
+            await client.request('send', text='배포 완료')
+            events = await client.request('read', limit=20, channel_id=123456789012345678) # 현재 채널을 바꾸지 않음
+    """
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH):
+        self.socket_path = socket_path
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._ids = itertools.count(1)
+        self._queues: dict[object, asyncio.Queue] = {}
+
+    async def __aenter__(self) -> "ControlClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_LINE_BYTES)
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def close(self):
+        if self._read_task:
+            self._read_task.cancel()
+        if self._writer:
+            self._writer.close()
+            await self._writer.wait_closed()
+
+    async def _read_loop(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            payload = json.loads(line)
+            queue = self._queues.get(payload.get('id'))
+            if queue is not None:
+                queue.put_nowait(payload)
+        # 연결이 끊기면 대기 중인 모든 요청을 깨웁니다.
+        for queue in self._queues.values():
+            queue.put_nowait({'type': 'done', 'ok': False, 'error': 'connection closed'})
+
+    def _register(self, op: str, params: dict) -> tuple[dict, asyncio.Queue]:
+        request = {'id': next(self._ids), 'op': op, **params}
+        queue = asyncio.Queue()
+        self._queues[request['id']] = queue
+        return request, queue
+
+    async def _collect(self, request_id, queue: asyncio.Queue) -> list[dict]:
+        events = []
+        try:
+            while True:
+                payload = await queue.get()
+                if payload.get('type') == 'done':
+                    events.append(payload)
+                    return events
+                events.append(payload)
+        finally:
+            self._queues.pop(request_id, None)
+
+    async def request(self, op: str, **params) -> list[dict]:
+        """요청 하나를 보내고 'done'까지의 모든 응답 이벤트를 반환합니다."""
+        request, queue = self._register(op, params)
+        self._writer.write(encode(request))
+        await self._writer.drain()
+        return await self._collect(request['id'], queue)
+
+    async def batch(self, requests: list[tuple[str, dict]]) -> list[list[dict]]:
+        """여러 요청을 한 줄로 묶어 보내고, 요청 순서대로 응답 목록을 반환합니다."""
+        registered = [self._register(op, params) for op, params in requests]
+        self._writer.write(encode([request for request, _ in registered]))
+        await self._writer.drain()
+        return await asyncio.gather(*(self._collect(request['id'], queue) for request, queue in registered))
+
+    async def subscribe(self, channel_ids: list[int] | None = None) -> AsyncIterator[dict]:
+        """새 메시지 스트림을 구독합니다. 반복을 멈추면 구독을 해제합니다."""
+        request, queue = self._register('subscribe', {'channel_ids': channel_ids})
+        self._writer.write(encode(request))
+        await self._writer.drain()
+        try:
+            while True:
+                payload = await queue.get()
+                if payload.get('type') == 'message_received':
+                    yield payload['message']
+                elif payload.get('type') == 'done':
+                    return
+        finally:
+            self._queues.pop(request['id'], None)
+            if self._writer and not self._writer.is_closing():
+                self._writer.write(encode({'id': None, 'op': 'unsubscribe', 'subscription': request['id']}))
@@ -0,0 +1,81 @@
+"""
+로컬 제어 API 부하 테스트.
+
+실행 중인 봇(python main.py --control-socket)에 여러 클라이언트를 동시에 연결하여
+요청을 보내고 처리량과 지연 시간 분포를 출력합니다.
+
+    python -m control.load_test --clients 20 --requests 200 --op command --command "/help"
+    python -m control.load_test --clients 4 --requests 50 --op send --text "load test" --batch 10
+"""
+
+import time
+import asyncio
+import argparse
+import statistics
+
+from .client import ControlClient
+from .protocol import DEFAULT_SOCKET_PATH
+
+def _build_params(args: argparse.Namespace) -> dict:
+    if args.op == 'command':
+        return {'command': args.command}
+    if args.op == 'send':
+        return {'text': args.text}
+    if args.op == 'read':
+        return {'limit': args.limit}
+    if args.op == 'search':
+        return {'query': args.query}
+    return {}
+
+async def _run_client(args: argparse.Namespace, latencies: list[float], failures: list[int]):
+    params = _build_params(args)
+    async with ControlClient(args.socket) as client:
+        sent = 0
+        while sent < args.requests:
+            size = min(args.batch, args.requests - sent)
+            started = time.perf_counter()
+            if size == 1:
+                results = [await client.request(args.op, **params)]
+            else:
+                results = await client.batch([(args.op, params)] * size)
+            elapsed = time.perf_counter() - started
+            for events in results:
+                latencies.append(elapsed)
+                if not events or not events[-1].get('ok'):
+                    failures.append(1)
+            sent += size
+
+async def main(args: argparse.Namespace):
+    latencies: list[float] = []
+    failures: list[int] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(_run_client(args, latencies, failures) for _ in range(args.clients)))
+    total = time.perf_counter() - started
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"clients={args.clients} requests={count} failures={len(failures)} elapsed={total:.2f}s")
+    print(f"throughput={count / total:.1f} req/s")
+    if latencies:
+        print(
+            f"latency ms: mean={statistics.mean(latencies) * 1000:.1f} "
+            f"p50={latencies[count // 2] * 1000:.1f} "
+            f"p95={latencies[min(count - 1, int(count * 0.95))] * 1000:.1f} "
+            f"max={latencies[-1] * 1000:.1f}"
+        )
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="로컬 제어 API 부하 테스트")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH)
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=100, help="클라이언트당 요청 수")
+    parser.add_argument("--batch", type=int, default=1, help="한 줄에 묶어 보낼 요청 수")
+    parser.add_argument("--op", default='command', choices=['command', 'send', 'read', 'search'])
+    parser.add_argument("--command", default='/help')
+    parser.add_argument("--text", default='load test')
+    parser.add_argument("--query", default='test')
+    parser.add_argument("--limit", type=int, default=20)
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,101 @@
+"""
+로컬 제어 API 프로토콜 정의.
+
+Unix 도메인 소켓 위에서 줄 단위 JSON(NDJSON)을 주고받습니다.
+- 요청: {"id": 1, "op": "send", "text": "안녕하세요"}
+        한 줄에 요청 배열([{...}, {...}])을 보내면 일괄(batch) 요청으로 처리합니다.
+- 응답: 요청 처리 중 발생한 이벤트마다 {"id": 1, "type": "...", ...} 한 줄,
+        마지막으로 {"id": 1, "type": "done", "ok": true, "elapsed_ms": ...}
+- subscribe 요청은 unsubscribe 전까지 {"id": ..., "type": "message_received", ...}를 계속 전송합니다.
+- 모든 요청에 "channel_id"를 주면 현재 채널 대신 그 채널에서 실행합니다. (예: {"op": "send", "channel_id": 123, "text": "..."})
+  현재 채널은 바꾸지 않으므로 여러 클라이언트가 서로 다른 채널을 동시에 다룰 수 있습니다.
+- 요청이 객체가 아니거나 값의 타입이 맞지 않으면 {"type": "error"}와 {"type": "done", "ok": false}로 응답합니다.
+
+클라이언트는 TUI와 같은 app_state(선택한 서버/채널, 캐시)를 공유하므로, '/setchannel' 등으로 바꾼 상태는 TUI와
+다른 클라이언트에도 그대로 적용됩니다. 소켓에 접근할 수 있는 프로세스는 봇을 완전히 제어할 수 있는 것으로 취급하며,
+프로세스나 화면 자체를 다루는 명령어(DENIED_COMMANDS)만 거부합니다.
+"""
+
+import os
+import json
+import tempfile
+
+DEFAULT_SOCKET_PATH = os.getenv(
+    'CONTROL_SOCKET',
+    os.path.join(tempfile.gettempdir(), f"discord_cli_bot-{os.getuid()}.sock")
+)
+
+# 제어 API로 실행할 수 없는 명령어: 봇 프로세스를 끝내거나 TUI가 보고 있는 계정을 바꿉니다.
+DENIED_COMMANDS = {'/quit', '/q', '/account', '/acc'}
+
+# 한 줄의 최대 길이 (일괄 요청 포함)
+MAX_LINE_BYTES = 1024 * 1024
+
+def _optional_int(request: dict, key: str) -> int | None:
+    value = request.get(key)
+    if value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+        raise ValueError(f"{key} 값은 정수여야 합니다.")
+    return value
+
+def _int(request: dict, key: str, default: int) -> int:
+    value = _optional_int(request, key)
+    return default if value is None else value
+
+def _string(request: dict, key: str) -> str:
+    value = request.get(key, '')
+    if not isinstance(value, str):
+        raise ValueError(f"{key} 값은 문자열이어야 합니다.")
+    return value
+
+def validate_request(request) -> None:
+    """
+    요청 객체의 모양을 검사합니다. 객체가 아니거나 id, channel_id, channel_ids, subscription 값의 타입이 맞지 않으면
+    ValueError를 발생시킵니다. (op별 값은 build_command가 검사)
+    """
+    if not isinstance(request, dict):
+        raise ValueError("요청은 JSON 객체여야 합니다.")
+    for key in ('id', 'subscription'):
+        if not isinstance(request.get(key), (str, int, float, type(None))):
+            raise ValueError(f"{key} 값은 문자열, 숫자 또는 null이어야 합니다.")
+    if not isinstance(request.get('op', 'command'), str):
+        raise ValueError("op 값은 문자열이어야 합니다.")
+    _optional_int(request, 'channel_id')
+    channel_ids = request.get('channel_ids')
+    if channel_ids is not None and (
+        not isinstance(channel_ids, list) or not all(isinstance(value, int) and not isinstance(value, bool) for value in channel_ids)
+    ):
+        raise ValueError("channel_ids 값은 정수 배열이어야 합니다.")
+
+def build_command(request: dict) -> str:
+    """
+    op 요청을 CommandExecutor가 실행할 입력 한 줄로 변환합니다.
+    알 수 없는 op나 필수 값이 없으면 ValueError를 발생시킵니다.
+    """
+    op = request.get('op', 'command')
+    if op == 'command':
+        command = _string(request, 'command')
+        if not command.startswith('/'):
+            raise ValueError("command 요청에는 '/'로 시작하는 command 값이 필요합니다.")
+        if command.split(' ', 1)[0].lower() in DENIED_COMMANDS:
+            raise ValueError(f"제어 API로는 실행할 수 없는 명령어입니다: {command.split(' ', 1)[0]}")
+        return command
+    if op == 'send':
+        text = _string(request, 'text')
+        if not text or text.startswith('/'):
+            raise ValueError("send 요청에는 '/'로 시작하지 않는 text 값이 필요합니다.")
+        return text
+    if op == 'read':
+        return f"/read {_int(request, 'limit', 50)}"
+    if op == 'search':
+        query = _string(request, 'query')
+        if not query:
+            raise ValueError("search 요청에는 query 값이 필요합니다.")
+        return f"/search {query}"
+    if op == 'files':
+        return f"/files {_int(request, 'limit', 50)}"
+    if op == 'download':
+        return f"/download {_int(request, 'index', 1)}"
+    raise ValueError(f"알 수 없는 op입니다: {op}")
+
+def encode(payload) -> bytes:
+    return (json.dumps(payload, ensure_ascii=False, default=str) + "\n").encode('utf-8')
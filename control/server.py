@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import asyncio
+import logging
+
+from models import AppState
+from core import EventManager, RequestContext
+from controllers import CommandExecutor
+from views.json_event_bridge import JsonEventBridge
+
+from .protocol import DEFAULT_SOCKET_PATH, MAX_LINE_BYTES, build_command, encode, validate_request
+
+logger = logging.getLogger(__name__)
+
+class ClientConnection:
+    """
+    제어 API에 연결된 클라이언트 하나를 나타냅니다.
+    응답은 대기열에 모았다가 쓰기 태스크가 한 번에 묶어서 전송합니다.
+    """
+    def __init__(self, server: "ControlServer", reader: asyncio.StreamReader, writer: asyncio.StreamWriter, max_inflight: int):
+        self.server = server
+        self.reader = reader
+        self.writer = writer
+        self.subscriptions: dict[object, set[int] | None] = {} # 구독 id -> 채널 ID 필터 (None이면 전체)
+        self.dropped = 0
+        self._outbox: asyncio.Queue[bytes] = asyncio.Queue()
+        self._inflight = asyncio.Semaphore(max_inflight)
+        self._tasks: set[asyncio.Task] = set()
+
+    def send(self, payload: dict):
+        self._outbox.put_nowait(encode(payload))
+
+    def send_stream(self, payload: dict):
+        """구독 스트림 전송. 클라이언트가 읽지 못해 대기열이 넘치면 버립니다."""
+        if self._outbox.qsize() >= self.server.max_stream_backlog:
+            self.dropped += 1
+            return
+        self.send(payload)
+
+    async def _write_loop(self):
+        while True:
+            chunks = [await self._outbox.get()]
+            while not self._outbox.empty():
+                chunks.append(self._outbox.get_nowait())
+            self.writer.write(b"".join(chunks))
+            await self.writer.drain()
+
+    async def serve(self):
+        write_task = asyncio.create_task(self._write_loop())
+        try:
+            while not self.reader.at_eof():
+                line = await self.reader.readline()
+                if not line.strip():
+                    continue
+                try:
+                    requests = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.send({'id': None, 'type': 'error', 'message': f"잘못된 JSON 입력입니다: {e}"})
+                    continue
+                # 배열은 일괄 요청으로 처리합니다.
+                for request in requests if isinstance(requests, list) else [requests]:
+                    await self._dispatch(request)
+        except (ConnectionResetError, asyncio.IncompleteReadError, ValueError):
+            logger.debug("Control client disconnected abruptly.")
+        finally:
+            for task in self._tasks:
+                task.cancel()
+            write_task.cancel()
+            # 남은 응답은 소켓 버퍼에 넘기고 연결을 닫습니다. (close가 버퍼를 비운 뒤 닫음)
+            remaining = []
+            while not self._outbox.empty():
+                remaining.append(self._outbox.get_nowait())
+            if remaining and not self.writer.is_closing():
+                self.writer.write(b"".join(remaining))
+            self.writer.close()
+
+    def _reject(self, request_id, message: str):
+        self.send({'id': request_id, 'type': 'error', 'message': message})
+        self.send({'id': request_id, 'type': 'done', 'ok': False})
+
+    async def _dispatch(self, request: dict):
+        try:
+            validate_request(request)
+        except ValueError as e:
+            self._reject(request.get('id') if isinstance(request, dict) else None, str(e))
+            return
+        request_id = request.get('id')
+        op = request.get('op', 'command')
+
+        if op == 'subscribe':
+            channel_ids = request.get('channel_ids')
+            self.subscriptions[request_id] = set(channel_ids) if channel_ids else None
+            self.send({'id': request_id, 'type': 'subscribed', 'channel_ids': channel_ids})
+            return
+        if op == 'unsubscribe':
+            self.subscriptions.pop(request.get('subscription'), None)
+            self.send({'id': request_id, 'type': 'done', 'ok': True})
+            return
+
+        try:
+            text = build_command(request)
+        except ValueError as e:
+            self._reject(request_id, str(e))
+            return
+
+        # 클라이언트별 처리 중 요청 수를 제한하여 한 클라이언트가 실행기를 독점하지 않게 합니다.
+        await self._inflight.acquire()
+        started = time.perf_counter()
+        errors = []
+
+        def emit(payload: dict):
+            if payload.get('type') == 'error':
+                errors.append(payload)
+            self.send({'id': request_id, **payload})
+
+        context = RequestContext(request_id, emit, origin=self.server, channel_id=request.get('channel_id'))
+        task = self.server.executor.submit(text, context)
+        self._tasks.add(task)
+
+        def on_done(task: asyncio.Task):
+            self._tasks.discard(task)
+            self._inflight.release()
+            failed = task.cancelled() or task.exception() is not None or bool(errors)
+            self.send({
+                'id': request_id,
+                'type': 'done',
+                'ok': not failed,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            })
+        task.add_done_callback(on_done)
+
+
+class ControlServer:
+    """
+    실행 중인 봇을 다른 로컬 프로세스가 사용할 수 있도록 Unix 도메인 소켓 API를 제공합니다.
+    여러 클라이언트가 하나의 gateway 세션을 공유하며, 요청은 CommandExecutor를 통해 실행됩니다.
+    클라이언트는 TUI와 같은 상태를 다루므로 소켓은 실행한 사용자만 접근할 수 있게 만듭니다. (protocol.py 참고)
+    """
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        app_state: AppState,
+        event_manager: EventManager,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_inflight_per_client: int = 32,
+        max_stream_backlog: int = 1000,
+    ):
+        self.executor = executor
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.socket_path = socket_path
+        self.max_inflight_per_client = max_inflight_per_client
+        self.max_stream_backlog = max_stream_backlog
+        self.clients: set[ClientConnection] = set()
+        self._server: asyncio.AbstractServer | None = None
+        self.bridge = JsonEventBridge(app_state, event_manager, self, self._broadcast)
+
+    def register_event_listeners(self):
+        logger.debug("Registering control server event listeners...")
+        self.bridge.register_event_listeners()
+
+    def _broadcast(self, payload: dict):
+        """요청과 무관한 이벤트 중 새 메시지를 구독 중인 클라이언트에게 전달합니다."""
+        if payload.get('type') != 'message_received':
+            return
+        channel_id = payload['message']['channel_id']
+        for client in self.clients:
+            for subscription_id, channel_ids in client.subscriptions.items():
+                if channel_ids is None or channel_id in channel_ids:
+                    client.send_stream({'id': subscription_id, **payload})
+
+    async def start(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path) # 이전 실행에서 남은 소켓 파일
+        # 소켓 파일은 만들어지는 순간부터 같은 사용자만 접근할 수 있어야 하므로, 만든 뒤 chmod하지 않고 umask를 건 채 bind합니다.
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path, limit=MAX_LINE_BYTES)
+        finally:
+            os.umask(previous_umask)
+        logger.info("Control API listening on %s", self.socket_path)
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        logger.info("Control API stopped.")
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        client = ClientConnection(self, reader, writer, self.max_inflight_per_client)
+        self.clients.add(client)
+        logger.info("Control client connected (%d clients).", len(self.clients))
+        try:
+            await client.serve()
+        finally:
+            self.clients.discard(client)
+            logger.info("Control client disconnected (%d clients, %d stream messages dropped).", len(self.clients), client.dropped)
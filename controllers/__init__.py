@@ -1 +1,3 @@
 from .command_controller import CommandController
+from .command_executor import CommandExecutor
+from .account import Account
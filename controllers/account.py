@@ -0,0 +1,30 @@
+from dataclasses import dataclass
+
+from discord.ext import commands
+
+from models import AppState
+from core import EventManager
+from services import DiscordBotService
+from .command_controller import CommandController
+from .command_executor import CommandExecutor
+
+@dataclass(eq=False)
+class Account:
+    """
+    한 프로세스에서 함께 실행되는 봇 계정 하나입니다.
+
+    계정마다 Bot, AppState, EventManager와 그 위의 서비스/컨트롤러/실행기를 따로 가지므로 서로의 상태나 이벤트가 섞이지 않고,
+    HTTP 커넥터, 첨부 파일 색인, 로깅처럼 계정과 무관한 자원만 함께 씁니다.
+    """
+    name: str
+    bot: commands.Bot
+    app_state: AppState
+    event_manager: EventManager
+    bot_service: DiscordBotService
+    controller: CommandController
+    executor: CommandExecutor
+
+    @property
+    def label(self) -> str:
+        user = self.bot.user
+        return f"{self.name} ({user.name})" if user else f"{self.name} (연결 중)"
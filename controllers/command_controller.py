@@ -4,8 +4,8 @@ import logging
 from typing import Callable
 
 from services import DiscordBotService 
-from models import AppState
-from core import EventManager, EventType
+from models import AppState, HistoryQuery, FileQuery, parse_message_reference
+from core import EventManager, EventType, request_channel_id, memory_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +28,10 @@ class CommandController:
             '/setguild': self._set_guild, '/sg': self._set_guild,
             '/listchannels': self._list_channels, '/lc': self._list_channels,
             '/setchannel': self._set_channel, '/sc': self._set_channel,
+            '/threads': self._threads, '/th': self._threads,
+            '/pane': self._pane, '/p': self._pane,
             '/read': self._read, '/r': self._read,
+            '/search': self._search, '/s': self._search,
             '/self_messages': self._get_self_messages, '/sm': self._get_self_messages,
             '/edit': self._edit_self_message, '/e': self._edit_self_message,
             '/delete': self._delete_self_message, '/d': self._delete_self_message,
@@ -36,6 +39,12 @@ class CommandController:
             '/attach': self._attach_file, '/a': self._attach_file,
             '/files': self._list_files, '/f': self._list_files,
             '/download': self._download_file, '/dl': self._download_file,
+            '/crawl': self._crawl, '/cr': self._crawl,
+            '/export': self._export, '/ex': self._export,
+            '/watch': self._watch, '/w': self._watch,
+            '/stats': self._stats, '/st': self._stats,
+            '/mem': self._memory, '/m': self._memory,
+            '/account': self._account, '/acc': self._account,
             '/clear': self._clear, '/cls': self._clear,
             '/quit': self._quit, '/q': self._quit,
         }
@@ -81,7 +90,7 @@ class CommandController:
         return False
 
     async def _list_channels(self, arg: str) -> bool:
-        """현재 선택된 서버의 채널 목록을 표시합니다."""
+        """현재 선택된 서버의 텍스트/포럼 채널 목록을 표시합니다. (스레드는 '/threads')"""
         if self.app_state.current_guild:
             await self.event_manager.publish(EventType.CHANNELS_UPDATED)
         else:
@@ -89,79 +98,202 @@ class CommandController:
         return False
 
     async def _set_channel(self, arg: str) -> bool:
-        """채널 인덱스, ID 또는 이름을 사용하여 현재 채널을 설정합니다."""
+        """채널 인덱스, ID 또는 이름을 사용하여 현재 채널을 설정합니다. 't<번호>'는 '/threads' 목록의 스레드입니다."""
         if not arg:
             await self.event_manager.publish(EventType.ERROR, "채널 인덱스, ID 또는 이름을 입력해 주세요. 예: /setchannel 1\n /setchannel 123456789012345678\n /setchannel 일반")
 
         await self.event_manager.publish(EventType.CHANNEL_SELECT_REQUEST, arg)
         return False
 
-    # TODO Continue refactor 
-    async def _read(self, arg: str) -> bool:
-        """현재 채널의 최근 메시지를 지정된 개수(기본값 50)만큼 불러옵니다."""
-        limit = 50
-        if arg:
+    async def _threads(self, arg: str) -> bool:
+        """채널이나 포럼의 활성/보관된 스레드 목록을 표시합니다. (/threads [채널] | more, 채널을 생략하면 현재 채널)"""
+        value = arg.strip()
+        if value.lower() == 'more':
+            await self.event_manager.publish(EventType.THREADS_LIST_REQUEST, "", True)
+        else:
+            await self.event_manager.publish(EventType.THREADS_LIST_REQUEST, value, False)
+        return False
+
+    async def _pane(self, arg: str) -> bool:
+        """채널이나 스레드를 별도 창으로 동시에 모니터링합니다. (/pane add <채널|t번호> | close <인덱스> | list)"""
+        parts = arg.split(' ', 1)
+        action = parts[0].lower()
+        value = parts[1].strip() if len(parts) > 1 else ""
+
+        if action in ('add', 'open'):
+            if not value:
+                await self.event_manager.publish(EventType.ERROR, "창으로 열 채널 인덱스, ID 또는 이름을 입력해 주세요. 예: /pane add 2")
+                return False
+            await self.event_manager.publish(EventType.PANE_OPEN_REQUEST, value)
+        elif action in ('close', 'rm'):
             try:
-                limit = int(arg)
-                if not (1 <= limit <= 500):
-                    await self.event_manager.publish(EventType.ERROR, "읽을 메시지 개수는 1에서 100 사이여야 합니다.")
-                    return False
+                index = int(value) - 1
             except ValueError:
-                await self.event_manager.publish(EventType.ERROR, "읽을 메시지 개수는 숫자여야 합니다.")
+                await self.event_manager.publish(EventType.ERROR, "닫을 창의 인덱스는 숫자여야 합니다. 예: /pane close 1")
                 return False
-        await self.bot_service.fetch_recent_messages(limit)
+            await self.event_manager.publish(EventType.PANE_CLOSE_REQUEST, index)
+        elif action in ('list', 'ls', ''):
+            text = "\n--- 열린 채널 창 ---\n"
+            if not self.app_state.pane_channels:
+                text += "  열린 채널 창이 없습니다. '/pane add <채널>'로 추가하세요.\n"
+            for idx, channel in enumerate(self.app_state.pane_channels):
+                text += f"  [{idx + 1}] #{channel.name} ({channel.guild.name})\n"
+            text += "--------------------"
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, text)
+        else:
+            await self.event_manager.publish(EventType.ERROR, "사용법: /pane add <채널> | /pane close <인덱스> | /pane list")
+        return False
+
+    async def _parse_history_query(self, arg: str, max_limit: int, query_type: type[HistoryQuery] = HistoryQuery) -> HistoryQuery | None:
+        """기록 조회 인자를 해석합니다. 잘못된 인자면 오류를 알리고 None을 반환합니다."""
+        try:
+            query = query_type.parse(arg, max_limit)
+        except ValueError as e:
+            await self.event_manager.publish(EventType.ERROR, str(e))
+            return None
+        if query.is_filtered:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 조회 조건: {query.describe()}")
+        return query
+
+    # TODO Continue refactor 
+    async def _read(self, arg: str) -> bool:
+        """현재 채널의 최근 메시지를 불러옵니다. (/read [개수] [--since 2h] [--until 09:30] [--author 이름])"""
+        query = await self._parse_history_query(arg, 500)
+        if query:
+            await self.bot_service.fetch_recent_messages(query)
+        return False
+
+    async def _search(self, arg: str) -> bool:
+        """현재 채널의 최근 메시지(500개)에서 검색어가 포함된 메시지를 찾습니다."""
+        query = arg.strip()
+        if not query:
+            await self.event_manager.publish(EventType.ERROR, "검색어를 입력해 주세요. 예: /search 배포")
+            return False
+        await self.event_manager.publish(EventType.MESSAGES_SEARCH_REQUEST, query)
         return False
 
     async def _get_self_messages(self, arg: str) -> bool:
-        """현재 채널에서 자신의 최근 메시지를 지정된 개수(기본값 50) 만큼 불러옵니다."""
-        limit = 50
-        if arg:
-            try:
-                limit = int(arg)
-                if not (1 <= limit <= 100):
-                    await self.event_manager.publish(EventType.ERROR, "읽을 메시지 개수는 1에서 100 사이여야 합니다.")
-                    return False
-            except ValueError:
-                await self.event_manager.publish(EventType.ERROR, "읽을 메시지 개수는 숫자여야 합니다.")
-                return False
-        await self.bot_service.fetch_recent_self_messages(limit)
+        """현재 채널의 최근 메시지에서 자신의 메시지를 불러옵니다. (/sm [스캔 개수] [--since 1d] [--until 시간])"""
+        query = await self._parse_history_query(arg, 100)
+        if not query:
+            return False
+        if query.author:
+            await self.event_manager.publish(EventType.ERROR, "'/self_messages'는 자신의 메시지만 가져오므로 --author를 사용할 수 없습니다.")
+            return False
+        await self.bot_service.fetch_recent_self_messages(query)
         return False
 
-    async def _delete_self_message(self, arg: str) -> bool:
-        """선택된 자신의 메시지를 삭제합니다."""
+    async def _resolve_message_target(self, arg: str, action: str) -> tuple[int, int] | None:
+        """
+        '/edit', '/delete'의 대상을 (채널 ID, 메시지 ID)로 해석합니다. 해석할 수 없으면 오류를 알리고 None을 반환합니다.
+        대상은 '/self_messages' 목록의 인덱스(생략 시 1), 메시지 ID(현재 채널) 또는 메시지 링크입니다.
+        """
+        reference = parse_message_reference(arg) if arg else None
+        if reference:
+            channel_id, message_id = reference
+            if channel_id is None:
+                channel_id = request_channel_id()
+            if channel_id is None:
+                if not self.app_state.current_channel:
+                    await self.event_manager.publish(EventType.ERROR, "메시지 ID만 입력하려면 먼저 채널을 선택해 주세요. (또는 메시지 링크 사용)")
+                    return None
+                channel_id = self.app_state.current_channel.id
+            return channel_id, message_id
+
+        if not self.app_state.recent_self_messages:
+            await self.event_manager.publish(EventType.ERROR, "먼저 /self_messages를 사용해 자신의 메시지를 캐싱하거나, 메시지 ID 또는 링크를 입력해 주세요.")
+            return None
         index = 0
         if arg:
             try:
                 index = int(arg) - 1
-                if not (0 <= index <= len(self.app_state.recent_self_messages)):
-                    await self.event_manager.publish(EventType.ERROR, "삭제할 메시지의 인덱스는 캐시된 메시지 범위 안에 있어야 합니다.")
-                    return False
             except ValueError:
-                await self.event_manager.publish(EventType.ERROR, "삭제할 메시지의 인덱스는 숫자여야 합니다.")
-                return False
-        await self.event_manager.publish(EventType.MESSAGE_DELETE_REQUEST, index)
+                await self.event_manager.publish(EventType.ERROR, f"{action}할 메시지의 인덱스, ID 또는 링크를 입력해 주세요.")
+                return None
+            if not (0 <= index < len(self.app_state.recent_self_messages)):
+                await self.event_manager.publish(EventType.ERROR, f"{action}할 메시지의 인덱스는 캐시된 메시지 범위 안에 있어야 합니다.")
+                return None
+        record = self.app_state.recent_self_messages[index]
+        if record is None:
+            await self.event_manager.publish(EventType.ERROR, f"{index + 1}번 메시지는 이미 삭제되었습니다.")
+            return None
+        return record.channel_id, record.id
+
+    async def _delete_self_message(self, arg: str) -> bool:
+        """자신의 메시지를 삭제합니다. (/delete <인덱스|메시지 ID|메시지 링크>)"""
+        target = await self._resolve_message_target(arg, "삭제")
+        if target:
+            await self.event_manager.publish(EventType.MESSAGE_DELETE_REQUEST, *target)
         return False
 
     async def _edit_self_message(self, arg: str) -> bool:
-        """선택된 자신의 메시지를 수정 모드에서 엽니다."""
-        index = 0
-        if arg:
+        """자신의 메시지를 수정 모드에서 엽니다. (/edit <인덱스|메시지 ID|메시지 링크>)"""
+        target = await self._resolve_message_target(arg, "수정")
+        if not target:
+            return False
+        channel_id, message_id = target
+
+        # 원본 내용은 캐시된 목록에서 찾고, 없을 때만 해당 메시지 하나를 가져옵니다. 어느 쪽이든 작성자가 확인되므로
+        # 수정 요청은 verified=True로 보내 같은 메시지를 다시 가져오지 않게 합니다.
+        cached = next((r for r in self.app_state.recent_self_messages if r is not None and r.id == message_id), None)
+        original_content = cached.content if cached else await self.bot_service.fetch_message_content(channel_id, message_id)
+        if original_content is None:
+            return False
+
+        async def on_edit_complete(new_content: str):
+            if not new_content.strip() or new_content == original_content:
+                await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "메시지 편집이 취소되었습니다.")
+                return
+            await self.event_manager.publish(EventType.MESSAGE_EDIT_REQUEST, channel_id, message_id, new_content, verified=True)
+        await self.event_manager.publish(EventType.UI_EDIT_INPUT_REQUEST, on_edit_complete, original_content)
+        return False
+
+    async def _watch(self, arg: str) -> bool:
+        """모든 서버의 새 메시지를 감시합니다. (/watch [add <키워드>|regex <정규식>|remove <인덱스|all>])"""
+        action, _, value = arg.partition(' ')
+        action = action.lower()
+        value = value.strip()
+        if action in ('', 'list', 'ls'):
+            await self.event_manager.publish(EventType.WATCHLIST_UPDATED)
+        elif action == 'add':
+            await self.event_manager.publish(EventType.WATCHLIST_ADD_REQUEST, 'keyword', value)
+        elif action in ('regex', 're'):
+            await self.event_manager.publish(EventType.WATCHLIST_ADD_REQUEST, 'regex', value)
+        elif action in ('remove', 'rm'):
+            if value.lower() == 'all':
+                await self.event_manager.publish(EventType.WATCHLIST_REMOVE_REQUEST, None)
+                return False
             try:
-                index = int(arg) - 1
-                if not (0 <= index < len(self.app_state.recent_self_messages)):
-                    await self.event_manager.publish(EventType.ERROR, "삭제할 메시지의 인덱스는 캐시된 메시지 범위 안에 있어야 합니다.")
-                    return False
+                index = int(value) - 1
             except ValueError:
-                await self.event_manager.publish(EventType.ERROR, "삭제할 메시지의 인덱스는 숫자여야 합니다.")
+                await self.event_manager.publish(EventType.ERROR, "제거할 항목의 인덱스를 숫자로 입력하거나 'all'을 입력해 주세요.")
                 return False
+            await self.event_manager.publish(EventType.WATCHLIST_REMOVE_REQUEST, index)
+        else:
+            await self.event_manager.publish(EventType.ERROR, "사용법: /watch [add <키워드>|regex <정규식>|remove <인덱스|all>]")
+        return False
 
-        # 수정할 메시지 객체와 원본 내용을 가져옴
-        message_to_edit = self.app_state.recent_self_messages[index]
-        original_content = message_to_edit.content
+    async def _stats(self, arg: str) -> bool:
+        """메시지 포맷 캐시 적중률 등 내부 통계를 표시합니다."""
+        await self.event_manager.publish(EventType.UI_STATS_SHOW_REQUEST)
+        return False
 
-        async def on_edit_complete(new_content: str):
-            await self.event_manager.publish(EventType.MESSAGE_EDIT_REQUEST, index, new_content)
-        await self.event_manager.publish(EventType.UI_EDIT_INPUT_REQUEST, on_edit_complete, original_content)
+    async def _memory(self, arg: str) -> bool:
+        """메모리 사용량과 캐시 크기를 표시합니다. (/mem [start [프레임 수]|stop|snapshot|diff <파일>|dump])"""
+        action, _, value = arg.strip().partition(' ')
+        action, value = action.lower(), value.strip()
+        if action == 'snap':
+            action = 'snapshot'
+        if action not in ('', 'start', 'stop', 'snapshot', 'diff', 'dump'):
+            await self.event_manager.publish(EventType.ERROR, "사용법: /mem [start [프레임 수]|stop|snapshot|diff <파일>|dump]")
+            return False
+        if action == 'start' and value and not (value.isdigit() and 1 <= int(value) <= memory_profiler.MAX_FRAMES):
+            await self.event_manager.publish(EventType.ERROR, f"프레임 수는 1에서 {memory_profiler.MAX_FRAMES} 사이의 숫자여야 합니다. 예: /mem start 5")
+            return False
+        if action == 'diff' and not value:
+            await self.event_manager.publish(EventType.ERROR, "비교할 스냅샷 파일 이름(MEMORY_DUMP_DIR 안)을 입력해 주세요. 예: /mem diff snapshot-20250705-120000-1234.tracemalloc")
+            return False
+        await self.event_manager.publish(EventType.MEMORY_REPORT_REQUEST, action, value)
         return False
 
     async def _clear(self, arg: str) -> bool:
@@ -178,31 +310,58 @@ class CommandController:
         return False
 
     async def _attach_file(self, arg: str) -> bool:
-        """지정된 파일을 현재 채널에 첨부합니다. (예: /a C:/path/file.png '캡션')"""
+        """지정된 파일을 현재 채널에 첨부합니다. 디렉터리는 zip으로 압축해 보냅니다. (예: /a C:/path/file.png '캡션')"""
         async def on_complete(file_path: str, caption: str | None):
             await self.bot_service.send_file(file_path, caption)
         await self.event_manager.publish(EventType.UI_FILE_INPUT_REQUEST, on_complete, arg)
         return False
 
     async def _list_files(self, arg: str) -> bool:
-        """현재 채널의 최근 파일 목록을 표시합니다. (기본 50개 메시지 스캔)"""
-        if not self.app_state.current_channel:
-            await self.event_manager.publish(EventType.ERROR, "먼저 채널을 선택해 주세요. '/setchannel' 사용.")
+        """최근 파일 목록을 표시합니다. (/files [개수] [--since 1d] [--author 이름] [--name 보고서] [--type pdf] [--min-size 1MB] [--index])"""
+        query = await self._parse_history_query(arg, 200, FileQuery)
+        if not query:
             return False
-        
-        limit = 50
-        if arg:
-            try:
-                limit = int(arg)
-                if not (1 <= limit <= 200):
-                    await self.event_manager.publish(EventType.ERROR, "스캔할 메시지 개수는 1에서 200 사이여야 합니다.")
-                    return False
-            except ValueError:
-                await self.event_manager.publish(EventType.ERROR, "스캔할 메시지 개수는 숫자여야 합니다.")
-                return False
-        
-        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 최근 {limit}개 메시지에서 파일을 검색합니다...")
-        await self.event_manager.publish(EventType.FILES_LIST_FETCH_REQUEST, limit)
+        if query.use_index:
+            # 로컬 색인은 채널을 선택하지 않아도 바로 찾을 수 있습니다.
+            await self.event_manager.publish(EventType.FILES_INDEX_SEARCH_REQUEST, query)
+            return False
+        if not self.app_state.current_channel and request_channel_id() is None:
+            await self.event_manager.publish(EventType.ERROR, "먼저 채널을 선택해 주세요. '/setchannel' 사용. (또는 --index로 로컬 색인 검색)")
+            return False
+        scope = f"최근 {query.limit}개 메시지" if query.limit else ("지정한 기간의 메시지" if query.has_range else "최근 50개 메시지")
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] {scope}에서 파일을 검색합니다...")
+        await self.event_manager.publish(EventType.FILES_LIST_FETCH_REQUEST, query)
+        return False
+
+    async def _account(self, arg: str) -> bool:
+        """함께 실행 중인 봇 계정 목록을 표시하거나, 인덱스 또는 이름으로 다른 계정으로 전환합니다. (/account [계정])"""
+        await self.event_manager.publish(EventType.ACCOUNT_SWITCH_REQUEST, arg.strip())
+        return False
+
+    async def _export(self, arg: str) -> bool:
+        """채널 전체 기록을 백그라운드에서 exports/에 압축 JSONL로 내보냅니다. 중단해도 다시 실행하면 이어서 진행합니다. (/export [채널 ...]|status|stop [채널 ...])"""
+        values = arg.split()
+        if values == ['status']:
+            await self.event_manager.publish(EventType.EXPORT_STATUS_REQUEST)
+            return False
+        if values[:1] == ['stop']:
+            await self.event_manager.publish(EventType.EXPORT_STOP_REQUEST, values[1:])
+            return False
+        await self.event_manager.publish(EventType.EXPORT_REQUEST, values)
+        return False
+
+    async def _crawl(self, arg: str) -> bool:
+        """서버의 첨부 파일을 백그라운드에서 로컬 색인에 수집합니다. (/crawl [start [서버]|stop|status])"""
+        action, _, value = arg.strip().partition(' ')
+        action = action.lower()
+        if action in ('', 'start'):
+            await self.event_manager.publish(EventType.CRAWL_START_REQUEST, value.strip() or None)
+        elif action == 'stop':
+            await self.event_manager.publish(EventType.CRAWL_STOP_REQUEST)
+        elif action == 'status':
+            await self.event_manager.publish(EventType.CRAWL_STATUS_REQUEST)
+        else:
+            await self.event_manager.publish(EventType.ERROR, "사용법: /crawl [start [서버]|stop|status]")
         return False
 
     async def _download_file(self, arg: str) -> bool:
@@ -0,0 +1,301 @@
+import os
+import time
+import asyncio
+import logging
+import itertools
+import contextlib
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from models import AppState
+from core import EventManager, EventType, RequestContext, current_request, current_account, ordered_section, channel_ordering_key
+from .command_controller import CommandController
+
+logger = logging.getLogger(__name__)
+
+# 서로 독립적으로 동시에 실행해도 되는 읽기 전용 명령어
+READ_ONLY_COMMANDS = {
+    '/help', '/h', '/listguilds', '/lg', '/listchannels', '/lc',
+    '/read', '/r', '/search', '/s', '/stats', '/st', '/mem', '/m',
+    '/export', '/ex', # 내보내기는 백그라운드 태스크로 시작하고 바로 끝납니다.
+}
+# 현재 채널에 쓰기 작업을 하는 명령어 (채널별로 입력 순서를 보장)
+CHANNEL_WRITE_COMMANDS = {'/attach', '/a', '/multiline', '/ml'}
+# 디렉터리를 첨부하면 압축하는 동안에는 채널 순서를 잡지 않고, 업로드할 때만 ordered_section으로 잡습니다.
+ATTACH_COMMANDS = {'/attach', '/a'}
+# 명령어가 함께 순서를 지켜야 하는 app_state 캐시
+CACHE_ORDERING_KEYS = {
+    '/self_messages': 'self_messages', '/sm': 'self_messages',
+    '/edit': 'self_messages', '/e': 'self_messages',
+    '/delete': 'self_messages', '/d': 'self_messages',
+    '/files': 'file_cache', '/f': 'file_cache',
+    '/download': 'file_cache', '/dl': 'file_cache',
+    '/threads': 'threads', '/th': 'threads', # 스레드 목록을 채우며, 이를 읽는 '/setchannel'은 배리어
+}
+SELF_MESSAGE_WRITE_COMMANDS = {'/edit', '/e', '/delete', '/d'}
+# 실행기나 View 자체를 다루는 명령어: 선행 작업이나 동시 실행 한도와 관계없이 즉시 실행
+IMMEDIATE_COMMANDS = {'/jobs', '/j', '/cancel', '/c', '/account', '/acc'}
+
+
+@dataclass
+class Job:
+    """실행기가 추적하는 작업 하나."""
+    id: int
+    label: str
+    task: asyncio.Task
+    visible: bool = True # /jobs 목록과 프롬프트에 표시할지 여부
+    started: float = field(default_factory=time.monotonic)
+
+
+class CommandExecutor:
+    """
+    입력 한 줄(명령어 또는 일반 메시지)을 태스크로 실행하고 추적합니다.
+
+    - 서버/채널 변경처럼 상태를 바꾸는 명령어(및 알 수 없는 명령어)는 배리어로 취급하여
+      앞서 제출된 작업이 모두 끝난 뒤 단독으로 실행합니다.
+    - 메시지 전송 등 채널 쓰기 작업은 채널별로 제출 순서대로 실행합니다.
+    - 같은 캐시(file_cache, self_messages)를 쓰는 명령어끼리도 제출 순서를 지킵니다.
+    - 그 외 읽기 전용 명령어는 max_concurrency 한도 안에서 동시에 실행합니다.
+    - 모든 작업은 번호와 함께 참조를 유지하며, '/jobs'로 조회하고 '/cancel'로 취소할 수 있습니다.
+    """
+    def __init__(
+        self,
+        controller: CommandController,
+        app_state: AppState,
+        event_manager: EventManager,
+        max_concurrency: int = 8,
+        max_pending: int = 100,
+        account: str | None = None,
+    ):
+        self.controller = controller
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.max_pending = max_pending
+        # 여러 계정을 함께 실행할 때 작업 중 남긴 로그에 붙일 계정 이름
+        self.account = account
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._job_ids = itertools.count(1)
+        self.jobs: dict[int, Job] = {}
+        self._last_barrier: asyncio.Task | None = None
+        self._ordering_tails: dict[object, asyncio.Future] = {} # 키별 마지막 작업 (또는 ordered 구간)
+        # 작업이 추가되거나 끝날 때 호출됩니다. (예: TUI 프롬프트 갱신)
+        self.on_jobs_changed: Callable[[], None] | None = None
+
+        self.controller.commands.update({
+            '/jobs': self._list_jobs, '/j': self._list_jobs,
+            '/cancel': self._cancel_jobs, '/c': self._cancel_jobs,
+        })
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def visible_in_flight(self) -> int:
+        return sum(1 for job in self.jobs.values() if job.visible)
+
+    @property
+    def is_saturated(self) -> bool:
+        """처리 중인 작업 수가 한도에 도달했는지 여부. 입력 측에서 새 작업을 거절하는 데 사용합니다."""
+        return self.visible_in_flight >= self.max_pending
+
+    @staticmethod
+    def parse(text: str) -> tuple[str | None, str]:
+        """입력을 (명령어, 인자)로 나눕니다. 일반 메시지는 명령어가 None입니다."""
+        if not text.startswith('/'):
+            return None, text
+        parts = text.split(' ', 1)
+        return parts[0].lower(), parts[1] if len(parts) > 1 else ""
+
+    def channel_key(self, context: RequestContext | None = None) -> tuple:
+        """요청이 지정한 채널(제어 API의 channel_id), 없으면 현재 채널의 쓰기 순서 키."""
+        if context is not None and context.channel_id is not None:
+            return channel_ordering_key(context.channel_id)
+        channel = self.app_state.current_channel
+        return channel_ordering_key(channel.id if channel else None)
+
+    @staticmethod
+    def attach_keys_deferred(path: str) -> bool:
+        """첨부할 경로가 디렉터리여서 채널 순서 키를 업로드할 때만 잡아야 하는지 여부."""
+        return os.path.isdir(path.strip())
+
+    @contextlib.asynccontextmanager
+    async def ordered(self, *keys):
+        """
+        작업 도중에 순서 키를 잡습니다. 지금까지 같은 키로 제출된 작업이 끝난 뒤 진입하고, 구간을 나올 때까지
+        이후에 제출된 같은 키의 작업이 기다립니다. (작업 안에서 ordered_section으로 사용)
+        """
+        current = asyncio.current_task()
+        dependencies = [self._ordering_tails[key] for key in keys if key in self._ordering_tails and self._ordering_tails[key] is not current]
+        marker = asyncio.get_running_loop().create_future()
+        for key in keys:
+            self._ordering_tails[key] = marker
+        try:
+            if dependencies:
+                await asyncio.wait(dependencies)
+            yield
+        finally:
+            marker.set_result(None)
+            for key in keys:
+                if self._ordering_tails.get(key) is marker:
+                    del self._ordering_tails[key]
+
+    def _ordering_keys(self, command: str | None, arg: str = "", context: RequestContext | None = None) -> tuple[bool, list]:
+        """(배리어 여부, 순서를 지켜야 하는 키 목록)을 반환합니다."""
+        if command is None:
+            return False, [self.channel_key(context)]
+        if command in READ_ONLY_COMMANDS:
+            return False, []
+        if command in CHANNEL_WRITE_COMMANDS:
+            if command in ATTACH_COMMANDS and self.attach_keys_deferred(arg.strip().split(' ', 1)[0]):
+                return False, []
+            return False, [self.channel_key(context)]
+        if command in CACHE_ORDERING_KEYS:
+            keys = [CACHE_ORDERING_KEYS[command]]
+            if command in SELF_MESSAGE_WRITE_COMMANDS:
+                keys.append(self.channel_key(context))
+            return False, keys
+        return True, []
+
+    def submit(self, text: str, context: RequestContext | None = None) -> asyncio.Task:
+        """
+        입력을 실행 태스크로 제출합니다. 태스크의 결과는 봇 종료가 필요한지 여부(bool)입니다.
+        context가 주어지면 실행 중 발행되는 이벤트가 해당 요청으로 전달됩니다.
+        """
+        command, arg = self.parse(text)
+        label = text if command else "메시지 전송"
+        if command in IMMEDIATE_COMMANDS:
+            return self.run(lambda: self.execute(command, arg), label, context=context, immediate=True, visible=False)
+        is_barrier, keys = self._ordering_keys(command, arg, context)
+        return self.run(lambda: self.execute(command, arg), label, keys=keys, barrier=is_barrier, context=context)
+
+    def run(
+        self,
+        factory: Callable[[], Awaitable],
+        label: str,
+        keys: list | tuple = (),
+        barrier: bool = False,
+        context: RequestContext | None = None,
+        immediate: bool = False,
+        visible: bool = True,
+    ) -> asyncio.Task:
+        """
+        임의의 코루틴을 추적되는 작업으로 실행합니다. (factory는 실행 차례가 되었을 때 호출됩니다.)
+        keys가 겹치는 작업끼리는 제출 순서대로, barrier 작업은 앞선 모든 작업이 끝난 뒤 실행하며,
+        immediate 작업은 순서와 동시 실행 한도에 관계없이 바로 실행합니다.
+        """
+        if immediate:
+            dependencies = []
+        elif barrier:
+            dependencies = [job.task for job in self.jobs.values()]
+        else:
+            dependencies = [self._last_barrier] if self._last_barrier else []
+            dependencies += [self._ordering_tails[key] for key in keys if key in self._ordering_tails]
+
+        task = asyncio.create_task(self._run(factory, dependencies, context, immediate))
+        job = Job(next(self._job_ids), label, task, visible)
+        self.jobs[job.id] = job
+        task.add_done_callback(lambda _: self._on_job_done(job))
+
+        if barrier:
+            self._last_barrier = task
+        for key in keys:
+            self._ordering_tails[key] = task
+        self._notify_jobs_changed()
+        return task
+
+    def _notify_jobs_changed(self):
+        if self.on_jobs_changed:
+            self.on_jobs_changed()
+
+    def _on_job_done(self, job: Job):
+        task = job.task
+        self.jobs.pop(job.id, None)
+        if self._last_barrier is task:
+            self._last_barrier = None
+        for key in [key for key, tail in self._ordering_tails.items() if tail is task]:
+            del self._ordering_tails[key]
+        if task.cancelled():
+            logger.info("Job #%d (%s) cancelled after %.1f s", job.id, job.label[:40], time.monotonic() - job.started)
+        elif task.exception():
+            logger.error("Job #%d (%s) failed", job.id, job.label[:40], exc_info=task.exception())
+        self._notify_jobs_changed()
+
+    async def _run(self, factory: Callable[[], Awaitable], dependencies: list[asyncio.Task], context: RequestContext | None, immediate: bool):
+        if dependencies:
+            # gather와 달리 wait는 이 태스크가 취소되어도 선행 작업을 함께 취소하지 않습니다.
+            await asyncio.wait(dependencies)
+        if context is not None:
+            current_request.set(context)
+        if self.account is not None:
+            current_account.set(self.account)
+        ordered_section.set(self.ordered)
+        if immediate:
+            return await factory()
+        async with self._semaphore:
+            return await factory()
+
+    async def execute(self, command: str | None, arg: str) -> bool:
+        """명령어 또는 일반 메시지를 즉시 실행합니다. 봇 종료가 필요한 경우 True를 반환합니다."""
+        started = time.perf_counter()
+        try:
+            if command is None:
+                await self.event_manager.publish(EventType.MESSAGE_SEND_REQUEST, arg)
+                return False
+            return await self.controller.handle_command(command, arg)
+        finally:
+            logger.debug("Executed %s in %.1f ms", command or "message", (time.perf_counter() - started) * 1000)
+
+    async def drain(self):
+        """제출된 모든 작업이 끝날 때까지 기다립니다."""
+        while self.jobs:
+            await asyncio.wait([job.task for job in self.jobs.values()])
+
+    def cancel(self, job_id: int) -> bool:
+        """작업 하나를 취소합니다. 해당 작업이 없으면 False를 반환합니다."""
+        job = self.jobs.get(job_id)
+        if job is None or not job.visible:
+            return False
+        return job.task.cancel()
+
+    # --- Executor Commands ---
+
+    async def _list_jobs(self, arg: str) -> bool:
+        """실행 중이거나 대기 중인 작업 목록을 표시합니다."""
+        now = time.monotonic()
+        jobs = [job for job in self.jobs.values() if job.visible]
+        text = "\n--- 실행 중인 작업 ---\n"
+        if not jobs:
+            text += "  실행 중인 작업이 없습니다.\n"
+        for job in jobs:
+            text += f"  [#{job.id}] {job.label[:40]} ({now - job.started:.1f}초)\n"
+        text += "취소하려면 '/cancel <작업 번호>' 또는 '/cancel all'을 입력하세요.\n"
+        text += "----------------------"
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, text)
+        return False
+
+    async def _cancel_jobs(self, arg: str) -> bool:
+        """실행 중인 작업을 취소합니다. (/cancel [작업 번호|all], 번호를 생략하면 가장 최근 작업)"""
+        arg = arg.strip().lstrip('#').lower()
+        job_ids = [job.id for job in self.jobs.values() if job.visible]
+        if not job_ids:
+            await self.event_manager.publish(EventType.ERROR, "취소할 작업이 없습니다.")
+            return False
+
+        if arg == 'all':
+            targets = job_ids
+        elif not arg:
+            targets = [max(job_ids)]
+        else:
+            try:
+                targets = [int(arg)]
+            except ValueError:
+                await self.event_manager.publish(EventType.ERROR, "작업 번호는 숫자여야 합니다. 예: /cancel 3")
+                return False
+
+        cancelled = [job_id for job_id in targets if self.cancel(job_id)]
+        if not cancelled:
+            await self.event_manager.publish(EventType.ERROR, f"작업 #{targets[0]}을(를) 찾을 수 없습니다. '/jobs'로 확인해 주세요.")
+            return False
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 작업 {', '.join(f'#{i}' for i in cancelled)}을(를) 취소했습니다.")
+        return False
@@ -1,3 +1,8 @@
+from .metrics import MetricsRegistry, Counter, Gauge, Histogram, metrics
 from .event_manager import EventManager
 from .event_types import EventType
-from .logger import setup_logging
+from .logger import setup_logging, shutdown_logging, current_account
+from .request_context import RequestContext, current_request, request_channel_id, ordered_section, channel_ordering_key
+from .startup_profiler import StartupProfiler, startup_profiler
+from .loop_monitor import LoopLagMonitor, loop_monitor
+from .memory_profiler import MemoryProfiler, MemoryReport, CacheUsage, memory_profiler, deep_sizeof, format_bytes
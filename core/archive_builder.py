@@ -0,0 +1,163 @@
+import os
+import shutil
+import asyncio
+import logging
+import zipfile
+import tempfile
+import multiprocessing
+
+logger = logging.getLogger(__name__)
+
+ATTACH_MAX_VOLUMES = int(os.getenv("ATTACH_MAX_VOLUMES", "20")) # 디렉터리 하나를 보낼 때 올릴 최대 볼륨 수
+
+class ArchiveTooLarge(Exception):
+    """압축 결과가 최대 볼륨 수를 넘었습니다."""
+
+class VolumeWriter:
+    """
+    쓰는 바이트를 volume_size 크기의 파일(name.001, name.002, ...)로 나눠 저장하는 쓰기 전용 스트림입니다.
+    볼륨은 압축 파일을 바이트 단위로 자른 것이므로 받은 쪽에서 이어 붙이면(cat name.* > name, 7-Zip 등) 원래 파일이 됩니다.
+    seek를 지원하지 않으므로 zipfile은 각 항목 뒤에 데이터 설명자를 붙이는 스트리밍 방식으로 씁니다.
+    """
+    def __init__(self, base_path: str, volume_size: int, max_volumes: int):
+        self.base_path = base_path
+        self.volume_size = volume_size
+        self.max_volumes = max_volumes
+        self.paths: list[str] = []
+        self._file = None
+        self._remaining = 0
+        self._written = 0
+
+    def _next_volume(self):
+        if self._file:
+            self._file.close()
+        if len(self.paths) >= self.max_volumes:
+            raise ArchiveTooLarge(f"archive exceeds {self.max_volumes} volumes of {self.volume_size} bytes")
+        path = f"{self.base_path}.{len(self.paths) + 1:03d}"
+        self.paths.append(path)
+        self._file = open(path, "wb")
+        self._remaining = self.volume_size
+
+    def write(self, data) -> int:
+        view = memoryview(data)
+        while view:
+            if self._remaining == 0:
+                self._next_volume()
+            chunk = view[:self._remaining]
+            self._file.write(chunk)
+            self._remaining -= len(chunk)
+            view = view[len(chunk):]
+        self._written += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._written
+
+    def flush(self):
+        if self._file:
+            self._file.flush()
+
+    def close(self) -> list[str]:
+        """마지막 볼륨을 닫고 볼륨 경로 목록을 반환합니다. 볼륨이 하나뿐이면 번호 없는 이름으로 바꿉니다."""
+        if self._file:
+            self._file.close()
+            self._file = None
+        if len(self.paths) == 1:
+            os.replace(self.paths[0], self.base_path)
+            self.paths = [self.base_path]
+        return self.paths
+
+def build_archive(directory: str, output_dir: str, volume_size: int, max_volumes: int = ATTACH_MAX_VOLUMES) -> tuple[list[str], list[str]]:
+    """
+    directory를 zip으로 압축해 output_dir에 volume_size 이하의 볼륨들로 나눠 쓰고 (볼륨 경로, 건너뛴 파일)을 반환합니다.
+    작업자 프로세스에서 실행되므로 인자와 반환값은 모두 pickle 가능한 값이어야 하며, 작업자에는 로깅이 설정되어 있지 않아
+    (로그가 터미널에 섞이지 않도록) 건너뛴 파일은 로그 대신 반환값으로 알립니다.
+    """
+    skipped = []
+    directory = os.path.abspath(directory)
+    root_name = os.path.basename(directory.rstrip(os.sep)) or "archive"
+    writer = VolumeWriter(os.path.join(output_dir, f"{root_name}.zip"), volume_size, max_volumes)
+    try:
+        with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6) as archive:
+            for current, dirs, files in os.walk(directory):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(current, name)
+                    arcname = os.path.join(root_name, os.path.relpath(path, directory))
+                    try:
+                        archive.write(path, arcname)
+                    except OSError: # 압축 중 지워졌거나 읽을 수 없는 파일은 건너뜁니다.
+                        skipped.append(arcname)
+    finally:
+        paths = writer.close()
+    return paths, skipped
+
+def _run_worker(connection, directory: str, output_dir: str, volume_size: int, max_volumes: int):
+    """작업자 프로세스의 진입점입니다. build_archive의 결과(True, 값) 또는 예외(False, 예외)를 파이프로 돌려보냅니다."""
+    try:
+        result = build_archive(directory, output_dir, volume_size, max_volumes)
+    except Exception as e:
+        connection.send((False, e))
+    else:
+        connection.send((True, result))
+    finally:
+        connection.close()
+
+def _receive(connection, process) -> tuple[bool, object]:
+    """
+    작업자의 결과를 받고 작업자가 끝날 때까지 기다립니다. (스레드에서 실행)
+    결과가 크면 작업자는 보낼 때 막히므로 join보다 먼저 받습니다. 결과 없이 끝나면(종료됨) RuntimeError를 냅니다.
+    """
+    try:
+        return connection.recv()
+    except EOFError:
+        process.join()
+        raise RuntimeError(f"archive worker exited without a result (exit code {process.exitcode})") from None
+    finally:
+        connection.close()
+        process.join()
+
+def _discard(future: asyncio.Future, output_dir: str):
+    """취소된 압축 작업이 끝난 뒤 결과(작업자 종료로 인한 RuntimeError 포함)를 버리고 임시 디렉터리를 지웁니다."""
+    if not future.cancelled():
+        future.exception()
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+async def build_archive_in_worker(directory: str, volume_size: int, max_volumes: int = ATTACH_MAX_VOLUMES) -> tuple[str, list[str], list[str]]:
+    """
+    build_archive를 별도 프로세스에서 실행합니다. 압축은 CPU를 오래 쓰므로 스레드가 아닌 프로세스에서 실행해야
+    이벤트 루프(와 GIL)를 막지 않습니다. (임시 디렉터리, 볼륨 경로, 건너뛴 파일)을 반환하며, 사용이 끝나면 호출자가
+    임시 디렉터리를 지워야 합니다. 대기 중에 취소되면 작업자 프로세스를 종료하고, 종료가 확인되면 임시 디렉터리를 지웁니다.
+    """
+    output_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix="attach-")
+    # 스레드(로그 리스너 등)가 있는 프로세스를 fork하지 않도록 spawn으로 새 인터프리터를 띄웁니다.
+    # 작업 하나에 작업자 하나이므로 풀 대신 프로세스를 직접 띄워, 취소할 때 종료할 대상을 그대로 쥐고 있습니다.
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_worker, args=(sender, directory, output_dir, volume_size, max_volumes),
+                              name="archive-worker", daemon=True)
+    try:
+        process.start()
+    except BaseException:
+        receiver.close()
+        await asyncio.to_thread(shutil.rmtree, output_dir, True)
+        raise
+    finally:
+        sender.close() # 작업자가 보내는 쪽을 닫고 끝나면 recv가 EOFError로 깨어나도록 부모의 사본은 닫습니다.
+    future = asyncio.ensure_future(asyncio.to_thread(_receive, receiver, process))
+    try:
+        ok, value = await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # 취소해도 작업자는 압축을 계속하므로 직접 종료합니다. 작업자가 끝나면 파이프가 닫혀 future도 끝납니다.
+        process.terminate()
+        future.add_done_callback(lambda _: _discard(future, output_dir))
+        logger.info("Cancelled archiving %s; terminated worker process %s.", directory, process.pid)
+        raise
+    except BaseException:
+        await asyncio.to_thread(shutil.rmtree, output_dir, True)
+        raise
+    if not ok:
+        await asyncio.to_thread(shutil.rmtree, output_dir, True)
+        raise value
+    paths, skipped = value
+    return output_dir, paths, skipped
@@ -15,10 +15,18 @@ class EventType(Enum):
     UI_MULTILINE_INPUT_REQUEST = auto()
     UI_FILE_INPUT_REQUEST = auto()
     UI_EDIT_INPUT_REQUEST = auto()
+    UI_STATS_SHOW_REQUEST = auto()
+    UI_MEMORY_SHOW_REQUEST = auto()
+    
+    # --- Memory Profiling Events ---
+    MEMORY_REPORT_REQUEST = auto()
     
     # --- Bot Status Events ---
     BOT_STATUS_READY = auto()
     
+    # --- Account Events ---
+    ACCOUNT_SWITCH_REQUEST = auto()
+    
     # --- Guild/Server Events ---
     GUILDS_UPDATED = auto()
     GUILD_SELECT_REQUEST = auto()
@@ -28,13 +36,29 @@ class EventType(Enum):
     CHANNELS_UPDATED = auto()
     CHANNEL_SELECT_REQUEST = auto()
     CHANNEL_SELECTED = auto()
+    THREADS_LIST_REQUEST = auto()
+    THREADS_UPDATED = auto()
+    
+    # --- Pane Events ---
+    PANE_OPEN_REQUEST = auto()
+    PANE_OPENED = auto()
+    PANE_CLOSE_REQUEST = auto()
+    PANE_CLOSED = auto()
+    
+    # --- Member/Role/Channel Name Events ---
+    DISPLAY_NAMES_UPDATED = auto()
     
     # --- Message Events ---
     MESSAGE_RECEIVED = auto()
+    MESSAGE_UPDATED = auto()
+    MESSAGE_DELETED = auto()
     
     MESSAGES_RECENT_FETCH_REQUEST = auto()
     MESSAGES_RECENT_UPDATED = auto()
     
+    MESSAGES_SEARCH_REQUEST = auto()
+    MESSAGES_SEARCH_UPDATED = auto()
+    
     MESSAGES_SELF_FETCH_REQUEST = auto()
     MESSAGES_SELF_UPDATED = auto()
     
@@ -47,6 +71,12 @@ class EventType(Enum):
     MESSAGE_SEND_REQUEST = auto()
     MESSAGE_SEND_COMPLETED = auto()
     
+    # --- Watchlist Events ---
+    WATCHLIST_ADD_REQUEST = auto()
+    WATCHLIST_REMOVE_REQUEST = auto()
+    WATCHLIST_UPDATED = auto()
+    WATCH_ALERT = auto()
+    
     # --- File Events ---
     FILE_SEND_REQUEST = auto()
     FILE_SEND_COMPLETED = auto()
@@ -56,3 +86,15 @@ class EventType(Enum):
     
     FILE_DOWNLOAD_REQUEST = auto()
     FILE_DOWNLOAD_COMPLETED = auto()
+    
+    FILES_INDEX_SEARCH_REQUEST = auto()
+    
+    # --- Export Events ---
+    EXPORT_REQUEST = auto()
+    EXPORT_STATUS_REQUEST = auto()
+    EXPORT_STOP_REQUEST = auto()
+    
+    # --- Attachment Crawler Events ---
+    CRAWL_START_REQUEST = auto()
+    CRAWL_STOP_REQUEST = auto()
+    CRAWL_STATUS_REQUEST = auto()
@@ -1,62 +1,296 @@
 import os
+import re
+import json
+import time
+import copy
+import queue
+import random
+import atexit
 import logging
-from datetime import datetime
+import threading
+import logging.handlers
+from contextvars import ContextVar
+from datetime import datetime, timezone
 
-def setup_logging():
+from .metrics import metrics
+
+# 로그 기록은 별도 스레드의 리스너가 담당합니다. (setup_logging에서 시작, shutdown_logging에서 종료)
+_listener: logging.handlers.QueueListener | None = None
+
+class SizedTimedRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """
+    지정한 시각(기본: 자정)이 되거나 파일 크기가 max_bytes를 넘으면 로그 파일을 교체하는 핸들러입니다.
+    교체된 파일에는 해당 구간의 시작 시각이 붙으며(예: bot.log.2025-07-05_00-00-00.001), backupCount개만 보관합니다.
+    """
+    def __init__(self, filename: str, max_bytes: int, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.max_bytes = max_bytes
+        # 크기 기준 교체는 같은 날에도 여러 번 일어날 수 있으므로 초 단위까지 붙입니다.
+        self.suffix = "%Y-%m-%d_%H-%M-%S"
+        self.extMatch = re.compile(r"^\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}(\.\d{3})?$", re.ASCII)
+        self._formatted: tuple[logging.LogRecord, str] | None = None # shouldRollover가 크기를 재려고 포맷한 결과
+
+    def rotation_filename(self, default_name: str) -> str:
+        # 교체 파일 이름은 현재 구간의 시작 시각이므로, 같은 구간에서 크기 기준으로
+        # 다시 교체되면 이름이 겹칩니다. 기존 파일을 덮어쓰지 않도록 순번을 붙입니다.
+        name, seq = default_name, 0
+        while os.path.exists(name):
+            seq += 1
+            name = f"{default_name}.{seq:03d}"
+        return name
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            text = self.format(record)
+            # emit이 같은 레코드를 다시 포맷하지 않도록 결과를 넘겨줍니다.
+            self._formatted = (record, text)
+            self.stream.seek(0, 2) # 파일 끝 (다른 프로세스가 쓴 내용도 반영)
+            return self.stream.tell() + len(text) + 1 >= self.max_bytes
+        return False
+
+    def format(self, record: logging.LogRecord) -> str:
+        formatted, self._formatted = self._formatted, None
+        if formatted is not None and formatted[0] is record:
+            return formatted[1]
+        return super().format(record)
+
+class DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    레코드를 포맷하지 않고 큐에 넣는 QueueHandler입니다.
+    기본 QueueHandler.prepare는 호출한 스레드에서 기본 포맷터로 메시지와 트레이스백을 합쳐 msg에 넣고 exc_info를 지우므로,
+    파일 핸들러의 포맷터(JsonFormatter의 exc 필드 등)가 원래 레코드를 보지 못하고 포맷 비용도 이벤트 루프가 냅니다.
+    여기서는 인자만 메시지에 합치고(나중에 바뀔 수 있는 객체를 붙잡지 않도록) 포맷과 트레이스백은 리스너 스레드에 맡깁니다.
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# LogRecord가 기본으로 가지는 속성. 이 외의 속성은 extra로 전달된 구조화 필드로 취급합니다.
+_STANDARD_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """
+    로그 한 줄을 JSON 객체로 출력합니다.
+    extra로 전달한 필드(event, guild_id, channel_id, latency_ms 등)는 최상위 키로 포함됩니다.
+
+        logger.debug("Published event", extra={'event': 'MESSAGE_RECEIVED', 'latency_ms': 0.4})
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+# 로그를 남긴 계정 이름. 여러 계정을 한 프로세스에서 실행할 때 계정별 Gateway 태스크와 실행기 작업에서 설정합니다.
+current_account: ContextVar[str | None] = ContextVar('current_account', default=None)
+
+class AccountFilter(logging.Filter):
+    """현재 컨텍스트의 계정 이름을 레코드의 account 필드로 붙입니다. (JSON 형식 로그에서 계정별로 구분)"""
+    def filter(self, record: logging.LogRecord) -> bool:
+        account = current_account.get()
+        if account is not None:
+            record.account = account
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    로거 이름별 비율로 DEBUG/INFO 로그를 표본 추출합니다. (WARNING 이상은 항상 통과)
+    가장 길게 일치하는 로거 이름(접두어)의 비율을 사용합니다. 예: {'core.event_manager': 0.01}
     """
-    애플리케이션의 파일 기반 로깅 시스템을 설정합니다.
+    def __init__(self, ratios: dict[str, float]):
+        super().__init__()
+        self.ratios = ratios
+        self._resolved: dict[str, float] = {} # 로거 이름별 비율 캐시
+
+    def _ratio(self, name: str) -> float:
+        ratio = self._resolved.get(name)
+        if ratio is None:
+            ratio = 1.0
+            matched = ""
+            for prefix, value in self.ratios.items():
+                if (name == prefix or name.startswith(prefix + ".")) and len(prefix) > len(matched):
+                    matched, ratio = prefix, value
+            self._resolved[name] = ratio
+        return ratio
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        ratio = self._ratio(record.name)
+        return ratio >= 1.0 or random.random() < ratio
+
+class RateLimitFilter(logging.Filter):
+    """
+    키별 토큰 버킷으로 DEBUG/INFO 로그의 빈도를 제한합니다. (WARNING 이상은 항상 통과)
+    키는 extra의 rate_key가 있으면 그 값, 없으면 (로거 이름, 메시지 템플릿)입니다.
+    제한으로 버려진 건수는 다음에 통과하는 레코드의 suppressed 필드로 기록됩니다.
+    """
+    def __init__(self, rate: float, burst: float, max_keys: int = 10000):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets: dict[object, list] = {} # 키 -> [남은 토큰, 마지막 갱신 시각, 버려진 건수]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = getattr(record, 'rate_key', None) or (record.name, record.msg)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._buckets.clear() # 키가 무한히 늘어나지 않도록 주기적으로 비웁니다.
+            bucket = self._buckets[key] = [self.burst, now, 0]
+        else:
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        if bucket[0] < 1.0:
+            bucket[2] += 1
+            return False
+        bucket[0] -= 1.0
+        if bucket[2]:
+            record.suppressed = bucket[2]
+            bucket[2] = 0
+        return True
+
+def _parse_sampling(spec: str) -> dict[str, float]:
+    """'core.event_manager=0.01,cogs=0.1' 형식의 설정을 해석합니다."""
+    ratios = {}
+    for item in spec.split(','):
+        name, sep, value = item.strip().partition('=')
+        if not sep:
+            continue
+        try:
+            ratios[name.strip()] = max(0.0, min(1.0, float(value)))
+        except ValueError:
+            continue
+    return ratios
+
+def _parse_rate_limit(spec: str) -> tuple[float, float] | None:
+    """'초당 허용 수[:버스트]' 형식의 설정을 해석합니다. 예: '5:20'"""
+    rate, _, burst = spec.partition(':')
+    try:
+        rate_value = float(rate)
+        burst_value = float(burst) if burst else max(1.0, rate_value)
+    except ValueError:
+        return None
+    return (rate_value, burst_value) if rate_value > 0 else None
+
+def setup_logging(log_dir: str | None = None):
+    """
+    애플리케이션의 파일 기반 로깅 시스템을 설정합니다. log_dir을 주지 않으면 프로젝트의 'logs/'에 기록합니다.
 
     - 로그 레벨은 .env 파일의 LOG_LEVEL 값으로 설정 (기본값: INFO).
-    - 'logs' 디렉터리에 실행 시점마다 고유한 타임스탬프를 가진 로그 파일을 생성합니다.
-        - (예: logs/bot_2025-07-05_14-30-00.log)
+    - 로그는 큐에 넣고 백그라운드 스레드가 'logs/bot.log'에 기록하므로, 이벤트 루프에서 디스크 I/O를 하지 않습니다.
+    - 자정 또는 LOG_MAX_BYTES(기본값: 10MB)를 넘으면 파일을 교체하고, LOG_BACKUP_COUNT(기본값: 10)개만 보관합니다.
+    - LOG_FORMAT=json이면 한 줄에 하나의 JSON 객체로 기록합니다. (extra 필드 포함)
+    - LOG_SAMPLING(예: 'core.event_manager=0.01')으로 로거별 표본 비율을,
+      LOG_RATE_LIMIT(예: '5:20', 초당 5건/버스트 20)으로 키별 빈도 제한을 설정합니다. (DEBUG/INFO에만 적용)
     """
+    global _listener
+
     # 1. .env 파일 또는 환경 변수에서 로그 레벨 가져오기
     log_level_str = os.getenv('LOG_LEVEL', 'INFO').upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
 
     # 2. 로그 포맷터 생성
-    # [시간] [레벨] [로거 이름] - [메시지]
-    log_format = logging.Formatter(
-        '%(asctime)s - %(levelname)-8s - %(name)-25s - %(message)s'
-    )
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        log_format = JsonFormatter()
+    else:
+        # [시간] [레벨] [로거 이름] - [메시지]
+        log_format = logging.Formatter(
+            '%(asctime)s - %(levelname)-8s - %(name)-25s - %(message)s'
+        )
 
     # 3. 루트 로거 설정
     # 애플리케이션의 모든 로거는 이 설정을 상속합니다.
-    # 가장 낮은 레벨로 설정하여 모든 핸들러가 로그를 개별적으로 필터링하게 합니다.
+    # 핸들러가 아닌 로거에서 거르므로, 기록되지 않을 레벨은 isEnabledFor()가 False가 되어 LogRecord를 만들지 않습니다.
     root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
+    root_logger.setLevel(log_level)
 
     # 기존에 연결된 핸들러가 있다면 모두 제거 (재호출 시 중복 방지)
+    shutdown_logging()
     if root_logger.hasHandlers():
         root_logger.handlers.clear()
 
-    # 4. 파일 핸들러 설정 (실행 시마다 새 파일 생성)
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    log_dir = os.path.join(project_root, 'logs')
-    
+    # 4. 파일 핸들러 설정 (크기/시간 기준 교체)
+    if log_dir is None:
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        log_dir = os.path.join(project_root, 'logs')
+
     os.makedirs(log_dir, exist_ok=True)
-    log_filename = datetime.now().strftime("bot_%Y-%m-%d_%H-%M-%S.log")
-    
-    file_handler = logging.FileHandler(os.path.join(log_dir, log_filename), encoding='utf-8')
+
+    file_handler = SizedTimedRotatingFileHandler(
+        os.path.join(log_dir, 'bot.log'),
+        max_bytes=int(os.getenv('LOG_MAX_BYTES', str(10 * 1024 * 1024))),
+        when='midnight',
+        backupCount=int(os.getenv('LOG_BACKUP_COUNT', '10')),
+        encoding='utf-8',
+    )
     file_handler.setLevel(log_level) # .env에서 설정한 레벨 이상만 파일에 기록
     file_handler.setFormatter(log_format)
-    root_logger.addHandler(file_handler)
 
-    # 5. discord.py 라이브러리 로거 설정
+    # 5. 큐 핸들러 설정
+    # 호출한 스레드(이벤트 루프)는 레코드를 큐에 넣기만 하고, 포맷팅과 파일 교체는 리스너 스레드가 처리합니다.
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = DeferredFormatQueueHandler(log_queue)
+    queue_handler.setLevel(log_level) # 기록되지 않을 레코드는 큐에 넣지 않음
+    # 표본 추출과 빈도 제한도 큐에 넣기 전에 적용하여, 버려질 로그의 비용을 최소화합니다.
+    sampling = _parse_sampling(os.getenv('LOG_SAMPLING', ''))
+    if sampling:
+        queue_handler.addFilter(SamplingFilter(sampling))
+    rate_limit = _parse_rate_limit(os.getenv('LOG_RATE_LIMIT', ''))
+    if rate_limit:
+        queue_handler.addFilter(RateLimitFilter(*rate_limit))
+    queue_handler.addFilter(AccountFilter())
+    root_logger.addHandler(queue_handler)
+    # 리스너 스레드가 파일 쓰기를 따라가지 못하면 큐가 길어집니다.
+    metrics.gauge("bot_log_queue_depth", "Log records waiting to be written by the listener thread.").set_function(log_queue.qsize)
+
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    # 6. discord.py 라이브러리 로거 설정
     # discord.py의 로그도 파일에 함께 기록되도록 레벨을 설정합니다.
     # (DEBUG는 너무 상세하므로 INFO 레벨로 선택)
-    logging.getLogger('discord').setLevel(logging.INFO)
-    logging.getLogger('discord.http').setLevel(logging.WARNING) # API 요청 로그는 경고 이상만
+    logging.getLogger('discord').setLevel(max(log_level, logging.INFO))
+    logging.getLogger('discord.http').setLevel(max(log_level, logging.WARNING)) # API 요청 로그는 경고 이상만
 
     logging.info("Logging system has been initialized.")
     logging.debug(f"File log level set to: {log_level_str}")
-    _cleanup_old_logs(log_dir)
+    if sampling or rate_limit:
+        logging.info("Log sampling: %s, rate limit: %s", sampling or "off", rate_limit or "off")
+    # 이전 버전의 실행별 로그 파일 정리는 시작을 지연시키지 않도록 백그라운드에서 수행합니다.
+    threading.Thread(target=_cleanup_old_logs, args=(log_dir,), name="log-cleanup", daemon=True).start()
+
+def shutdown_logging():
+    """리스너 스레드를 멈추고 큐에 남은 로그를 모두 기록합니다. 여러 번 호출해도 안전합니다."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
 
 def _cleanup_old_logs(log_dir: str, max_files: int = 10):
-    """지정된 디렉터리에서 가장 오래된 로그 파일을 정리합니다."""
-    logging.info("Checking for old log files...")
+    """이전 버전이 실행마다 만들던 로그 파일(bot_YYYY-MM-DD_HH-MM-SS.log)을 최근 max_files개만 남기고 정리합니다."""
     try:
-        files = [os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith(".log")]
+        files = [os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.startswith("bot_") and f.endswith(".log")]
         files.sort(key=os.path.getctime)
 
         if len(files) > max_files:
@@ -65,4 +299,4 @@ def _cleanup_old_logs(log_dir: str, max_files: int = 10):
                 os.remove(f)
                 logging.info(f"Removed old log file: {f}")
     except OSError as e:
-        logging.error(f"Error cleaning up old log files: {e}")
\ No newline at end of file
+        logging.error(f"Error cleaning up old log files: {e}")
@@ -0,0 +1,118 @@
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from collections import deque
+
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class LoopLagMonitor:
+    """
+    이벤트 루프의 스케줄링 지연(lag)을 측정하고, 루프를 오래 막는 콜백을 찾아냅니다.
+
+    - 샘플러 태스크: interval마다 잠들었다가 깨어난 시각이 예정보다 얼마나 늦었는지 기록합니다.
+    - 감시 스레드: 샘플러가 block_threshold 이상 깨어나지 못하면 루프 스레드의 현재 스택을 캡처합니다.
+      (루프가 막혀 있는 동안에도 동작해야 하므로 별도 스레드에서 실행합니다.)
+    """
+    def __init__(self, interval: float = 0.1, block_threshold: float = 0.25, max_samples: int = 3000, max_blocks: int = 20):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.enabled = False
+        self.samples: deque[float] = deque(maxlen=max_samples) # 최근 지연 시간(초)
+        self.max_lag = 0.0
+        self.blocks: deque[tuple[float, float, str]] = deque(maxlen=max_blocks) # (발생 시각, 지연 시간, 스택)
+        self.block_count = 0
+        self.loop_name = ""
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._sampler_task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """실행 중인 루프에서 호출해야 합니다."""
+        if self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        self.enabled = True
+        self.loop_name = f"{type(loop).__module__}.{type(loop).__name__}"
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._sampler_task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info("Loop lag monitor started on %s (interval=%.0f ms, block threshold=%.0f ms)",
+                    self.loop_name, self.interval * 1000, self.block_threshold * 1000)
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._stop.set()
+        if self._sampler_task:
+            self._sampler_task.cancel()
+        logger.info("Loop lag monitor stopped. %s", self.summary())
+
+    async def _sample(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - scheduled)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            self._heartbeat = time.monotonic()
+
+    def _watch(self):
+        reported_heartbeat = None
+        while not self._stop.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            # 하나의 정체 구간은 한 번만 기록합니다.
+            reported_heartbeat = heartbeat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "(stack unavailable)"
+            self.block_count += 1
+            self.blocks.append((time.time(), stalled, stack))
+            logger.warning("Event loop blocked for more than %.0f ms. Loop thread stack:\n%s", stalled * 1000, stack)
+
+    def percentile(self, ratio: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+    def stats(self) -> dict:
+        count = len(self.samples)
+        return {
+            'enabled': self.enabled,
+            'loop': self.loop_name,
+            'samples': count,
+            'mean_ms': round(sum(self.samples) / count * 1000, 2) if count else 0.0,
+            'p99_ms': round(self.percentile(0.99) * 1000, 2),
+            'max_ms': round(self.max_lag * 1000, 2),
+            'blocks': self.block_count,
+        }
+
+    def summary(self) -> str:
+        s = self.stats()
+        return (f"loop={s['loop']} samples={s['samples']} mean={s['mean_ms']}ms "
+                f"p99={s['p99_ms']}ms max={s['max_ms']}ms blocks={s['blocks']}")
+
+# 프로세스 전체에서 공유하는 모니터 (main에서 start)
+loop_monitor = LoopLagMonitor()
+
+# 모니터가 켜져 있을 때만 내보냅니다. (None을 반환하면 해당 지표를 생략)
+metrics.gauge("bot_event_loop_lag_p99_seconds", "99th percentile of recent event loop scheduling lag.").set_function(
+    lambda: loop_monitor.percentile(0.99) if loop_monitor.enabled else None)
+metrics.gauge("bot_event_loop_lag_max_seconds", "Largest event loop scheduling lag since the monitor started.").set_function(
+    lambda: loop_monitor.max_lag if loop_monitor.enabled else None)
+metrics.counter("bot_event_loop_blocks_total", "Times the event loop was blocked longer than the threshold.").set_function(
+    lambda: loop_monitor.block_count if loop_monitor.enabled else None)
@@ -0,0 +1,200 @@
+import os
+import sys
+import time
+import logging
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+MEMORY_DUMP_DIR = os.getenv("MEMORY_DUMP_DIR", "memdumps")
+MEMORY_TOP_LIMIT = 10 # 스냅샷 결과에 보여 줄 할당 위치 수
+DEEP_SIZEOF_MAX_OBJECTS = 200_000 # deep_sizeof가 한 번에 따라갈 최대 객체 수
+
+# 스냅샷 비교에서 프로파일러 자신과 임포트 기계의 할당은 제외합니다.
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+# 따라가지 않는 타입: 공유되는 정의 객체이므로 캐시 크기에 넣지 않습니다.
+_SKIP_TYPES = (type, type(sys), type(len), type(lambda: None))
+
+def format_bytes(size: int | None) -> str:
+    if size is None:
+        return "-"
+    value = float(size)
+    for unit in ("B", "KB", "MB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.2f} GB"
+
+def deep_sizeof(obj: object, max_objects: int = DEEP_SIZEOF_MAX_OBJECTS, exclude: tuple = ()) -> int:
+    """
+    obj와 obj가 (컨테이너, __dict__, __slots__로) 붙잡고 있는 객체들의 크기 합을 추정합니다.
+    같은 객체는 한 번만 세며, max_objects개를 넘으면 그때까지의 합(하한값)을 반환합니다.
+    exclude의 객체(와 그 객체를 통해서만 닿는 객체)는 세지 않습니다. (공유하는 연결 상태, 채널 등)
+    """
+    seen: set[int] = {id(item) for item in exclude}
+    pending = [obj]
+    total = 0
+    while pending and len(seen) < max_objects:
+        item = pending.pop()
+        if id(item) in seen or isinstance(item, _SKIP_TYPES):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, (str, bytes, int, float, bool)) or item is None:
+            continue
+        if isinstance(item, dict):
+            pending.extend(item.keys())
+            pending.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            pending.extend(item)
+        if hasattr(item, '__dict__'):
+            pending.append(vars(item))
+        for slot in getattr(type(item), '__slots__', ()):
+            if hasattr(item, slot):
+                pending.append(getattr(item, slot))
+    return total
+
+@dataclass
+class CacheUsage:
+    """캐시 하나의 크기. size는 추정 바이트 수이며, 재지 않은 캐시는 None입니다."""
+    name: str
+    count: int
+    size: int | None = None
+    limit: int | None = None
+
+@dataclass
+class MemoryReport:
+    """'/mem'의 결과입니다. 서비스가 프로세스/계정 정보를 채우고, View가 자신의 캐시를 더해 표시합니다."""
+    rss: int | None
+    peak_rss: int | None
+    tracing: bool
+    traced: tuple[int, int] | None = None # tracemalloc이 추적한 (현재, 최대) 바이트
+    caches: list[CacheUsage] = field(default_factory=list)
+    top: list[tracemalloc.Statistic] = field(default_factory=list)
+    diff: list[tracemalloc.StatisticDiff] = field(default_factory=list)
+    diff_base: str | None = None # 비교 대상 (이전 스냅샷 또는 파일 경로)
+    dump_path: str | None = None
+
+    def to_dict(self) -> dict:
+        return {
+            'rss': self.rss,
+            'peak_rss': self.peak_rss,
+            'tracing': self.tracing,
+            'traced': list(self.traced) if self.traced else None,
+            'caches': [vars(cache) for cache in self.caches],
+            'top': [{'location': _location(stat.traceback), 'size': stat.size, 'count': stat.count} for stat in self.top],
+            'diff': [
+                {'location': _location(stat.traceback), 'size': stat.size, 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                for stat in self.diff
+            ],
+            'diff_base': self.diff_base,
+            'dump_path': self.dump_path,
+        }
+
+def _location(traceback: tracemalloc.Traceback) -> str:
+    frame = traceback[0]
+    return f"{frame.filename}:{frame.lineno}"
+
+class MemoryProfiler:
+    """
+    프로세스 메모리(RSS)와 tracemalloc 스냅샷을 다룹니다. (/mem, --tracemalloc)
+
+    tracemalloc은 모든 할당에 비용이 들므로 켜 달라고 할 때만 추적합니다. 마지막으로 찍은 스냅샷을 기준으로 보관해
+    다음 스냅샷과의 차이를 보여 주며, 스냅샷을 파일로 저장하면 나중에 다른 프로세스에서도 비교할 수 있습니다.
+    """
+    MAX_FRAMES = 65535 # tracemalloc.start()가 받는 최대 스택 깊이 (1 이상)
+
+    def __init__(self):
+        self.baseline: tracemalloc.Snapshot | None = None
+        self.baseline_label: str | None = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1):
+        if self.tracing:
+            return
+        tracemalloc.start(frames)
+        logger.info("tracemalloc started (frames=%d).", frames)
+
+    def stop(self):
+        if not self.tracing:
+            return
+        tracemalloc.stop()
+        self.baseline = None
+        self.baseline_label = None
+        logger.info("tracemalloc stopped.")
+
+    @staticmethod
+    def rss() -> int | None:
+        """현재 RSS(바이트). /proc이 없는 환경에서는 None입니다."""
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError, AttributeError):
+            return None
+
+    @staticmethod
+    def peak_rss() -> int | None:
+        """프로세스 시작 후 최대 RSS(바이트)."""
+        try:
+            import resource
+        except ImportError: # Windows
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024 # macOS는 바이트, Linux는 KB
+
+    def traced(self) -> tuple[int, int] | None:
+        return tracemalloc.get_traced_memory() if self.tracing else None
+
+    def take_snapshot(self) -> tracemalloc.Snapshot:
+        started = time.perf_counter()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        logger.debug("Took tracemalloc snapshot in %.1f ms", (time.perf_counter() - started) * 1000)
+        return snapshot
+
+    @staticmethod
+    def top(snapshot: tracemalloc.Snapshot, limit: int = MEMORY_TOP_LIMIT) -> list[tracemalloc.Statistic]:
+        return snapshot.statistics('lineno')[:limit]
+
+    @staticmethod
+    def compare(snapshot: tracemalloc.Snapshot, base: tracemalloc.Snapshot, limit: int = MEMORY_TOP_LIMIT) -> list[tracemalloc.StatisticDiff]:
+        """base 이후 가장 많이 늘어난(또는 줄어든) 할당 위치를 반환합니다."""
+        return [stat for stat in snapshot.compare_to(base, 'lineno') if stat.size_diff][:limit]
+
+    @staticmethod
+    def dump(snapshot: tracemalloc.Snapshot, directory: str = MEMORY_DUMP_DIR) -> str:
+        """스냅샷을 파일로 저장하고 경로를 반환합니다. (이벤트 루프 밖에서 실행)"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"snapshot-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.tracemalloc")
+        snapshot.dump(path)
+        return path
+
+    @staticmethod
+    def load(name: str, directory: str = MEMORY_DUMP_DIR) -> tracemalloc.Snapshot:
+        """
+        dump로 저장한 스냅샷을 불러옵니다. (이벤트 루프 밖에서 실행)
+        스냅샷 파일은 pickle이므로 directory 바로 아래의 파일 이름(또는 dump가 반환한 'directory/이름')만 받고,
+        절대 경로, '..', 다른 디렉터리를 가리키는 경로는 ValueError로 거부합니다. (제어 소켓으로도 요청할 수 있음)
+        """
+        parts = name.replace("\\", "/").split("/")
+        if os.path.isabs(name) or ".." in parts:
+            raise ValueError(f"snapshot must be a file name in {directory}: {name}")
+        head, filename = os.path.split(os.path.normpath(name))
+        if not filename or head not in ("", os.path.normpath(directory)):
+            raise ValueError(f"snapshot must be a file name in {directory}: {name}")
+        path = os.path.join(directory, filename)
+        if os.path.dirname(os.path.realpath(path)) != os.path.realpath(directory):
+            raise ValueError(f"snapshot must be a file name in {directory}: {name}")
+        return tracemalloc.Snapshot.load(path)
+
+# 프로세스 전체에서 공유하는 프로파일러
+memory_profiler = MemoryProfiler()
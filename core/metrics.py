@@ -0,0 +1,190 @@
+import math
+import logging
+from bisect import bisect_left
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 지연 시간용 기본 구간 (이벤트 디스패치부터 REST 요청까지)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+class _Metric:
+    """
+    이름, 설명, 레이블 이름을 가진 지표 하나. 레이블 값 조합마다 자식(값)을 하나씩 둡니다.
+
+    갱신은 잠금 없이 일반 dict/리스트 연산으로 합니다. 모든 갱신과 렌더링이 이벤트 루프 스레드에서 일어나므로
+    경쟁이 없고, 핫 패스의 비용은 dict 조회 한 번과 덧셈뿐입니다. (다른 스레드에서는 갱신하지 마세요.)
+    """
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple, object] = {}
+        self._functions: dict[tuple, Callable[[], float]] = {}
+
+    def labels(self, *values):
+        """레이블 값에 해당하는 자식을 반환합니다. 자주 갱신하는 곳에서는 반환값을 보관해 두고 쓰세요."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def set_function(self, function: Callable[[], float], *values):
+        """값을 저장하지 않고 수집할 때마다 function()을 호출해 읽습니다. (대기열 길이, 캐시 크기 등)"""
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        self._functions[values] = function
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(child.value)}"
+        for values, function in self._functions.items():
+            try:
+                value = function()
+            except Exception: # 수집 함수 하나가 실패해도 나머지 지표는 내보냅니다.
+                logger.debug("Metric function for %s%s failed", self.name, values, exc_info=True)
+                continue
+            if value is not None:
+                yield f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}"
+
+    def render(self) -> str:
+        samples = list(self._samples())
+        if not samples:
+            return ""
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "\n".join(samples) + "\n"
+
+class _Value:
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def set(self, value: float):
+        self.value = value
+
+class Counter(_Metric):
+    """단조 증가하는 값. 이름은 _total로 끝나야 합니다."""
+    kind = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        """레이블이 없는 지표를 증가시킵니다."""
+        self.labels().inc(amount)
+
+class Gauge(_Metric):
+    """오르내리는 현재 값."""
+    kind = "gauge"
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+class _HistogramValue:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # 마지막 칸은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        # 구간별로는 누적하지 않고 세어 두었다가 렌더링할 때 누적합니다.
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Histogram(_Metric):
+    """값의 분포. 지연 시간처럼 평균보다 분위수가 중요한 값에 씁니다."""
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def set_function(self, function, *values):
+        raise TypeError("Histograms cannot be collected from a function.")
+
+    def _samples(self) -> Iterator[str]:
+        for values, child in self._children.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), child.counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, values, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, values)
+            yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+            yield f"{self.name}_count{labels} {child.count}"
+
+class MetricsRegistry:
+    """
+    프로세스 전체의 지표 모음입니다. 각 모듈이 필요한 지표를 만들어 갱신하고,
+    내보내기(--metrics-port, --metrics-file)가 켜져 있으면 Prometheus 텍스트 형식으로 렌더링합니다.
+    같은 이름으로 다시 만들면 기존 지표를 반환합니다.
+    """
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls: type, name: str, documentation: str, labelnames: tuple[str, ...], **kwargs) -> _Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"Metric {name} is already registered as a different type or with different labels.")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 반환합니다."""
+        return "".join(metric.render() for metric in self._metrics.values())
+
+# 프로세스 전체에서 공유하는 지표 모음
+metrics = MetricsRegistry()
@@ -0,0 +1,140 @@
+import os
+import re
+import time
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import web
+
+from .metrics import MetricsRegistry, metrics
+
+logger = logging.getLogger(__name__)
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_FILE_INTERVAL = float(os.getenv("METRICS_FILE_INTERVAL", "15")) # 텍스트 파일을 다시 쓰는 간격(초)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_HTTP_REQUESTS = metrics.counter(
+    "discord_http_requests_total", "Discord REST requests by response status ('error' for connection failures).",
+    ("account", "method", "route", "status"),
+)
+_HTTP_DURATION = metrics.histogram(
+    "discord_http_request_duration_seconds", "Discord REST request latency including the response headers.",
+    ("account", "method", "route"),
+)
+_HTTP_RETRIES = metrics.counter(
+    "discord_http_retries_total", "Discord REST responses that discord.py retries (429 rate limits, 5xx, connection errors).",
+    ("account", "route", "reason"),
+)
+
+_API_PREFIX = re.compile(r"^/api(?:/v\d+)?")
+_SNOWFLAKE = re.compile(r"/\d{15,}")
+_TOKEN = re.compile(r"(/(?:webhooks|interactions)/\{id\})/[^/]+")
+_EMOJI = re.compile(r"/reactions/[^/]+")
+
+def route_of(url) -> str:
+    """
+    요청 URL을 지표 레이블로 쓸 경로로 바꿉니다. ID와 토큰, 이모지를 자리 표시자로 바꿔 레이블 수가 늘지 않게 하고,
+    첨부 파일 CDN처럼 API가 아닌 요청은 호스트 이름만 남깁니다.
+    """
+    parts = urlsplit(str(url))
+    if not parts.path.startswith("/api"):
+        return parts.hostname or ""
+    path = _SNOWFLAKE.sub("/{id}", _API_PREFIX.sub("", parts.path))
+    return _EMOJI.sub("/reactions/{emoji}", _TOKEN.sub(r"\1/{token}", path))
+
+def discord_http_trace(account: str) -> aiohttp.TraceConfig:
+    """
+    discord.py의 HTTP 세션에 붙일 TraceConfig(commands.Bot의 http_trace)를 만듭니다.
+    discord.py는 429와 5xx 응답, 연결 오류를 내부에서 다시 시도하므로, 시도 하나하나가 요청 수와 지연 시간에 잡히고
+    다시 시도하게 만든 응답은 retries로 따로 셉니다.
+    """
+    async def on_request_start(session, context, params):
+        context.started = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        route = route_of(params.url)
+        status = params.response.status
+        _HTTP_DURATION.labels(account, params.method, route).observe(time.perf_counter() - context.started)
+        _HTTP_REQUESTS.labels(account, params.method, route, str(status)).inc()
+        if status == 429:
+            _HTTP_RETRIES.labels(account, route, "rate_limited").inc()
+        elif status >= 500:
+            _HTTP_RETRIES.labels(account, route, "server_error").inc()
+
+    async def on_request_exception(session, context, params):
+        route = route_of(params.url)
+        _HTTP_DURATION.labels(account, params.method, route).observe(time.perf_counter() - context.started)
+        _HTTP_REQUESTS.labels(account, params.method, route, "error").inc()
+        if isinstance(params.exception, OSError):
+            _HTTP_RETRIES.labels(account, route, "connection").inc()
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    trace.on_request_exception.append(on_request_exception)
+    return trace
+
+class MetricsExporter:
+    """
+    지표를 Prometheus 텍스트 형식으로 내보냅니다. (--metrics-port, --metrics-file)
+
+    - HTTP: METRICS_HOST:port의 /metrics에서 요청할 때마다 렌더링합니다.
+    - 텍스트 파일: node-exporter의 textfile 수집기가 읽도록 METRICS_FILE_INTERVAL마다 다시 씁니다.
+      수집기가 반쯤 쓴 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    렌더링은 갱신과 같은 이벤트 루프에서 하고, 파일 쓰기만 스레드에서 합니다.
+    """
+    def __init__(self, registry: MetricsRegistry = metrics, port: int | None = None, path: str | None = None, host: str = METRICS_HOST):
+        self.registry = registry
+        self.port = port
+        self.path = path
+        self.host = host
+        self._runner: web.AppRunner | None = None
+        self._writer_task: asyncio.Task | None = None
+
+    async def start(self):
+        if self.port is not None:
+            app = web.Application()
+            app.router.add_get("/metrics", self._handle_metrics)
+            self._runner = web.AppRunner(app, access_log=None)
+            await self._runner.setup()
+            await web.TCPSite(self._runner, self.host, self.port).start()
+            logger.info("Serving metrics on http://%s:%d/metrics", self.host, self.port)
+        if self.path:
+            self._writer_task = asyncio.create_task(self._write_loop())
+            logger.info("Writing metrics to %s every %.0f s", self.path, METRICS_FILE_INTERVAL)
+
+    async def stop(self):
+        if self._writer_task:
+            self._writer_task.cancel()
+            self._writer_task = None
+            # 종료 직전의 값을 남겨 둡니다.
+            await self._write_file()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+        logger.info("Metrics exporter stopped.")
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.registry.render().encode("utf-8"), headers={"Content-Type": CONTENT_TYPE})
+
+    async def _write_loop(self):
+        while True:
+            await self._write_file()
+            await asyncio.sleep(METRICS_FILE_INTERVAL)
+
+    async def _write_file(self):
+        text = self.registry.render()
+        try:
+            await asyncio.to_thread(self._replace_file, self.path, text)
+        except OSError as e:
+            logger.warning("Failed to write metrics file %s: %s", self.path, e)
+
+    @staticmethod
+    def _replace_file(path: str, text: str):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
@@ -0,0 +1,31 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncContextManager, Callable
+
+@dataclass
+class RequestContext:
+    """
+    하나의 외부 요청(헤드리스 입력 한 줄, 소켓 요청 하나 등)을 나타냅니다.
+    요청을 처리하는 동안 발행된 이벤트는 emit을 통해 요청자에게 전달됩니다.
+    """
+    request_id: Any
+    emit: Callable[[dict], None]
+    origin: object = None # 요청을 만든 View (이벤트를 중복 전달하지 않기 위해 사용)
+    channel_id: int | None = None # 요청이 지정한 채널 (제어 API). 현재 채널 대신 쓰며 app_state는 바꾸지 않습니다.
+    extra: dict = field(default_factory=dict)
+
+# 현재 태스크가 처리 중인 요청. 이벤트 핸들러는 같은 태스크에서 실행되므로 이 값으로 응답 대상을 찾습니다.
+current_request: ContextVar[RequestContext | None] = ContextVar('current_request', default=None)
+
+# 실행기 작업 안에서 순서 키를 뒤늦게 잡는 함수. ordered_section.get()(키, ...)는 같은 키로 앞서 제출된 작업이 끝난 뒤
+# 진입하고, 나올 때까지 이후 작업을 기다리게 하는 컨텍스트 관리자를 반환합니다. (CommandExecutor가 작업마다 설정)
+ordered_section: ContextVar[Callable[..., AsyncContextManager] | None] = ContextVar('ordered_section', default=None)
+
+def request_channel_id() -> int | None:
+    """현재 태스크가 처리 중인 요청이 지정한 채널 ID. 지정하지 않았으면 None(현재 채널 사용)입니다."""
+    context = current_request.get()
+    return context.channel_id if context is not None else None
+
+def channel_ordering_key(channel_id: int | None) -> tuple:
+    """채널 쓰기 작업의 순서 키."""
+    return ('channel', channel_id)
@@ -0,0 +1,24 @@
+import asyncio
+import logging
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+class SharedConnector(aiohttp.TCPConnector):
+    """
+    여러 봇(계정)과 다운로드 세션이 함께 쓰는 연결 풀입니다.
+
+    discord.py는 봇을 닫을 때(치명적인 Gateway 오류 포함) HTTP 세션과 함께 커넥터까지 닫으므로,
+    계정 하나가 멈춰도 다른 계정의 연결이 끊기지 않도록 close()는 무시하고 shutdown()으로만 닫습니다.
+    """
+    def close(self, *args, **kwargs):
+        if not getattr(self, '_shutting_down', False):
+            logger.debug("Ignoring close() on shared connector.")
+            return asyncio.sleep(0)
+        return super().close(*args, **kwargs)
+
+    async def shutdown(self):
+        """모든 계정을 닫은 뒤 호출하여 실제로 연결 풀을 닫습니다."""
+        self._shutting_down = True
+        await self.close()
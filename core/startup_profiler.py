@@ -0,0 +1,45 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StartupProfiler:
+    """
+    프로그램 시작 단계별 소요 시간을 기록합니다. (--profile-startup)
+
+    비활성화 상태에서는 mark()가 아무 일도 하지 않으므로, 시작 경로 곳곳에서 부담 없이 호출할 수 있습니다.
+    같은 단계는 처음 한 번만 기록합니다. (예: 재연결 시의 on_connect는 무시)
+    """
+    def __init__(self):
+        self.enabled = False
+        self.started = time.perf_counter()
+        self.marks: list[tuple[str, float]] = []
+
+    def enable(self, started: float | None = None):
+        """기록을 시작합니다. started는 측정 기준 시각(perf_counter)으로, 생략하면 지금입니다."""
+        self.enabled = True
+        self.started = started if started is not None else time.perf_counter()
+        self.marks.clear()
+
+    def mark(self, phase: str):
+        if not self.enabled or self.has(phase):
+            return
+        elapsed = time.perf_counter() - self.started
+        self.marks.append((phase, elapsed))
+        logger.info("Startup phase '%s' reached at %.1f ms", phase, elapsed * 1000)
+
+    def has(self, phase: str) -> bool:
+        return any(name == phase for name, _ in self.marks)
+
+    def report(self) -> str:
+        text = "\n--- 시작 시간 프로파일 ---\n"
+        text += f"  {'단계':<24} {'누적':>10} {'구간':>10}\n"
+        previous = 0.0
+        for phase, elapsed in self.marks:
+            text += f"  {phase:<24} {elapsed * 1000:>8.1f}ms {(elapsed - previous) * 1000:>8.1f}ms\n"
+            previous = elapsed
+        text += "--------------------------"
+        return text
+
+# 프로세스 전체에서 공유하는 프로파일러 (main에서 enable)
+startup_profiler = StartupProfiler()
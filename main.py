@@ -1,119 +1,346 @@
+import time
+_PROCESS_STARTED = time.perf_counter() # --profile-startup의 측정 기준 시각
+
 import os
+import sys
 import asyncio
 import logging
+import argparse
 
-from discord.ext import commands
-from discord import Intents
 from dotenv import load_dotenv
 
-# Core
-from core import EventManager, EventType, setup_logging
+# Core (가벼운 모듈만 먼저 임포트하고, discord.py 등은 토큰 확인 후 실행 모드에 맞춰 임포트합니다.)
+from core import (
+    EventManager, EventType, setup_logging, shutdown_logging, startup_profiler, loop_monitor, current_account, memory_profiler,
+    metrics,
+)
 
-# Models
-from models import AppState
+# Control API (소켓 경로 상수만 사용하며, 서버는 --control-socket일 때 임포트합니다.)
+from control.protocol import DEFAULT_SOCKET_PATH
 
-# Controllers
-from controllers import CommandController
+logger = logging.getLogger(__name__)
 
-# Views
-from views import TUIView
+def parse_tokens() -> list[tuple[str, str]]:
+    """
+    실행할 (계정 이름, 토큰) 목록을 반환합니다.
+    DISCORD_TOKENS('이름=토큰,이름=토큰' 또는 '토큰,토큰')가 있으면 여러 계정을, 없으면 DISCORD_TOKEN 하나를 실행합니다.
+    이름을 생략한 토큰은 bot1, bot2, ...로 부릅니다.
+    """
+    spec = os.getenv("DISCORD_TOKENS", "").strip()
+    if not spec:
+        token = os.getenv("DISCORD_TOKEN")
+        return [("main", token)] if token else []
+    accounts: list[tuple[str, str]] = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, token = item.partition("=")
+        # 토큰에는 항상 '.'이 들어 있으므로, '=' 앞에 '.'이 없을 때만 이름으로 봅니다.
+        if not sep or "." in name:
+            name, token = f"bot{len(accounts) + 1}", item
+        name = name.strip()
+        if any(name == existing for existing, _ in accounts):
+            raise RuntimeError(f"DISCORD_TOKENS has a duplicate account name: {name}")
+        accounts.append((name, token.strip()))
+    return accounts
 
-# Services
-from services import DiscordBotService
+def account_path(path: str, name: str) -> str:
+    """기본(첫 번째) 계정이 아닌 계정의 상태 파일 경로입니다. 예: watchlist.json -> watchlist.alerts.json"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{name}{ext}"
 
-# Cogs
-from cogs import ChatBridge
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="터미널에서 사용하는 Discord 봇 클라이언트")
+    parser.add_argument("--headless", action="store_true",
+                        help="TUI 없이 stdin(또는 --script)의 명령어를 실행하고 결과를 NDJSON으로 출력합니다.")
+    parser.add_argument("--script", metavar="PATH",
+                        help="헤드리스 모드에서 stdin 대신 읽을 명령어 파일")
+    parser.add_argument("--guild", help="헤드리스 모드에서 시작 시 선택할 서버 (인덱스, ID 또는 이름)")
+    parser.add_argument("--channel", help="헤드리스 모드에서 시작 시 선택할 채널 (인덱스, ID 또는 이름)")
+    parser.add_argument("--follow", action="store_true",
+                        help="헤드리스 모드에서 새로 수신되는 메시지도 출력하고, 입력이 끝나도 종료하지 않습니다.")
+    parser.add_argument("--account", metavar="NAME",
+                        help="여러 계정(DISCORD_TOKENS)을 실행할 때 처음 선택할 계정 (인덱스 또는 이름). 헤드리스 모드와 제어 API는 이 계정을 사용합니다.")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="동시에 실행할 수 있는 독립 명령어의 최대 개수 (기본값: 8)")
+    parser.add_argument("--control-socket", nargs="?", const=DEFAULT_SOCKET_PATH, metavar="PATH",
+                        help=f"다른 프로세스가 사용할 로컬 제어 API(Unix 소켓)를 엽니다. (기본 경로: {DEFAULT_SOCKET_PATH})")
+    parser.add_argument("--chunk-guilds", choices=["startup", "selected", "off"], default="selected",
+                        help="서버 멤버 목록을 받는 시점: startup(시작 시 전체 서버), selected(선택한 서버만, 기본값), off(받지 않음)")
+    parser.add_argument("--member-cache", choices=["all", "none"], default="all",
+                        help="Gateway 이벤트로 알게 된 멤버를 캐시할지 여부 (기본값: all). 선택한 서버의 멤버 목록은 항상 캐시합니다.")
+    parser.add_argument("--max-messages", type=int, default=1000,
+                        help="discord.py가 메모리에 보관하는 메시지 수 (기본값: 1000, 0이면 보관하지 않음)")
+    parser.add_argument("--members-intent", action=argparse.BooleanOptionalAction, default=True,
+                        help="멤버 인텐트 사용 여부. 끄면 멤버 목록과 닉네임 변경을 받지 않습니다. (메시지의 작성자/멘션 이름은 그대로 표시됩니다.)")
+    parser.add_argument("--message-content-intent", action=argparse.BooleanOptionalAction, default=True,
+                        help="메시지 내용 인텐트 사용 여부. 끄면 봇을 멘션하지 않은 다른 사람의 서버 메시지는 내용과 첨부 파일이 비어 있습니다.")
+    parser.add_argument("--intents", choices=["default", "minimal"], default="default",
+                        help="나머지 인텐트: default(discord.py 기본값), minimal(서버/채널과 메시지 이벤트만 받고, 입력 중 표시, 반응, 음성 상태, 이모지 등 이 앱이 쓰지 않는 이벤트는 받지 않음)")
+    parser.add_argument("--uvloop", action="store_true", default=os.getenv("USE_UVLOOP") == "1",
+                        help="설치되어 있다면 uvloop 이벤트 루프를 사용합니다. (환경 변수 USE_UVLOOP=1과 같음)")
+    parser.add_argument("--loop-monitor", nargs="?", type=float, const=250.0, metavar="MS",
+                        help="이벤트 루프 지연을 측정하고, MS(기본값: 250) 이상 루프를 막은 콜백의 스택을 기록합니다. 결과는 /stats에 표시됩니다.")
+    parser.add_argument("--tracemalloc", nargs="?", type=int, const=1, metavar="FRAMES",
+                        help=f"시작부터 tracemalloc으로 할당을 추적합니다. FRAMES는 할당마다 기록할 스택 깊이(1~{memory_profiler.MAX_FRAMES}, 기본값: 1)이며, 결과는 /mem snapshot에 표시됩니다.")
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("METRICS_PORT", "0")) or None, metavar="PORT",
+                        help="Prometheus 텍스트 형식 지표를 http://METRICS_HOST:PORT/metrics에서 제공합니다. (환경 변수 METRICS_PORT와 같음)")
+    parser.add_argument("--metrics-file", default=os.getenv("METRICS_FILE") or None, metavar="PATH",
+                        help="지표를 node-exporter textfile 수집기용 파일(*.prom)에 주기적으로 씁니다. (환경 변수 METRICS_FILE과 같음)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="임포트, 로깅 설정, Cog 등록, Gateway 연결, READY, 첫 화면까지의 시간을 측정하여 표시합니다.")
+    args = parser.parse_args(argv)
+    if args.tracemalloc is not None and not 1 <= args.tracemalloc <= memory_profiler.MAX_FRAMES:
+        parser.error(f"--tracemalloc FRAMES는 1에서 {memory_profiler.MAX_FRAMES} 사이여야 합니다.")
+    return args
 
-logger = logging.getLogger(__name__)
+async def main(args: argparse.Namespace):
+    if args.tracemalloc:
+        # 시작 과정의 할당도 스냅샷에 잡히도록 가장 먼저 켭니다.
+        memory_profiler.start(args.tracemalloc)
+    if args.profile_startup:
+        startup_profiler.enable(started=_PROCESS_STARTED)
+    startup_profiler.mark("imports.core")
 
-async def main():
     # 0. Initialize Logging
     load_dotenv()
     setup_logging()
-    logger.info("Application starting...")
+    startup_profiler.mark("logging")
+    logger.info("Application starting on %s event loop...", type(asyncio.get_running_loop()).__name__)
+    if args.loop_monitor:
+        loop_monitor.block_threshold = args.loop_monitor / 1000
+        loop_monitor.start()
 
-    TOKEN = os.getenv("DISCORD_TOKEN")
-    if not TOKEN:
+    tokens = parse_tokens()
+    if not tokens:
         # Log the error before raising it
         logger.critical("DISCORD_TOKEN environment variable is not set.")
         raise RuntimeError("DISCORD_TOKEN environment variable is not set.")
+    multi_account = len(tokens) > 1
+
+    # Deferred imports: 실행 모드에 필요한 모듈만 불러옵니다.
+    import aiohttp
+    from discord import Intents, MemberCacheFlags
+    from discord.ext import commands
+    startup_profiler.mark("imports.discord")
+
+    from models import AppState
+    from services import DiscordBotService, WatchService, AttachmentIndex, AttachmentCrawler, ExportService, MemoryService
+    from services.watch_service import WATCHLIST_PATH
+    from services.export_service import EXPORT_DIR
+    from core.shared_connector import SharedConnector # aiohttp를 쓰므로 core 패키지와 따로 임포트합니다.
+    from controllers import CommandController, CommandExecutor, Account
+    from cogs import ChatBridge
+    exporter = None
+    if args.metrics_port or args.metrics_file:
+        from core.metrics_exporter import MetricsExporter, discord_http_trace # aiohttp.web을 쓰므로 지표를 내보낼 때만 임포트합니다.
+        exporter = MetricsExporter(port=args.metrics_port, path=args.metrics_file)
+    startup_profiler.mark("imports.app")
+
+    # 1. Initialize Shared Components
+    # 계정과 무관한 자원은 하나만 만들어 모든 계정이 함께 씁니다. (로깅은 프로세스 전역)
+    logger.info("Initializing shared components for %d account(s)...", len(tokens))
+    # 모든 봇의 REST/Gateway 연결과 첨부 파일 다운로드가 하나의 연결 풀을 씁니다. (discord.py 기본값과 같은 limit=0)
+    connector = SharedConnector(limit=0)
+    download_session = aiohttp.ClientSession(
+        connector=connector, connector_owner=False,
+        trace_configs=[discord_http_trace("downloads")] if exporter else None,
+    )
+    attachment_index = AttachmentIndex()
+    metrics.gauge("process_resident_memory_bytes", "Resident memory size in bytes.").set_function(memory_profiler.rss)
+
+    # 화면에 쓰는 이벤트는 서버/채널(guilds)과 메시지뿐입니다. 큰 서버에서는 입력 중 표시와 반응 이벤트가 특히 많습니다.
+    intents = Intents.default() if args.intents == "default" else Intents(guilds=True, guild_messages=True, dm_messages=True)
+    intents.message_content = args.message_content_intent
+    intents.members = args.members_intent
+    member_cache_flags = MemberCacheFlags.from_intents(intents) if args.member_cache == "all" else MemberCacheFlags.none()
+    logger.info(
+        "Bot options: intents=%s (value=%d), members_intent=%s, message_content_intent=%s, chunk_guilds=%s, member_cache=%s, max_messages=%s",
+        args.intents, intents.value, args.members_intent, args.message_content_intent, args.chunk_guilds, args.member_cache, args.max_messages,
+    )
+
+    # 2. Setup Accounts (Bot, Services, Controllers and Cogs per account)
+    async def create_account(name: str, primary: bool) -> Account:
+        logger.info("Setting up account '%s'...", name)
+        app_state = AppState()
+        event_manager = EventManager(name)
+        bot = commands.Bot(
+            command_prefix="!",
+            intents=intents,
+            # 시작 시 모든 서버의 멤버를 받으면 큰 서버가 많을수록 READY가 늦어집니다.
+            chunk_guilds_at_startup=args.members_intent and args.chunk_guilds == "startup",
+            member_cache_flags=member_cache_flags,
+            max_messages=args.max_messages or None,
+            connector=connector,
+            # 지표를 내보낼 때만 REST 요청마다 지연 시간과 상태 코드를 기록합니다.
+            http_trace=discord_http_trace(name) if exporter else None,
+        )
+        bot_service = DiscordBotService(
+            bot, app_state, event_manager,
+            chunk_on_select=args.chunk_guilds == "selected", http_session=download_session,
+        )
+        # 감시 목록과 내보내기 체크포인트는 계정마다 따로 둡니다. (첫 번째 계정은 단일 계정일 때와 같은 경로)
+        WatchService(bot, app_state, event_manager, path=WATCHLIST_PATH if primary else account_path(WATCHLIST_PATH, name))
+        AttachmentCrawler(bot, app_state, event_manager, attachment_index)
+        ExportService(
+            bot_service, app_state, event_manager,
+            export_dir=EXPORT_DIR if primary else os.path.join(EXPORT_DIR, name), wait=args.headless,
+        )
+        MemoryService(bot, app_state, event_manager)
+        controller = CommandController(bot_service, app_state, event_manager)
+        executor = CommandExecutor(
+            controller, app_state, event_manager,
+            max_concurrency=args.concurrency, account=name if multi_account else None,
+        )
+        await bot.add_cog(ChatBridge(bot, event_manager, app_state))
+        register_lifecycle_events(bot, event_manager, f"[{name}] " if multi_account else "")
+        register_account_metrics(name, bot, executor)
+        return Account(name, bot, app_state, event_manager, bot_service, controller, executor)
+
+    def register_account_metrics(name: str, bot: commands.Bot, executor: CommandExecutor):
+        # 값을 따로 저장하지 않고 수집할 때 읽습니다.
+        metrics.gauge("discord_gateway_latency_seconds", "Gateway heartbeat latency.", ("account",)).set_function(
+            lambda: bot.latency if bot.is_ready() else None, name)
+        metrics.gauge("discord_cached_messages", "Messages held in the discord.py message cache.", ("account",)).set_function(
+            lambda: len(bot.cached_messages), name)
+        metrics.gauge("discord_guilds", "Guilds the bot is in.", ("account",)).set_function(lambda: len(bot.guilds), name)
+        metrics.gauge("bot_jobs_in_flight", "Commands and messages running or waiting in the executor.", ("account",)).set_function(
+            lambda: executor.in_flight, name)
 
-    # 1. Initialize Core Components
-    logger.info("Initializing core components...")
-    app_state = AppState()
-    event_manager = EventManager()
+    def register_lifecycle_events(bot: commands.Bot, event_manager: EventManager, prefix: str):
+        @bot.event
+        async def on_ready():
+            first_ready = not startup_profiler.has("ready")
+            startup_profiler.mark("ready")
+            logger.info("Bot is ready. Logged in as %s (ID: %s)", bot.user.name, bot.user.id)
+            await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"\n--- {prefix}봇 연결 성공! ---")
+            await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"로그인 완료: {bot.user.name} (ID: {bot.user.id})")
+            # BOT_STATUS_READY는 ChatBridge.on_ready에서 한 번만 발행합니다.
+            if startup_profiler.enabled and first_ready:
+                report = startup_profiler.report()
+                logger.info("Startup profile:%s", report)
+                await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, report)
 
-    # 2. Setup Discord Bot
-    logger.info("Setting up Discord bot...")
-    intents = Intents.default()
-    intents.message_content = True
-    intents.members = True
-    bot = commands.Bot(command_prefix="!", intents=intents)
+        @bot.event
+        async def on_connect():
+            startup_profiler.mark("gateway_connect")
+            logger.debug("Connecting to discord...")
+            await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"{prefix}Discord에 연결 중...")
 
-    # 3. Initialize Services, Controllers, and Views with Dependency Injection
-    logger.info("Initializing MVC components...")
-    bot_service = DiscordBotService(bot, app_state, event_manager)
-    command_controller = CommandController(bot_service, app_state, event_manager)
-    tui_view = TUIView(command_controller, app_state, event_manager)
+        @bot.event
+        async def on_disconnect():
+            logger.debug("Connection lost")
+            await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"{prefix}Discord에서 연결 끊김.")
+
+        @bot.event
+        async def on_resumed():
+            logger.debug("Connection resumed")
+            await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"{prefix}Discord 연결 재개됨.")
+
+    accounts = [await create_account(name, primary=idx == 0) for idx, (name, _) in enumerate(tokens)]
+    account = accounts[0]
+    if args.account:
+        selected = args.account
+        if selected.isdigit() and 1 <= int(selected) <= len(accounts):
+            account = accounts[int(selected) - 1]
+        else:
+            account = next((acc for acc in accounts if acc.name == selected), None)
+            if account is None:
+                raise RuntimeError(f"Unknown account: {selected} (available: {', '.join(acc.name for acc in accounts)})")
+    logger.info("Accounts: %s (selected: %s)", ", ".join(acc.name for acc in accounts), account.name)
+    startup_profiler.mark("cogs")
+
+    # 3. Initialize the View for the selected account
+    logger.info("Initializing view...")
+    if args.headless:
+        from views import HeadlessView
+        setup_commands = []
+        if args.guild:
+            setup_commands.append(f"/setguild {args.guild}")
+        if args.channel:
+            setup_commands.append(f"/setchannel {args.channel}")
+        view = HeadlessView(
+            account.executor, account.app_state, account.event_manager,
+            input_path=args.script, follow=args.follow, setup_commands=setup_commands,
+        )
+    else:
+        from views import TUIView
+        view = TUIView(accounts, account)
+    startup_profiler.mark("imports.view")
 
     # 4. Register Event Listeners for the View
     logger.info("Registering view event listeners...")
-    tui_view.register_event_listeners()
-
-    # 5. Setup Cogs
-    logger.info("Setting up Cogs...")
-    chat_bridge_cog = ChatBridge(bot, event_manager)
-    await bot.add_cog(chat_bridge_cog)
-    logger.info("Cogs added successfully.")
-
-    # 6. Define Bot Lifecycle Events
-    @bot.event
-    async def on_ready():
-        logger.info("Bot is ready. Logged in as %s (ID: %s)", bot.user.name, bot.user.id)
-        await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"\n--- 봇 연결 성공! ---")
-        await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"로그인 완료: {bot.user.name} (ID: {bot.user.id})")
-        await event_manager.publish(EventType.BOT_STATUS_READY) # Notify view that the bot is ready
-
-    @bot.event
-    async def on_connect():
-        logger.debug("Connecting to discord...")
-        await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "Discord에 연결 중...")
-
-    @bot.event
-    async def on_disconnect():
-        logger.debug("Connection lost")
-        await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "Discord에서 연결 끊김.")
-
-    @bot.event
-    async def on_resumed():
-        logger.debug("Connection resumed")
-        await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "Discord 연결 재개됨.")
-
-    # 7. Start Bot and CLI concurrently
+    view.register_event_listeners()
+
+    control_server = None
+    if args.control_socket:
+        from control.server import ControlServer
+        control_server = ControlServer(account.executor, account.app_state, account.event_manager, socket_path=args.control_socket)
+        control_server.register_event_listeners()
+        await control_server.start()
+    if exporter:
+        await exporter.start()
+
+    async def run_bot(acc: Account, token: str):
+        # 이 태스크와 discord.py가 여기서 만드는 태스크의 로그에는 계정 이름이 붙습니다.
+        if multi_account:
+            current_account.set(acc.name)
+        try:
+            await acc.bot.start(token)
+        except Exception as e:
+            # 한 계정이 실패해도(잘못된 토큰 등) 나머지 계정은 계속 실행합니다.
+            logger.exception("Account '%s' stopped with an error.", acc.name)
+            await acc.event_manager.publish(EventType.ERROR, f"{acc.name} 계정 실행 중 오류가 발생했습니다: {e}")
+
+    # 5. Start Bots and CLI concurrently
     try:
-        # Start the bot in the background
-        bot_task = asyncio.create_task(bot.start(TOKEN))
-        # Start the TUI in the foreground
-        tui_task = asyncio.create_task(tui_view.run_tui())
+        # Start the bots in the background (모든 계정의 봇이 멈추거나 View가 끝나면 종료합니다.)
+        bots_task = asyncio.gather(*(run_bot(acc, token) for acc, (_, token) in zip(accounts, tokens)))
+        # Start the TUI (or headless view) in the foreground
+        view_task = asyncio.create_task(view.run() if args.headless else view.run_tui())
 
-        await asyncio.wait([bot_task, tui_task], return_when="FIRST_COMPLETED")
+        await asyncio.wait([bots_task, view_task], return_when="FIRST_COMPLETED")
 
     except KeyboardInterrupt:
-        await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "\n사용자에 의해 봇 시작이 중단되었습니다.")
+        await account.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "\n사용자에 의해 봇 시작이 중단되었습니다.")
     except Exception as e:
-        await event_manager.publish(EventType.ERROR, f"\nFATAL ERROR: 봇 시작 중 오류가 발생했습니다: {e}")
+        await account.event_manager.publish(EventType.ERROR, f"\nFATAL ERROR: 봇 시작 중 오류가 발생했습니다: {e}")
     finally:
-        if bot and not bot.is_closed():
-            await bot.close()
-            await event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "봇이 성공적으로 종료되었습니다.")
+        loop_monitor.stop()
+        attachment_index.close()
+        if control_server:
+            await control_server.stop()
+        if exporter:
+            await exporter.stop()
+        for acc in accounts:
+            if not acc.bot.is_closed():
+                await acc.bot.close()
+                await acc.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"{acc.name} 봇이 성공적으로 종료되었습니다." if multi_account else "봇이 성공적으로 종료되었습니다.")
+        await download_session.close()
+        await connector.shutdown()
+
+
+def run(args: argparse.Namespace):
+    """main()을 실행합니다. --uvloop이면 uvloop 이벤트 루프를 사용하고, 설치되어 있지 않으면 기본 루프로 실행합니다."""
+    if args.uvloop:
+        try:
+            import uvloop
+        except ImportError:
+            print("uvloop이 설치되어 있지 않아 기본 이벤트 루프를 사용합니다. (pip install uvloop)", file=sys.stderr)
+        else:
+            if sys.version_info >= (3, 12):
+                return asyncio.run(main(args), loop_factory=uvloop.new_event_loop)
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(main(args))
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        run(parse_args())
     except KeyboardInterrupt:
         print("\n사용자에 의해 봇이 완전히 종료되었습니다.")
     except Exception as e:
         print(f"\n처리되지 않은 치명적인 예외가 발생했습니다: {e}")
         # 현 시점에서 로거가 동작하지 않을 확률이 높지만 일단 시도는 해봄.
         logging.critical("처리되지 않은 치명적인 예외 발생", exc_info=True)
+    finally:
+        # 큐에 남은 로그를 모두 기록한 뒤 종료합니다.
+        shutdown_logging()
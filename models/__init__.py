@@ -1 +1,4 @@
 from .app_state import AppState
+from .message_record import MessageRecord, AttachmentRecord, EmbedRecord, parse_message_reference
+from .watch_entry import WatchEntry
+from .history_query import HistoryQuery, FileQuery, FILE_KINDS, parse_time_bound, parse_size
@@ -1,14 +1,25 @@
 from dataclasses import dataclass, field
 import discord
 
+from .message_record import MessageRecord, AttachmentRecord
+from .watch_entry import WatchEntry
+
 @dataclass
 class AppState:
     """애플리케이션의 모든 상태를 관리하는 데이터 클래스입니다."""
     is_bot_ready: bool = False
     current_guild: discord.Guild | None = None
-    current_channel: discord.TextChannel | None = None
+    current_channel: discord.TextChannel | discord.Thread | None = None
     all_guilds: list[discord.Guild] = field(default_factory=list)
-    available_channels: list[discord.TextChannel] = field(default_factory=list)
-    recent_messages: list[discord.Message] = field(default_factory=list)
-    recent_self_messages: list[discord.Message] = field(default_factory=list)
-    file_cache: list[discord.Attachment] = field(default_factory=list)
\ No newline at end of file
+    # 텍스트 채널과 포럼 채널 (스레드와 포럼 게시글은 '/threads'로 조회한 available_threads에서 선택)
+    available_channels: list[discord.TextChannel | discord.ForumChannel] = field(default_factory=list)
+    thread_parent: discord.TextChannel | discord.ForumChannel | None = None
+    available_threads: list[discord.Thread] = field(default_factory=list)
+    pane_channels: list[discord.TextChannel | discord.Thread] = field(default_factory=list)
+    # 메시지/파일 캐시는 discord 객체 대신 경량 기록으로 보관합니다.
+    recent_messages: list[MessageRecord] = field(default_factory=list)
+    # 삭제된 메시지는 None(삭제 표시)으로 바꿔 '/edit N', '/delete N'의 인덱스가 밀리지 않게 합니다.
+    recent_self_messages: list[MessageRecord | None] = field(default_factory=list)
+    file_cache: list[AttachmentRecord] = field(default_factory=list)
+    # 모든 서버의 새 메시지에서 찾을 키워드/정규식 목록 (/watch)
+    watchlist: list[WatchEntry] = field(default_factory=list)
@@ -0,0 +1,203 @@
+import re
+import shlex
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, ClassVar
+
+import discord
+
+from .message_record import AttachmentRecord
+
+_DURATION_PATTERN = re.compile(r'^(\d+)([smhdw])$')
+_DURATION_UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days', 'w': 'weeks'}
+_TIME_OF_DAY_PATTERN = re.compile(r'^\d{1,2}:\d{2}$')
+_SIZE_PATTERN = re.compile(r'^(\d+(?:\.\d+)?)\s*([kmg]?)i?b?$', re.IGNORECASE)
+_SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3}
+# '--type'에 쓸 수 있는 분류 이름 -> content type 접두사
+FILE_KINDS = {'image': 'image/', 'video': 'video/', 'audio': 'audio/', 'text': 'text/'}
+
+def parse_time_bound(text: str, now: datetime | None = None) -> datetime:
+    """
+    '--since', '--until'의 값을 시각으로 해석합니다. 해석할 수 없으면 ValueError를 발생시킵니다.
+    - 상대 시간: 30m, 2h, 1d, 1w (지금으로부터 그만큼 전)
+    - 오늘의 시각: 09:30
+    - 날짜/날짜와 시각: 2024-05-01, 2024-05-01T09:30 (로컬 시간대)
+    """
+    now = now or datetime.now().astimezone()
+    match = _DURATION_PATTERN.match(text)
+    if match:
+        return now - timedelta(**{_DURATION_UNITS[match.group(2)]: int(match.group(1))})
+    if _TIME_OF_DAY_PATTERN.match(text):
+        hour, minute = map(int, text.split(':'))
+        return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    try:
+        return datetime.fromisoformat(text).astimezone()
+    except ValueError:
+        raise ValueError(f"시간 형식을 이해할 수 없습니다: {text} (예: 2h, 1d, 09:30, 2024-05-01T09:30)") from None
+
+def parse_size(text: str) -> int:
+    """'500KB', '1.5MB', '2g', '1024' 같은 크기를 바이트로 해석합니다."""
+    match = _SIZE_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"크기 형식을 이해할 수 없습니다: {text} (예: 500KB, 10MB)")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).lower()])
+
+@dataclass
+class HistoryQuery:
+    """
+    '/read', '/sm', '/files'의 기록 조회 조건입니다.
+
+    시간 범위는 Snowflake ID의 경계(after_id/before_id)로 바꿔 history()에 넘기므로, 서버가 범위 밖의 메시지를
+    걸러 내고 우리는 필요한 구간의 페이지만 넘깁니다. 작성자 조건은 API가 지원하지 않아 가져온 메시지에 적용합니다.
+    """
+    limit: int | None = None # 개수를 지정하지 않으면 None (명령어별 기본값 사용)
+    since: datetime | None = None
+    until: datetime | None = None
+    author: str | None = None # 이름, 표시 이름, ID 또는 멘션
+
+    # 옵션 이름 -> (속성 이름, 값 변환 함수). 값이 없는 옵션은 _FLAGS에 둡니다.
+    _OPTIONS: ClassVar[dict[str, tuple[str, Callable[[str], Any]]]] = {
+        '--since': ('since', parse_time_bound),
+        '--until': ('until', parse_time_bound),
+        '--author': ('author', str),
+    }
+    _FLAGS: ClassVar[dict[str, str]] = {}
+
+    @property
+    def has_range(self) -> bool:
+        return self.since is not None or self.until is not None
+
+    @property
+    def is_filtered(self) -> bool:
+        return self.has_range or self.author is not None
+
+    @property
+    def after_id(self) -> int | None:
+        return discord.utils.time_snowflake(self.since, high=False) if self.since else None
+
+    @property
+    def before_id(self) -> int | None:
+        return discord.utils.time_snowflake(self.until, high=False) if self.until else None
+
+    def matches_author(self, author: discord.abc.User) -> bool:
+        if self.author is None:
+            return True
+        target = self.author.strip('<@!>')
+        if target.isdigit():
+            return author.id == int(target)
+        target = target.lower()
+        return target in (author.name.lower(), author.display_name.lower())
+
+    def describe(self) -> str:
+        """조회 조건을 사람이 읽을 수 있는 문자열로 반환합니다. 조건이 없으면 빈 문자열입니다."""
+        parts = []
+        if self.since:
+            parts.append(f"{self.since:%Y-%m-%d %H:%M} 이후")
+        if self.until:
+            parts.append(f"{self.until:%Y-%m-%d %H:%M} 이전")
+        if self.author:
+            parts.append(f"작성자: {self.author}")
+        return ", ".join(parts)
+
+    @classmethod
+    def parse(cls, arg: str, max_limit: int) -> "HistoryQuery":
+        """
+        '[개수] [--since 시간] [--until 시간] [--author 작성자]' 형식의 인자를 해석합니다.
+        잘못된 인자는 사용자에게 보여 줄 메시지와 함께 ValueError를 발생시킵니다.
+        """
+        try:
+            tokens = shlex.split(arg)
+        except ValueError:
+            raise ValueError("따옴표가 닫히지 않았습니다.") from None
+        query = cls()
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            if token in cls._FLAGS:
+                setattr(query, cls._FLAGS[token], True)
+                index += 1
+                continue
+            if token in cls._OPTIONS:
+                if index + 1 >= len(tokens):
+                    raise ValueError(f"{token} 뒤에 값을 입력해 주세요.")
+                attr, convert = cls._OPTIONS[token]
+                setattr(query, attr, convert(tokens[index + 1]))
+                index += 2
+                continue
+            if query.limit is not None or not token.isdigit():
+                raise ValueError(f"알 수 없는 인자입니다: {token}")
+            query.limit = int(token)
+            if not (1 <= query.limit <= max_limit):
+                raise ValueError(f"개수는 1에서 {max_limit} 사이여야 합니다.")
+            index += 1
+        query.validate()
+        return query
+
+    def validate(self):
+        if self.since and self.until and self.since >= self.until:
+            raise ValueError("--since는 --until보다 이전이어야 합니다.")
+
+@dataclass
+class FileQuery(HistoryQuery):
+    """
+    '/files'의 조회 조건입니다. 기록 조회 조건에 파일 이름, 종류, 크기 조건과 검색 대상(--index)이 더해집니다.
+    --index를 주면 채널 기록 대신 백그라운드 수집기(/crawl)가 만든 로컬 색인에서 바로 찾습니다.
+    """
+    name: str | None = None # 파일 이름에 포함된 문자열 (대소문자 무시)
+    kind: str | None = None # image/video/audio/text, 'application/pdf' 같은 content type, 또는 확장자
+    min_size: int | None = None
+    max_size: int | None = None
+    use_index: bool = False
+
+    _OPTIONS: ClassVar[dict[str, tuple[str, Callable[[str], Any]]]] = {
+        **HistoryQuery._OPTIONS,
+        '--name': ('name', str),
+        '--type': ('kind', lambda value: value.lower().lstrip('.')),
+        '--min-size': ('min_size', parse_size),
+        '--max-size': ('max_size', parse_size),
+    }
+    _FLAGS: ClassVar[dict[str, str]] = {'--index': 'use_index'}
+
+    def validate(self):
+        super().validate()
+        if self.min_size is not None and self.max_size is not None and self.min_size > self.max_size:
+            raise ValueError("--min-size는 --max-size보다 클 수 없습니다.")
+
+    @property
+    def has_file_filter(self) -> bool:
+        return any(value is not None for value in (self.name, self.kind, self.min_size, self.max_size))
+
+    @property
+    def is_filtered(self) -> bool:
+        return super().is_filtered or self.has_file_filter or self.use_index
+
+    def matches_attachment(self, attachment: AttachmentRecord) -> bool:
+        if self.name and self.name.lower() not in attachment.filename.lower():
+            return False
+        if self.min_size is not None and attachment.size < self.min_size:
+            return False
+        if self.max_size is not None and attachment.size > self.max_size:
+            return False
+        if self.kind:
+            content_type = (attachment.content_type or '').lower()
+            if self.kind in FILE_KINDS:
+                return content_type.startswith(FILE_KINDS[self.kind])
+            if '/' in self.kind:
+                return content_type.split(';')[0] == self.kind
+            return attachment.filename.lower().endswith(f".{self.kind}")
+        return True
+
+    def describe(self) -> str:
+        base = super().describe()
+        parts = [base] if base else []
+        if self.name:
+            parts.append(f"이름: {self.name}")
+        if self.kind:
+            parts.append(f"종류: {self.kind}")
+        if self.min_size is not None:
+            parts.append(f"{self.min_size:,}B 이상")
+        if self.max_size is not None:
+            parts.append(f"{self.max_size:,}B 이하")
+        if self.use_index:
+            parts.append("로컬 색인")
+        return ", ".join(parts)
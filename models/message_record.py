@@ -0,0 +1,161 @@
+import re
+from datetime import datetime
+
+import discord
+
+_EMPTY = ()
+
+# https://discord.com/channels/<서버 ID|@me>/<채널 ID>/<메시지 ID> (ptb/canary, discordapp.com 포함)
+_MESSAGE_LINK_PATTERN = re.compile(
+    r'https?://(?:(?:ptb|canary)\.)?discord(?:app)?\.com/channels/(\d+|@me)/(\d+)/(\d+)'
+)
+# 이보다 작은 숫자는 목록 인덱스로, 크거나 같은 숫자는 메시지 ID(Snowflake)로 취급합니다.
+MIN_SNOWFLAKE = 10 ** 15
+
+def parse_message_reference(text: str) -> tuple[int | None, int] | None:
+    """
+    메시지 링크 또는 메시지 ID를 (채널 ID, 메시지 ID)로 해석합니다.
+    ID만 주어지면 채널 ID는 None입니다. (현재 채널 기준) 해석할 수 없으면 None을 반환합니다.
+    """
+    text = text.strip()
+    match = _MESSAGE_LINK_PATTERN.search(text)
+    if match:
+        return int(match.group(2)), int(match.group(3))
+    if text.isdigit() and int(text) >= MIN_SNOWFLAKE:
+        return None, int(text)
+    return None
+
+class AttachmentRecord:
+    """다운로드와 파일 검색에 필요한 정보만 남긴 첨부 파일 기록입니다."""
+    __slots__ = ('id', 'filename', 'size', 'url', 'message_id', 'channel_id', 'content_type')
+
+    def __init__(self, id: int, filename: str, size: int, url: str, message_id: int, channel_id: int, content_type: str | None = None):
+        self.id = id
+        self.filename = filename
+        self.size = size
+        self.url = url
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.content_type = content_type
+
+    @classmethod
+    def from_attachment(cls, attachment: discord.Attachment, message: discord.Message) -> "AttachmentRecord":
+        return cls(
+            attachment.id, attachment.filename, attachment.size, attachment.url,
+            message.id, message.channel.id, attachment.content_type,
+        )
+
+    @property
+    def created_at(self) -> datetime:
+        # 첨부 파일이 올라온 시각은 메시지의 Snowflake ID에 들어 있습니다.
+        return discord.utils.snowflake_time(self.message_id)
+
+    def __repr__(self) -> str:
+        return f"<AttachmentRecord id={self.id} filename={self.filename!r} size={self.size}>"
+
+
+class EmbedRecord:
+    """화면 표시에 필요한 임베드 텍스트만 남긴 기록입니다."""
+    __slots__ = ('title', 'description', 'fields', 'footer')
+
+    def __init__(self, title: str | None, description: str | None, fields: tuple[tuple[str, str], ...], footer: str | None):
+        self.title = title
+        self.description = description
+        self.fields = fields
+        self.footer = footer
+
+    @classmethod
+    def from_embed(cls, embed: discord.Embed) -> "EmbedRecord":
+        fields = tuple((field.name, field.value) for field in embed.fields) or _EMPTY
+        footer = embed.footer.text if embed.footer else None
+        return cls(embed.title or None, embed.description or None, fields, footer or None)
+
+
+class MessageRecord:
+    """
+    discord.Message 대신 캐시에 보관하는 경량 메시지 기록입니다.
+
+    discord.Message는 서버, 채널, 멤버, 임베드 등 객체 그래프 전체를 참조하므로, 여러 채널의 메시지를
+    오래 보관하면 그만큼 메모리를 붙잡습니다. 이 기록은 표시와 편집/삭제에 필요한 값만 평평하게 보관하며,
+    편집/삭제가 필요할 때는 (channel_id, id)로 PartialMessage를 다시 만들어 사용합니다.
+    """
+    __slots__ = (
+        'id', 'channel_id', 'guild_id', 'author_id', 'author_name', 'content', 'edited_at',
+        'attachments', 'embeds', 'mention_names', 'role_names', 'channel_names',
+    )
+
+    def __init__(
+        self,
+        id: int,
+        channel_id: int,
+        guild_id: int | None,
+        author_id: int,
+        author_name: str,
+        content: str,
+        edited_at: datetime | None = None,
+        attachments: tuple[AttachmentRecord, ...] = _EMPTY,
+        embeds: tuple[EmbedRecord, ...] = _EMPTY,
+        mention_names: tuple[tuple[int, str], ...] = _EMPTY,
+        role_names: tuple[tuple[int, str], ...] = _EMPTY,
+        channel_names: tuple[tuple[int, str], ...] = _EMPTY,
+    ):
+        self.id = id
+        self.channel_id = channel_id
+        self.guild_id = guild_id
+        self.author_id = author_id
+        self.author_name = author_name
+        self.content = content
+        self.edited_at = edited_at
+        self.attachments = attachments
+        self.embeds = embeds
+        # 본문의 멘션을 이름으로 바꾸기 위한 (ID, 이름) 쌍. 대부분 비어 있으므로 빈 튜플을 공유합니다.
+        self.mention_names = mention_names
+        self.role_names = role_names
+        self.channel_names = channel_names
+
+    @classmethod
+    def from_message(cls, message: discord.Message) -> "MessageRecord":
+        return cls(
+            message.id,
+            message.channel.id,
+            message.guild.id if message.guild else None,
+            message.author.id,
+            message.author.display_name,
+            message.content,
+            message.edited_at,
+            tuple(AttachmentRecord.from_attachment(att, message) for att in message.attachments) or _EMPTY,
+            tuple(EmbedRecord.from_embed(embed) for embed in message.embeds) or _EMPTY,
+            tuple((member.id, member.display_name) for member in message.mentions) or _EMPTY,
+            tuple((role.id, role.name) for role in message.role_mentions) or _EMPTY,
+            tuple((channel.id, channel.name) for channel in message.channel_mentions) or _EMPTY,
+        )
+
+    @classmethod
+    def coerce(cls, message: "MessageRecord | discord.Message") -> "MessageRecord":
+        """이미 기록이면 그대로, discord.Message면 기록으로 변환하여 반환합니다."""
+        return message if isinstance(message, cls) else cls.from_message(message)
+
+    @property
+    def created_at(self) -> datetime:
+        # 생성 시각은 Snowflake ID에 들어 있으므로 따로 보관하지 않습니다.
+        return discord.utils.snowflake_time(self.id)
+
+    def to_dict(self) -> dict:
+        """JSON으로 직렬화할 수 있는 딕셔너리로 변환합니다. (헤드리스 출력, 내보내기 공용)"""
+        return {
+            'id': self.id,
+            'channel_id': self.channel_id,
+            'guild_id': self.guild_id,
+            'author_id': self.author_id,
+            'author': self.author_name,
+            'content': self.content,
+            'created_at': self.created_at.isoformat(),
+            'edited_at': self.edited_at.isoformat() if self.edited_at else None,
+            'attachments': [
+                {'filename': att.filename, 'size': att.size, 'url': att.url}
+                for att in self.attachments
+            ],
+        }
+
+    def __repr__(self) -> str:
+        return f"<MessageRecord id={self.id} channel_id={self.channel_id} author={self.author_name!r}>"
@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class WatchEntry:
+    """감시 목록의 항목 하나입니다. kind는 'keyword'(대소문자 무시 부분 문자열) 또는 'regex'입니다."""
+    kind: str
+    pattern: str
+
+    def to_dict(self) -> dict:
+        return {'kind': self.kind, 'pattern': self.pattern}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "WatchEntry":
+        return cls(data['kind'], data['pattern'])
@@ -0,0 +1,171 @@
+"""
+MessageRecord 메모리 벤치마크.
+
+- 실제 채널(--channel): 최근 메시지를 HTTP로 가져와(gateway 연결 없음) discord.Message 목록과
+  MessageRecord 목록이 각각 붙잡고 있는 메모리를 tracemalloc으로 비교합니다. DISCORD_TOKEN이 필요합니다.
+- 합성 데이터(--synthetic): 토큰과 네트워크 없이, REST API 응답 형태의 메시지 페이로드로 실제 discord.Message를
+  만들어(로그인하지 않은 Client의 연결 상태 사용) 같은 방식으로 비교합니다. discord.py는 설치되어 있어야 합니다.
+  tracemalloc의 보유량과 함께, 공유 객체(연결 상태, 서버, 채널)를 뺀 deep_sizeof도 표시합니다.
+
+    python -m scripts.record_benchmark --channel 123456789012345678 --limit 1000
+    python -m scripts.record_benchmark --synthetic 10000
+"""
+
+import gc
+import os
+import sys
+import random
+import asyncio
+import argparse
+import tracemalloc
+from datetime import datetime, timezone
+
+from models import MessageRecord
+from core import deep_sizeof
+
+_WORDS = ("안녕하세요", "배포", "완료", "hello", "build", "failed", "log", "확인", "부탁드립니다", "ok", "👍", "https://example.com/a")
+
+def _retained(before: tracemalloc.Snapshot) -> int:
+    gc.collect()
+    after = tracemalloc.take_snapshot()
+    return sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+def _report(count: int, baseline_label: str, baseline_bytes: int, record_bytes: int):
+    print(f"messages={count}")
+    print(f"{baseline_label:<16}: {baseline_bytes / 1024:10.1f} KiB ({baseline_bytes / count:8.0f} B/message)")
+    print(f"{'MessageRecord':<16}: {record_bytes / 1024:10.1f} KiB ({record_bytes / count:8.0f} B/message)")
+    if record_bytes > 0:
+        print(f"{'ratio':<16}: {baseline_bytes / record_bytes:.1f}x")
+
+def _synthetic_payload(rng: random.Random, message_id: int, channel_id: int, guild_id: int) -> dict:
+    """REST API의 메시지 객체와 같은 모양의 페이로드를 만듭니다. (작성자, 멘션, 첨부 파일 일부 포함)"""
+    author_id = rng.randrange(10 ** 17, 10 ** 18)
+    payload = {
+        'id': str(message_id),
+        'channel_id': str(channel_id),
+        'guild_id': str(guild_id),
+        'type': 0,
+        'content': " ".join(rng.choices(_WORDS, k=rng.randint(1, 30))),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'pinned': False,
+        'flags': 0,
+        'author': {
+            'id': str(author_id), 'username': f"user{author_id % 1000}", 'global_name': f"사용자 {author_id % 1000}",
+            'discriminator': '0', 'avatar': f"{author_id:x}", 'public_flags': 0,
+        },
+        'member': {
+            'nick': None, 'avatar': None, 'roles': [], 'joined_at': datetime.now(timezone.utc).isoformat(), 'premium_since': None,
+            'deaf': False, 'mute': False, 'flags': 0, 'pending': False, 'communication_disabled_until': None,
+        },
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'components': [],
+    }
+    if rng.random() < 0.2:
+        mentioned = rng.randrange(10 ** 17, 10 ** 18)
+        payload['mentions'].append({'id': str(mentioned), 'username': f"user{mentioned % 1000}", 'global_name': None, 'discriminator': '0', 'avatar': None})
+    if rng.random() < 0.1:
+        attachment_id = rng.randrange(10 ** 17, 10 ** 18)
+        payload['attachments'].append({
+            'id': str(attachment_id), 'filename': f"file{attachment_id % 100}.png", 'size': rng.randint(1, 10 ** 7),
+            'url': f"https://cdn.discordapp.com/attachments/{channel_id}/{attachment_id}/file.png?ex=0&is=0&hm=0",
+            'proxy_url': f"https://media.discordapp.net/attachments/{channel_id}/{attachment_id}/file.png", 'content_type': 'image/png',
+        })
+    return payload
+
+def _synthetic_channel(channel_id: int, guild_id: int):
+    """로그인하지 않은 Client의 연결 상태로 서버와 채널을 만듭니다. (메시지가 참조하는 공유 객체)"""
+    import discord
+
+    client = discord.Client(intents=discord.Intents.default())
+    state = client._connection
+    guild = discord.Guild(data={'id': str(guild_id), 'name': "benchmark", 'roles': [], 'member_count': 1}, state=state)
+    state._add_guild(guild)
+    channel = discord.TextChannel(state=state, guild=guild, data={'id': str(channel_id), 'type': 0, 'name': "general", 'position': 0, 'guild_id': str(guild_id)})
+    guild._add_channel(channel)
+    return client, state, guild, channel
+
+def run_synthetic(count: int, seed: int):
+    import discord
+
+    rng = random.Random(seed)
+    channel_id, guild_id = rng.randrange(10 ** 17, 10 ** 18), rng.randrange(10 ** 17, 10 ** 18)
+    first_id = rng.randrange(10 ** 18, 2 * 10 ** 18)
+    client, state, guild, channel = _synthetic_channel(channel_id, guild_id)
+
+    tracemalloc.start()
+    gc.collect()
+    baseline = tracemalloc.take_snapshot()
+
+    # 1. 페이로드로 discord.Message를 만들어 보관 (작성자 멤버/사용자 등 연결된 객체 포함, 페이로드는 버림)
+    payloads = [_synthetic_payload(rng, first_id + i, channel_id, guild_id) for i in range(count)]
+    messages = [discord.Message(state=state, channel=channel, data=payload) for payload in payloads]
+    del payloads
+    message_bytes = _retained(baseline)
+    shared = (client, state, guild, channel)
+    message_deep = deep_sizeof(messages, max_objects=10 ** 8, exclude=shared)
+
+    # 2. 기록으로 변환하고 원본을 버림
+    records = [MessageRecord.from_message(msg) for msg in messages]
+    del messages
+    record_bytes = _retained(baseline)
+    record_deep = deep_sizeof(records, max_objects=10 ** 8, exclude=shared)
+    tracemalloc.stop()
+
+    _report(len(records), "discord.Message", message_bytes, record_bytes)
+    print(f"{'deep_sizeof':<16}: {message_deep / count:8.0f} vs {record_deep / count:8.0f} B/message ({message_deep / record_deep:.1f}x)")
+    # 본문 문자열은 양쪽이 똑같이 보관하므로 줄일 수 있는 부분은 나머지입니다.
+    content = sum(sys.getsizeof(record.content) for record in records) / count
+    print(f"{'content':<16}: {content:8.0f} B/message (양쪽 공통)")
+
+async def run_live(channel_id: int, limit: int):
+    import discord
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    client = discord.Client(intents=discord.Intents.none())
+    await client.login(os.environ["DISCORD_TOKEN"])
+    try:
+        channel = await client.fetch_channel(channel_id)
+
+        tracemalloc.start()
+        gc.collect()
+        baseline = tracemalloc.take_snapshot()
+
+        # 1. discord.Message 그대로 보관 (작성자/멤버 등 연결된 객체 포함)
+        messages = [msg async for msg in channel.history(limit=limit)]
+        message_bytes = _retained(baseline)
+
+        # 2. 기록으로 변환하고 원본을 버림
+        records = [MessageRecord.from_message(msg) for msg in messages]
+        del messages # 사용자 캐시는 약한 참조이므로 메시지와 함께 해제됩니다.
+        record_bytes = _retained(baseline)
+        tracemalloc.stop()
+
+        if not records:
+            print("가져온 메시지가 없습니다.")
+            return
+        _report(len(records), "discord.Message", message_bytes, record_bytes)
+    finally:
+        await client.close()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="MessageRecord 메모리 벤치마크")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--channel", type=int, help="메시지를 가져올 채널 ID (DISCORD_TOKEN 필요)")
+    source.add_argument("--synthetic", type=int, metavar="COUNT", help="토큰 없이 합성 메시지 COUNT개로 측정")
+    parser.add_argument("--limit", type=int, default=1000, help="--channel에서 가져올 메시지 수 (기본값: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="--synthetic 난수 시드 (기본값: 0)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.synthetic is not None:
+        run_synthetic(args.synthetic, args.seed)
+    else:
+        asyncio.run(run_live(args.channel, args.limit))
@@ -0,0 +1,48 @@
+"""
+감시 목록(MultiPatternMatcher) 확장성 벤치마크.
+
+'word{i}\\d+' 형태의 정규식(과 같은 수의 키워드)을 패턴 수별로 등록하고, 일치하지 않는 본문과 일치하는 본문 하나를
+검사하는 데 걸리는 메시지당 시간을 정규식을 하나씩 검사하는 방식과 비교합니다. 토큰과 네트워크가 필요 없습니다.
+
+    python -m scripts.watch_benchmark --counts 50 500 5000 --length 2400
+"""
+
+import re
+import time
+import argparse
+
+from services.pattern_matcher import MultiPatternMatcher
+
+def _per_message_ms(function, text: str, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(text)
+    return (time.perf_counter() - started) * 1000 / repeat
+
+def run(counts: list[int], length: int, repeat: int):
+    filler = ("lorem ipsum dolor sit amet 배포 완료 확인 " * (length // 30 + 1))[:length]
+    texts = {"no match": filler, "match": filler[:length // 2] + " WORD42 deploy " + filler[length // 2:]}
+    print(f"{'patterns':>9} {'text':>9} {'matcher':>12} {'separate':>12}")
+    for count in counts:
+        patterns = [('regex', rf'word{i}\d+') for i in range(count)] + [('keyword', f'alert-{i}') for i in range(count)]
+        matcher = MultiPatternMatcher(patterns)
+        separate = [re.compile(re.escape(pattern) if kind == 'keyword' else pattern, re.IGNORECASE) for kind, pattern in patterns]
+
+        def scan_separately(text: str):
+            return [m.span() for regex in separate for m in regex.finditer(text)]
+
+        for label, text in texts.items():
+            matcher_ms = _per_message_ms(matcher.search, text, repeat)
+            separate_ms = _per_message_ms(scan_separately, text, repeat)
+            print(f"{len(patterns):>9} {label:>9} {matcher_ms:>9.2f} ms {separate_ms:>9.2f} ms")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="감시 목록 확장성 벤치마크")
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 500, 5000], help="등록할 정규식 수 (같은 수의 키워드도 등록)")
+    parser.add_argument("--length", type=int, default=2400, help="본문 길이 (문자 수)")
+    parser.add_argument("--repeat", type=int, default=20, help="측정 반복 횟수")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.counts, args.length, args.repeat)
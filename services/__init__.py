@@ -1 +1,6 @@
 from .bot_service import DiscordBotService
+from .watch_service import WatchService
+from .attachment_index import AttachmentIndex
+from .attachment_crawler import AttachmentCrawler
+from .export_service import ExportService
+from .memory_service import MemoryService
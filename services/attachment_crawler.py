@@ -0,0 +1,224 @@
+import asyncio
+import logging
+from collections import deque
+
+import discord
+from discord.ext import commands
+
+from models import AppState, AttachmentRecord, FileQuery
+from core import EventManager, EventType
+from .attachment_index import AttachmentIndex
+
+logger = logging.getLogger(__name__)
+
+CRAWL_PAGE_SIZE = 100 # history()가 한 번에 가져오는 메시지 수
+CRAWL_PAGE_DELAY = 1.0 # 페이지 사이에 쉬는 시간(초). 대화형 요청이 rate limit을 먼저 쓰도록 양보합니다.
+CRAWL_BACKFILL_LIMIT = 1000 # 한 차례에 채널 하나에서 거슬러 올라갈 최대 메시지 수 (나머지는 다른 채널을 한 차례씩 돈 뒤 이어서)
+
+class AttachmentCrawler:
+    """
+    선택한 서버들의 첨부 파일 메타데이터를 백그라운드에서 수집해 AttachmentIndex에 쌓습니다.
+
+    - 한 번에 한 채널씩, 페이지마다 CRAWL_PAGE_DELAY만큼 쉬며 가져오므로 대화형 요청의 rate limit을 잠식하지 않습니다.
+      (429 응답은 discord.py가 버킷별로 기다렸다가 다시 시도합니다.)
+    - 채널별로 수집을 마친 구간의 양 끝을 커서로 저장해, 새 메시지는 앞쪽 커서 이후만 가져오고 이전 기록은
+      뒤쪽 커서부터 채널의 처음에 닿을 때까지 거슬러 올라갑니다. 큰 채널 하나가 수집을 독차지하지 않도록
+      이전 기록은 채널마다 CRAWL_BACKFILL_LIMIT개씩 돌아가며 가져옵니다.
+    - 수집한 채널에 새로 올라온 첨부 파일은 MESSAGE_RECEIVED에서 바로 색인에 추가합니다.
+    """
+    def __init__(self, bot: commands.Bot, app_state: AppState, event_manager: EventManager, index: AttachmentIndex):
+        self.bot = bot
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.index = index
+        self._queue: deque[discord.Guild] = deque()
+        self._task: asyncio.Task | None = None
+        # 진행 상황 (/crawl status)
+        self.current_guild: discord.Guild | None = None
+        self.current_channel: discord.TextChannel | None = None
+        self.channels_done = 0
+        self.channels_total = 0
+        self.indexed = 0
+        logger.debug("Registering event listeners...")
+        self.event_manager.subscribe(EventType.CRAWL_START_REQUEST, self.start)
+        self.event_manager.subscribe(EventType.CRAWL_STOP_REQUEST, self.stop)
+        self.event_manager.subscribe(EventType.CRAWL_STATUS_REQUEST, self.show_status)
+        self.event_manager.subscribe(EventType.FILES_INDEX_SEARCH_REQUEST, self.search_index)
+        self.event_manager.subscribe(EventType.MESSAGE_RECEIVED, self.index_new_message)
+        logger.info("AttachmentCrawler initialized.")
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def _resolve_guild(self, value: str | None) -> discord.Guild | None:
+        if not value:
+            return self.app_state.current_guild
+        guilds = self.app_state.all_guilds or list(self.bot.guilds)
+        if value.isdigit():
+            number = int(value)
+            if 1 <= number <= len(guilds):
+                return guilds[number - 1]
+            return self.bot.get_guild(number)
+        return discord.utils.get(guilds, name=value)
+
+    async def start(self, value: str | None = None) -> bool:
+        """서버(인덱스, ID 또는 이름, 생략 시 현재 서버)를 수집 대기열에 넣고, 수집기가 멈춰 있으면 시작합니다."""
+        if not self.bot.is_ready():
+            await self.event_manager.publish(EventType.ERROR, "봇이 Discord에 연결될 때까지 기다려 주세요.")
+            return False
+        guild = self._resolve_guild(value)
+        if guild is None:
+            message = "수집할 서버를 찾을 수 없습니다." if value else "먼저 서버를 선택하거나 수집할 서버를 입력해 주세요."
+            await self.event_manager.publish(EventType.ERROR, message)
+            return False
+        if guild in self._queue or guild == self.current_guild:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] '{guild.name}' 서버는 이미 수집 중이거나 대기 중입니다.")
+            return False
+        self._queue.append(guild)
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] '{guild.name}' 서버의 첨부 파일 수집을 시작합니다. (백그라운드)")
+        return True
+
+    async def stop(self, *args) -> bool:
+        """진행 중인 수집을 멈추고 대기열을 비웁니다. 이미 저장된 색인과 커서는 유지됩니다."""
+        self._queue.clear()
+        if not self.is_running:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "[정보] 진행 중인 수집이 없습니다.")
+            return False
+        self._task.cancel()
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "[정보] 첨부 파일 수집을 중지했습니다. 다시 시작하면 중단한 곳부터 이어 갑니다.")
+        return True
+
+    async def show_status(self, *args):
+        total = await asyncio.to_thread(self.index.count)
+        text = "\n--- 첨부 파일 수집 상태 ---\n"
+        if self.is_running and self.current_guild:
+            channel = f"#{self.current_channel.name}" if self.current_channel else "-"
+            text += f"  수집 중: {self.current_guild.name} {channel} ({self.channels_done}/{self.channels_total} 채널)\n"
+            if self._queue:
+                text += f"  대기 중: {', '.join(guild.name for guild in self._queue)}\n"
+        else:
+            text += "  수집 중인 서버가 없습니다.\n"
+        text += f"  이번 실행에서 색인한 파일: {self.indexed}개, 색인 전체: {total}개\n"
+        text += "-------------------------"
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, text)
+
+    async def _run(self):
+        try:
+            while self._queue:
+                guild = self._queue.popleft()
+                await self._crawl_guild(guild)
+        except asyncio.CancelledError:
+            logger.info("Attachment crawl cancelled.")
+            raise
+        finally:
+            self.current_guild = None
+            self.current_channel = None
+
+    async def _crawl_guild(self, guild: discord.Guild):
+        channels = [ch for ch in guild.text_channels if ch.permissions_for(guild.me).read_message_history]
+        self.current_guild = guild
+        self.channels_done = 0
+        self.channels_total = len(channels)
+        before = self.indexed
+        logger.info("Crawling attachments in guild '%s' (%d channels).", guild.name, len(channels))
+        # 처음까지 거슬러 올라가지 못한 채널은 다음 차례에 이어서 수집합니다.
+        pending = channels
+        while pending:
+            remaining = []
+            for channel in pending:
+                self.current_channel = channel
+                try:
+                    finished = await self._crawl_channel(guild, channel)
+                except discord.HTTPException as e:
+                    logger.warning("Skipping channel #%s while crawling: %s", channel.name, e)
+                    finished = True
+                if finished:
+                    self.channels_done += 1
+                else:
+                    remaining.append(channel)
+            pending = remaining
+        logger.info("Finished crawling guild '%s': %d attachments indexed.", guild.name, self.indexed - before)
+        await self.event_manager.publish(
+            EventType.UI_TEXT_SHOW_REQUEST,
+            f"[정보] '{guild.name}' 서버의 첨부 파일 수집을 마쳤습니다. (새로 색인: {self.indexed - before}개)",
+        )
+
+    @staticmethod
+    def _rows(msg: discord.Message) -> list[tuple[AttachmentRecord, int, str, str]]:
+        return [(AttachmentRecord.from_attachment(att, msg), msg.author.id, msg.author.display_name, msg.author.name) for att in msg.attachments]
+
+    async def _crawl_channel(self, guild: discord.Guild, channel: discord.TextChannel) -> bool:
+        """
+        새 메시지를 수집한 뒤 이전 기록을 최대 CRAWL_BACKFILL_LIMIT개 거슬러 올라갑니다.
+        채널의 처음까지 수집했으면 True를 반환합니다. 커서는 페이지마다 저장하므로 중간에 멈춰도 이어서 진행합니다.
+        """
+        cursor = await asyncio.to_thread(self.index.get_cursor, channel.id)
+        newest, oldest = cursor if cursor is not None else (None, None)
+
+        if newest is not None:
+            # 앞쪽: 커서 다음부터 오래된 순으로 가져옵니다.
+            rows: list[tuple[AttachmentRecord, int, str, str]] = []
+            scanned = 0
+            async for msg in channel.history(limit=None, after=discord.Object(id=newest), oldest_first=True):
+                scanned += 1
+                newest = max(newest, msg.id)
+                rows.extend(self._rows(msg))
+                if scanned % CRAWL_PAGE_SIZE == 0:
+                    await self._flush(guild.id, rows, (channel.id, newest, None))
+                    rows = []
+                    await asyncio.sleep(CRAWL_PAGE_DELAY)
+            await self._flush(guild.id, rows, (channel.id, newest, None))
+            logger.debug("Crawled #%s forward: %d new messages scanned.", channel.name, scanned)
+
+        if oldest == 0:
+            return True
+        # 뒤쪽: 뒤쪽 커서(처음이면 가장 최근 메시지)부터 거슬러 올라갑니다. 처음 수집할 때는 첫 메시지가 앞쪽 커서가 됩니다.
+        rows = []
+        scanned = 0
+        async for msg in channel.history(limit=CRAWL_BACKFILL_LIMIT, before=discord.Object(id=oldest) if oldest else None):
+            scanned += 1
+            newest = max(newest or 0, msg.id)
+            oldest = msg.id
+            rows.extend(self._rows(msg))
+            if scanned % CRAWL_PAGE_SIZE == 0:
+                await self._flush(guild.id, rows, (channel.id, newest, oldest))
+                rows = []
+                await asyncio.sleep(CRAWL_PAGE_DELAY)
+        finished = scanned < CRAWL_BACKFILL_LIMIT
+        if finished:
+            # 처음까지 수집했으면 뒤쪽 커서를 0으로 둡니다. 메시지가 없는 채널도 앞쪽 커서가 0으로 저장되어
+            # 다음 수집에서 처음부터 다시 훑지 않고, 새로 올라오는 첨부 파일도 바로 색인에 추가됩니다.
+            newest, oldest = newest or 0, 0
+        await self._flush(guild.id, rows, (channel.id, newest, oldest))
+        logger.debug("Crawled #%s backward: %d messages scanned%s.", channel.name, scanned, " (reached the beginning)" if finished else "")
+        return finished
+
+    async def _flush(self, guild_id: int, rows: list[tuple[AttachmentRecord, int, str, str]], cursor: tuple[int, int, int | None]):
+        if cursor[1] is None:
+            return
+        await asyncio.to_thread(self.index.add, guild_id, rows, cursor)
+        self.indexed += len(rows)
+
+    async def index_new_message(self, message: discord.Message):
+        """이미 수집한 채널에 올라온 첨부 파일을 색인에 추가합니다. (커서는 수집기만 옮깁니다)"""
+        if not message.attachments or not message.guild:
+            return
+        if await asyncio.to_thread(self.index.get_cursor, message.channel.id) is None:
+            return
+        await asyncio.to_thread(self.index.add, message.guild.id, self._rows(message))
+
+    async def search_index(self, query: FileQuery) -> bool:
+        """로컬 색인에서 조건에 맞는 첨부 파일을 찾아 file_cache에 넣습니다. (현재 서버, 선택하지 않았으면 모든 서버)"""
+        guild = self.app_state.current_guild
+        limit = query.limit or 50
+        results = await asyncio.to_thread(self.index.search, query, guild.id if guild else None, limit)
+        logger.info("Attachment index search matched %d files.", len(results))
+        if not results and not await asyncio.to_thread(self.index.count, guild.id if guild else None):
+            await self.event_manager.publish(EventType.ERROR, "색인이 비어 있습니다. 먼저 '/crawl'로 첨부 파일을 수집해 주세요.")
+            return False
+        self.app_state.file_cache = results
+        await self.event_manager.publish(EventType.FILES_LIST_UPDATED, f"색인: {guild.name if guild else '모든 서버'}")
+        return True
@@ -0,0 +1,158 @@
+import os
+import sqlite3
+import logging
+import threading
+
+from models import AttachmentRecord, FileQuery, FILE_KINDS
+
+logger = logging.getLogger(__name__)
+
+ATTACHMENT_INDEX_PATH = os.getenv("ATTACHMENT_INDEX_PATH", "attachments.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    guild_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    author_name TEXT NOT NULL,
+    author_username TEXT NOT NULL DEFAULT '',
+    filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    url TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attachments_guild_message ON attachments (guild_id, message_id);
+CREATE TABLE IF NOT EXISTS crawl_cursors (
+    channel_id INTEGER PRIMARY KEY,
+    last_message_id INTEGER NOT NULL,
+    oldest_message_id INTEGER
+);
+"""
+# 이전 버전에서 만든 색인에 없는 열 (테이블, 열, 정의)
+_MIGRATIONS = (
+    ("attachments", "author_username", "TEXT NOT NULL DEFAULT ''"),
+    ("crawl_cursors", "oldest_message_id", "INTEGER"),
+)
+
+def _escape_like(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+class AttachmentIndex:
+    """
+    서버 전체의 첨부 파일 메타데이터를 보관하는 로컬 SQLite 색인입니다.
+
+    첨부 파일 한 건은 한 행(파일 이름, 크기, content type, 채널, 메시지 ID, 작성자)이며, 올린 시각은
+    메시지 ID(Snowflake)로 대신하므로 시간 범위 조회도 ID 범위 조회가 됩니다. 채널별로 수집을 마친 구간의
+    양 끝(가장 새 메시지 ID와 가장 오래된 메시지 ID, 커서)을 함께 저장해, 다음 수집은 그 이후의 새 메시지와
+    아직 훑지 않은 이전 기록만 가져옵니다.
+    모든 메서드는 동기 함수이므로 이벤트 루프에서는 asyncio.to_thread로 호출해야 합니다.
+    """
+    def __init__(self, path: str = ATTACHMENT_INDEX_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # 작성자 이름 비교를 history 경로(str.lower)와 맞추기 위해 유니코드 소문자 변환을 씁니다. (SQLite lower()는 ASCII만 변환)
+        self._conn.create_function("py_lower", 1, str.lower, deterministic=True)
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            for table, column, definition in _MIGRATIONS:
+                columns = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        logger.info("Attachment index opened at %s", os.path.abspath(path))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add(self, guild_id: int, rows: list[tuple[AttachmentRecord, int, str, str]], cursor: tuple[int, int, int | None] | None = None):
+        """
+        첨부 파일 기록들을 (기록, 작성자 ID, 작성자 표시 이름, 작성자 사용자 이름) 형태로 추가하고,
+        주어지면 (채널 ID, 가장 새 메시지 ID, 가장 오래된 메시지 ID) 커서를 같은 트랜잭션에서 넓힙니다.
+        가장 오래된 메시지 ID가 None이면 그쪽 끝은 그대로 두고, 0이면 채널의 처음까지 수집했다는 뜻입니다.
+        이미 있는 첨부 파일은 URL만 새로 고칩니다. (Discord CDN URL은 시간이 지나면 만료됨)
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO attachments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET url = excluded.url",
+                [
+                    (att.id, att.message_id, att.channel_id, guild_id, author_id, author_name, author_username,
+                     att.filename, att.size, att.content_type, att.url)
+                    for att, author_id, author_name, author_username in rows
+                ],
+            )
+            if cursor:
+                self._conn.execute(
+                    "INSERT INTO crawl_cursors VALUES (?, ?, ?) "
+                    "ON CONFLICT(channel_id) DO UPDATE SET "
+                    "last_message_id = MAX(last_message_id, excluded.last_message_id), "
+                    "oldest_message_id = COALESCE(MIN(oldest_message_id, excluded.oldest_message_id), oldest_message_id, excluded.oldest_message_id)",
+                    cursor,
+                )
+
+    def get_cursor(self, channel_id: int) -> tuple[int, int | None] | None:
+        """(가장 새 메시지 ID, 가장 오래된 메시지 ID)를 반환합니다. 한 번도 수집하지 않은 채널이면 None입니다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_message_id, oldest_message_id FROM crawl_cursors WHERE channel_id = ?", (channel_id,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def count(self, guild_id: int | None = None) -> int:
+        with self._lock:
+            if guild_id is None:
+                return self._conn.execute("SELECT COUNT(*) FROM attachments").fetchone()[0]
+            return self._conn.execute("SELECT COUNT(*) FROM attachments WHERE guild_id = ?", (guild_id,)).fetchone()[0]
+
+    def search(self, query: FileQuery, guild_id: int | None, limit: int) -> list[AttachmentRecord]:
+        """조회 조건에 맞는 첨부 파일을 최신순으로 반환합니다. guild_id가 None이면 모든 서버에서 찾습니다."""
+        clauses, params = [], []
+        if guild_id is not None:
+            clauses.append("guild_id = ?")
+            params.append(guild_id)
+        if query.since:
+            clauses.append("message_id > ?")
+            params.append(query.after_id)
+        if query.until:
+            clauses.append("message_id < ?")
+            params.append(query.before_id)
+        if query.author:
+            target = query.author.strip('<@!>')
+            if target.isdigit():
+                clauses.append("author_id = ?")
+                params.append(int(target))
+            else:
+                # HistoryQuery.matches_author처럼 사용자 이름과 표시 이름 모두와 비교합니다.
+                clauses.append("(py_lower(author_name) = ? OR py_lower(author_username) = ?)")
+                params.extend((target.lower(), target.lower()))
+        if query.name:
+            clauses.append("instr(lower(filename), ?) > 0")
+            params.append(query.name.lower())
+        if query.min_size is not None:
+            clauses.append("size >= ?")
+            params.append(query.min_size)
+        if query.max_size is not None:
+            clauses.append("size <= ?")
+            params.append(query.max_size)
+        if query.kind:
+            # 입력한 종류의 %와 _가 와일드카드로 해석되지 않게 이스케이프합니다.
+            if query.kind in FILE_KINDS:
+                clauses.append("content_type LIKE ? ESCAPE '\\'")
+                params.append(f"{_escape_like(FILE_KINDS[query.kind])}%")
+            elif '/' in query.kind:
+                clauses.append("lower(content_type) LIKE ? ESCAPE '\\'")
+                params.append(f"{_escape_like(query.kind)}%")
+            else:
+                clauses.append("lower(filename) LIKE ? ESCAPE '\\'")
+                params.append(f"%.{_escape_like(query.kind)}")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = (
+            "SELECT id, filename, size, url, message_id, channel_id, content_type FROM attachments "
+            f"{where} ORDER BY message_id DESC LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit)).fetchall()
+        return [AttachmentRecord(*row) for row in rows]
@@ -1,34 +1,63 @@
 import os
+import time
+import shutil
 import asyncio
 import logging
 import aiohttp
-import aiofiles
+import contextlib
 
 import discord
 from discord.ext import commands
 from datetime import timedelta
 
-from models import AppState
-from core import EventManager, EventType
+from models import AppState, MessageRecord, AttachmentRecord, HistoryQuery, FileQuery
+from core import EventManager, EventType, request_channel_id, ordered_section, channel_ordering_key
+from core.archive_builder import ArchiveTooLarge, ATTACH_MAX_VOLUMES, build_archive_in_worker
+from .thread_cache import ArchivedThreadCache
 
 logger = logging.getLogger(__name__)
 
 DOWNLOADS_DIR = "downloads"
+PANE_HISTORY_LIMIT = 20
+# 시간 범위/작성자 조건이 있을 때 한 번의 조회에서 넘길 최대 메시지 수 (페이지당 100개)
+HISTORY_SCAN_LIMIT = 5000
+# 디렉터리를 보낼 때 압축 파일을 나눌 크기. 0이면 서버의 업로드 한도에서 요청 본문의 여유분을 뺀 크기를 씁니다.
+ATTACH_VOLUME_SIZE = int(os.getenv("ATTACH_VOLUME_SIZE", "0"))
+UPLOAD_OVERHEAD = 64 * 1024
 
 class DiscordBotService:
-    def __init__(self, bot: commands.Bot, app_state: AppState, event_manager: EventManager):
+    def __init__(
+        self,
+        bot: commands.Bot,
+        app_state: AppState,
+        event_manager: EventManager,
+        chunk_on_select: bool = False,
+        http_session: aiohttp.ClientSession | None = None,
+    ):
         self.bot = bot
         self.app_state = app_state
         self.event_manager = event_manager
         self._cached_channels: list[discord.TextChannel] = []
+        # 시작 시 모든 서버의 멤버를 받지 않고, 선택한 서버의 멤버만 필요할 때 받습니다.
+        self.chunk_on_select = chunk_on_select
+        self._chunk_task: asyncio.Task | None = None
+        # 첨부 파일 다운로드에 쓸 세션. 여러 계정이 함께 실행되면 모든 계정이 같은 커넥터(연결 풀)를 씁니다.
+        self.http_session = http_session
+        # 보관된 스레드는 REST로만 조회되므로 페이지 단위로 가져와 일정 시간 보관합니다. (/threads)
+        self.archived_threads = ArchivedThreadCache()
         logger.debug("Registering event listeners...")
         self.event_manager.subscribe(EventType.GUILD_SELECT_REQUEST, self.select_guild)
         self.event_manager.subscribe(EventType.CHANNEL_SELECT_REQUEST, self.select_channel)
+        self.event_manager.subscribe(EventType.THREADS_LIST_REQUEST, self.list_threads)
+        self.event_manager.subscribe(EventType.PANE_OPEN_REQUEST, self.open_pane)
+        self.event_manager.subscribe(EventType.PANE_CLOSE_REQUEST, self.close_pane)
         self.event_manager.subscribe(EventType.MESSAGE_SEND_REQUEST, self.send_message)
         self.event_manager.subscribe(EventType.MESSAGES_RECENT_FETCH_REQUEST, self.fetch_recent_messages)
         self.event_manager.subscribe(EventType.MESSAGES_SELF_FETCH_REQUEST, self.fetch_recent_self_messages)
-        self.event_manager.subscribe(EventType.MESSAGE_DELETE_REQUEST, self.delete_self_message)
-        self.event_manager.subscribe(EventType.MESSAGE_EDIT_REQUEST, self.edit_self_message)
+        self.event_manager.subscribe(EventType.MESSAGES_SEARCH_REQUEST, self.search_messages)
+        self.event_manager.subscribe(EventType.MESSAGE_DELETE_REQUEST, self.delete_message)
+        self.event_manager.subscribe(EventType.MESSAGE_EDIT_REQUEST, self.edit_message)
+        self.event_manager.subscribe(EventType.MESSAGE_DELETED, self.handle_message_deleted)
         self.event_manager.subscribe(EventType.FILE_SEND_REQUEST, self.send_file)
         self.event_manager.subscribe(EventType.FILES_LIST_FETCH_REQUEST, self.fetch_recent_files)
         self.event_manager.subscribe(EventType.FILE_DOWNLOAD_REQUEST, self.download_file_by_index)
@@ -83,25 +112,83 @@ class DiscordBotService:
             self.app_state.current_channel = None # 길드 변경 시 채널 초기화
             self.app_state.recent_self_messages.clear() # 길드 변경 시 자신의 메시지 캐싱 초기화
             self.app_state.file_cache.clear() # 길드 변경 시 파일 캐시 초기화
-            # 현재 길드의 텍스트 채널 목록을 캐싱합니다.
-            self.app_state.available_channels = [ch for ch in guild_found.channels if isinstance(ch, discord.TextChannel)]
-            logger.info("Cached %d text channels for guild '%s'.", len(self.app_state.available_channels), guild_found.name)
+            self.app_state.thread_parent = None
+            self.app_state.available_threads = []
+            # 현재 길드의 텍스트/포럼 채널 목록을 캐싱합니다. (스레드는 '/threads'로 조회)
+            self.app_state.available_channels = [
+                ch for ch in guild_found.channels if isinstance(ch, (discord.TextChannel, discord.ForumChannel))
+            ]
+            logger.info("Cached %d text/forum channels for guild '%s'.", len(self.app_state.available_channels), guild_found.name)
             
             await self.event_manager.publish(EventType.GUILD_SELECTED, guild_found.name)
             await self.event_manager.publish(EventType.CHANNELS_UPDATED)
+            self._request_guild_chunk(guild_found)
             return True
         
         logger.warning("Could not find guild with value: '%s'", value)
         await self.event_manager.publish(EventType.ERROR, "유효하지 않은 서버 인덱스, ID 또는 이름입니다.")
         return False
 
+    def _request_guild_chunk(self, guild: discord.Guild):
+        """선택한 서버의 멤버 목록을 백그라운드에서 받아옵니다. (이미 받았거나 비활성화된 경우 무시)"""
+        if not self.chunk_on_select or not self.bot.intents.members or guild.chunked:
+            return
+        if self._chunk_task and not self._chunk_task.done():
+            self._chunk_task.cancel() # 이전에 선택한 서버의 요청은 더 이상 필요하지 않음
+        self._chunk_task = asyncio.create_task(self._chunk_guild(guild))
+
+    async def _chunk_guild(self, guild: discord.Guild):
+        started = time.perf_counter()
+        try:
+            members = await guild.chunk(cache=True)
+        except asyncio.CancelledError:
+            logger.debug("Member chunk for guild %s cancelled.", guild.id)
+            raise
+        except Exception:
+            logger.warning("Failed to chunk members for guild %s", guild.id, exc_info=True)
+            return
+        logger.info("Chunked %d members for guild '%s' in %.1f ms", len(members), guild.name, (time.perf_counter() - started) * 1000)
+        # 멤버 정보가 채워졌으므로 표시 이름을 다시 그리도록 알립니다.
+        await self.event_manager.publish(EventType.DISPLAY_NAMES_UPDATED)
+
     async def select_channel(self, value: str) -> bool:
         """주어진 인덱스, ID 또는 이름으로 현재 채널을 설정합니다."""
         if not self.app_state.current_guild:
             await self.event_manager.publish(EventType.ERROR, "채널을 설정하려면 먼저 서버를 선택해 주세요.") # Error Event pub
             return False
 
+        channel_found = self.resolve_channel(value)
+        if isinstance(channel_found, discord.ForumChannel):
+            # 포럼 자체에는 메시지가 없으므로 게시글(스레드) 목록을 보여 주고 그중에서 고르게 합니다.
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] #{channel_found.name}은(는) 포럼입니다. 게시글을 '/setchannel t<번호>'로 선택해 주세요.")
+            await self.list_threads(str(channel_found.id))
+            return False
+        if channel_found and isinstance(channel_found, (discord.TextChannel, discord.Thread)):
+            logger.info("Successfully selected channel: #%s (ID: %s)", channel_found.name, channel_found.id)
+            self.app_state.current_channel = channel_found
+            self.app_state.recent_self_messages.clear() # 채널 변경 시 자신의 메시지 캐싱 초기화
+            self.app_state.file_cache.clear() # 채널 변경 시 파일 캐시 초기화
+            await self.fetch_recent_messages()
+            await self.event_manager.publish(EventType.CHANNEL_SELECTED, channel_found.name) # Channel selected Event pub
+            return True
+            
+        logger.warning("Could not find channel with value: '%s' in guild '%s'", value, self.app_state.current_guild.name)
+        await self.event_manager.publish(EventType.ERROR, "유효하지 않은 채널 인덱스, ID 또는 이름입니다.")
+        return False
+
+    def resolve_channel(self, value: str) -> discord.abc.GuildChannel | discord.Thread | None:
+        """
+        현재 서버에서 인덱스, ID 또는 이름에 해당하는 채널이나 스레드를 찾습니다.
+        't<번호>'는 마지막 '/threads' 목록의 인덱스이며, 보관된 스레드는 지금까지 가져온 목록에서 찾습니다.
+        """
         channel_found = None
+        # 0. 스레드 목록 인덱스로 시도
+        if value[:1].lower() == 't' and value[1:].isdigit():
+            idx = int(value[1:])
+            if 1 <= idx <= len(self.app_state.available_threads):
+                return self.app_state.available_threads[idx - 1]
+            return None
+
         # 1. 인덱스로 시도 (캐싱된 목록 사용)
         try:
             idx = int(value)
@@ -115,7 +202,8 @@ class DiscordBotService:
         if not channel_found:
             try:
                 channel_id = int(value)
-                channel_found = self.app_state.current_guild.get_channel(channel_id)
+                # 활성 스레드는 Gateway 캐시에, 보관된 스레드는 가져온 목록에 있습니다.
+                channel_found = self.app_state.current_guild.get_channel_or_thread(channel_id) or self.archived_threads.find(channel_id)
                 if channel_found:
                     logger.debug("Found channel by ID: #%s", channel_found.name)
             except ValueError:
@@ -124,49 +212,187 @@ class DiscordBotService:
         # 3. 이름으로 시도
         if not channel_found and isinstance(value, str):
             lowered_value = value.lower()
-            for ch in self.app_state.available_channels:
+            for ch in [*self.app_state.available_channels, *self.app_state.available_threads]:
                 if ch.name.lower() == lowered_value:
                     channel_found = ch
                     logger.debug("Found channel by name: #%s", ch.name)
                     break
-        
-        if channel_found and isinstance(channel_found, discord.TextChannel):
-            logger.info("Successfully selected channel: #%s (ID: %s)", channel_found.name, channel_found.id)
-            self.app_state.current_channel = channel_found
-            self.app_state.recent_self_messages.clear() # 채널 변경 시 자신의 메시지 캐싱 초기화
-            self.app_state.file_cache.clear() # 채널 변경 시 파일 캐시 초기화
-            await self.fetch_recent_messages()
-            await self.event_manager.publish(EventType.CHANNEL_SELECTED, channel_found.name) # Channel selected Event pub
-            return True
-            
-        logger.warning("Could not find channel with value: '%s' in guild '%s'", value, self.app_state.current_guild.name)
-        await self.event_manager.publish(EventType.ERROR, "유효하지 않은 채널 인덱스, ID 또는 이름입니다.")
-        return False
+        if not channel_found:
+            channel_found = self.archived_threads.find(value)
+        return channel_found
+
+    def active_threads(self, parent: discord.abc.GuildChannel) -> list[discord.Thread]:
+        """Gateway 캐시에 있는 parent의 활성 스레드를 최근에 만든 순서로 반환합니다. (요청하지 않음)"""
+        threads = [thread for thread in parent.guild.threads if thread.parent_id == parent.id and not thread.archived]
+        return sorted(threads, key=lambda thread: thread.id, reverse=True)
 
-    async def fetch_recent_messages(self, limit: int = 50) -> bool:
+    async def list_threads(self, value: str = "", more: bool = False) -> bool:
         """
-        현재 채널의 최근 메시지를 가져와 app_state에 업데이트합니다.
+        채널 또는 포럼의 스레드 목록을 app_state.available_threads에 채웁니다.
+        활성 스레드는 Gateway 캐시에서, 보관된 스레드는 캐시된 만큼 보여 주고 부족할 때만 다음 페이지를 가져옵니다.
+        more이면 마지막으로 조회한 채널의 보관된 스레드를 한 페이지 더 가져옵니다.
+        """
+        if not self.app_state.current_guild:
+            await self.event_manager.publish(EventType.ERROR, "스레드 목록을 보려면 먼저 서버를 선택해 주세요.")
+            return False
+
+        if more or not value:
+            parent = self.app_state.thread_parent if more else None
+            current = self.app_state.current_channel
+            if parent is None and current is not None:
+                parent = current.parent if isinstance(current, discord.Thread) else current
+        else:
+            parent = self.resolve_channel(value)
+        if not isinstance(parent, (discord.TextChannel, discord.ForumChannel)):
+            await self.event_manager.publish(EventType.ERROR, "스레드를 볼 텍스트 채널이나 포럼을 입력해 주세요. 예: /threads 2")
+            return False
+
+        cached = self.archived_threads.get(parent.id)
+        shown = len(cached.threads) if cached else 0
+        # 이미 가져온 보관 스레드는 모두 보여 주고, 'more'일 때만 한 페이지를 더 요청합니다.
+        wanted = shown + self.archived_threads.page_size if more or not shown else shown
+        try:
+            pages = await self.archived_threads.fetch_page(parent, wanted)
+            archived, has_more = pages.threads, not pages.exhausted
+        except discord.Forbidden:
+            logger.warning("Forbidden to list archived threads of #%s", parent.name)
+            await self.event_manager.publish(EventType.ERROR, f"#{parent.name}의 보관된 스레드를 볼 권한이 없습니다. 활성 스레드만 표시합니다.")
+            archived, has_more = [], False
+        except discord.HTTPException as e:
+            logger.warning("Failed to list archived threads of #%s: %s", parent.name, e)
+            await self.event_manager.publish(EventType.ERROR, f"보관된 스레드 가져오기 실패: {e}")
+            archived, has_more = [], False
+
+        active = self.active_threads(parent)
+        active_ids = {thread.id for thread in active}
+        self.app_state.thread_parent = parent
+        self.app_state.available_threads = active + [thread for thread in archived if thread.id not in active_ids]
+        logger.info("Listed %d active and %d archived threads of #%s", len(active), len(archived), parent.name)
+        await self.event_manager.publish(EventType.THREADS_UPDATED, has_more)
+        return True
+
+    async def open_pane(self, value: str) -> bool:
+        """
+        주어진 인덱스, ID 또는 이름의 채널을 추가 창으로 구독합니다.
+        최근 메시지는 창을 열 때 한 번만 가져오고, 이후에는 실시간 메시지만 반영합니다.
+        최근 메시지를 가져오지 못하면 오류를 알리고 창을 열지 않습니다.
+        """
+        if not self.app_state.current_guild:
+            await self.event_manager.publish(EventType.ERROR, "채널 창을 열려면 먼저 서버를 선택해 주세요.")
+            return False
+
+        channel = self.resolve_channel(value)
+        if not channel or not isinstance(channel, (discord.TextChannel, discord.Thread)):
+            logger.warning("Could not find channel for pane with value: '%s'", value)
+            await self.event_manager.publish(EventType.ERROR, "유효하지 않은 채널 인덱스, ID 또는 이름입니다.")
+            return False
+        if any(ch.id == channel.id for ch in self.app_state.pane_channels):
+            await self.event_manager.publish(EventType.ERROR, f"#{channel.name} 채널 창이 이미 열려 있습니다.")
+            return False
+
+        messages = []
+        try:
+            async for msg in channel.history(limit=PANE_HISTORY_LIMIT):
+                messages.append(MessageRecord.from_message(msg))
+        except discord.errors.Forbidden:
+            logger.warning("Forbidden to read history for pane channel #%s", channel.name)
+            await self.event_manager.publish(EventType.ERROR, "채널 메시지 읽기 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
+            return False
+        except Exception as e:
+            logger.exception("An unexpected error occurred while fetching messages for pane channel #%s.", channel.name)
+            await self.event_manager.publish(EventType.ERROR, f"메시지 가져오기 실패: {e}")
+            return False
+
+        self.app_state.pane_channels.append(channel)
+        logger.info("Opened pane for channel #%s (ID: %s)", channel.name, channel.id)
+        await self.event_manager.publish(EventType.PANE_OPENED, channel, list(reversed(messages)))
+        return True
+
+    async def close_pane(self, index: int) -> bool:
+        """추가 창 목록에서 해당 인덱스의 채널 구독을 해제합니다."""
+        try:
+            channel = self.app_state.pane_channels.pop(index)
+        except IndexError:
+            logger.warning("Invalid pane index %d requested. Pane count is %d.", index, len(self.app_state.pane_channels))
+            await self.event_manager.publish(EventType.ERROR, "잘못된 창 인덱스입니다.")
+            return False
+        logger.info("Closed pane for channel #%s (ID: %s)", channel.name, channel.id)
+        await self.event_manager.publish(EventType.PANE_CLOSED, channel.id)
+        return True
+
+    async def _history_window(self, channel: discord.TextChannel, query: HistoryQuery, scan_limit: int | None):
+        """
+        조회 조건의 시간 범위 안의 메시지를 최신순으로 내보냅니다.
+        before 경계는 API에 넘기고, after 경계에 닿으면 더 이상 페이지를 요청하지 않고 멈춥니다.
+        (API는 before와 after를 함께 받지 않으므로, 최신순 조회에서는 after 경계를 여기서 처리합니다.)
+        """
+        before = discord.Object(id=query.before_id) if query.until else None
+        after_id = query.after_id
+        async for msg in channel.history(limit=scan_limit, before=before):
+            if after_id is not None and msg.id <= after_id:
+                break
+            yield msg
+
+    async def fetch_history_page(self, channel: discord.TextChannel, after_id: int, limit: int = 100) -> list[discord.Message]:
+        """after_id 다음 메시지부터 오래된 순으로 한 페이지(요청 한 번, 최대 100개)를 가져옵니다. 예외는 호출자가 처리합니다."""
+        return [msg async for msg in channel.history(limit=limit, after=discord.Object(id=after_id), oldest_first=True)]
+
+    @staticmethod
+    def _default_limit(query: HistoryQuery) -> int:
+        """개수를 주지 않았을 때 넘길 메시지 수. 시간 범위가 있으면 범위 전체(최대 HISTORY_SCAN_LIMIT), 없으면 최근 50개입니다."""
+        return query.limit or (HISTORY_SCAN_LIMIT if query.has_range else 50)
+
+    async def _target_channel(self, missing_message: str) -> discord.TextChannel | discord.Thread | None:
+        """
+        요청이 채널을 지정했으면(제어 API의 channel_id) 그 채널을, 아니면 현재 채널을 반환합니다.
+        지정한 채널은 이번 요청에만 쓰고 app_state.current_channel은 바꾸지 않으므로, TUI와 다른 클라이언트의 채널은 그대로입니다.
+        채널이 없으면 오류(채널을 선택하지 않았으면 missing_message)를 알리고 None을 반환합니다.
+        """
+        channel_id = request_channel_id()
+        if channel_id is None:
+            if not self.app_state.current_channel:
+                logger.warning("No channel is selected for this request.")
+                await self.event_manager.publish(EventType.ERROR, missing_message)
+            return self.app_state.current_channel
+        channel = self.bot.get_channel(channel_id)
+        if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+            logger.warning("Requested channel %d is not a cached text channel or thread.", channel_id)
+            await self.event_manager.publish(EventType.ERROR, f"채널을 찾을 수 없습니다: {channel_id}")
+            return None
+        return channel
+
+    async def fetch_recent_messages(self, query: HistoryQuery | None = None) -> bool:
+        """
+        현재 채널의 최근 메시지를 가져와 app_state에 업데이트합니다. (기본 50개, 시간 범위가 있으면 범위 전체)
+        조회 조건이 있으면 해당 시간 범위 안에서 작성자 조건에 맞는 메시지를 최대 개수만큼 가져옵니다.
         성공 여부를 반환합니다. 
         """
-        if not self.app_state.current_channel:
-            await self.event_manager.publish(EventType.ERROR, "먼저 채널을 선택해 주세요.") # Error Event pub
+        channel = await self._target_channel("먼저 채널을 선택해 주세요.")
+        if channel is None:
             return False
         
+        query = query or HistoryQuery()
+        limit = self._default_limit(query)
+        # 작성자 조건은 가져온 뒤에 적용하므로, 그 경우 개수가 찰 때까지 더 넘겨 봅니다.
+        scan_limit = HISTORY_SCAN_LIMIT if query.author else limit
         messages = []
         try:
-            async for msg in self.app_state.current_channel.history(limit=limit):
-                messages.append(msg)
+            async for msg in self._history_window(channel, query, scan_limit):
+                if query.matches_author(msg.author):
+                    messages.append(MessageRecord.from_message(msg))
+                    if len(messages) >= limit:
+                        break
             logger.info("Successfully fetched %d messages.", len(messages))
         except discord.errors.Forbidden:
             logger.warning(
                 "Failed to fetch messages from channel %s due to Forbidden error.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, "채널 메시지 읽기 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
         except Exception as e:
             logger.exception(
                 "An unexpected error occurred while fetching messages from channel %s.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, f"메시지 가져오기 실패: {e}")
         
@@ -174,31 +400,67 @@ class DiscordBotService:
         await self.event_manager.publish(EventType.MESSAGES_RECENT_UPDATED)
         return True
 
-    async def fetch_recent_self_messages(self, limit: int = 50) -> bool:
+    async def search_messages(self, query: str, limit: int = 500) -> bool:
+        """
+        현재 채널의 최근 메시지 중 내용에 검색어가 포함된 메시지를 찾습니다. (대소문자 무시)
+        성공 여부를 반환합니다.
         """
-        현재 채널에서 봇 자신의 최근 메시지를 가져와 app_state에 업데이트합니다.
+        channel = await self._target_channel("먼저 채널을 선택해 주세요.")
+        if channel is None:
+            return False
+
+        lowered_query = query.lower()
+        results = []
+        try:
+            async for msg in channel.history(limit=limit):
+                if lowered_query in msg.content.lower():
+                    results.append(MessageRecord.from_message(msg))
+            logger.info("Search matched %d of last %d messages.", len(results), limit)
+        except discord.errors.Forbidden:
+            logger.warning(
+                "Failed to search messages in channel %s due to Forbidden error.",
+                channel.name
+            )
+            await self.event_manager.publish(EventType.ERROR, "채널 메시지 읽기 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
+            return False
+        except Exception as e:
+            logger.exception(
+                "An unexpected error occurred while searching messages in channel %s.",
+                channel.name
+            )
+            await self.event_manager.publish(EventType.ERROR, f"메시지 검색 실패: {e}")
+            return False
+
+        await self.event_manager.publish(EventType.MESSAGES_SEARCH_UPDATED, query, list(reversed(results)))
+        return True
+
+    async def fetch_recent_self_messages(self, query: HistoryQuery | None = None) -> bool:
+        """
+        현재 채널의 최근 메시지(기본 50개, 시간 범위가 있으면 범위 전체)에서 봇 자신의 메시지를 가져와 app_state에 업데이트합니다.
         성공 여부를 반환합니다. 
         """
-        if not self.app_state.current_channel:
-            await self.event_manager.publish(EventType.ERROR, "먼저 채널을 선택해 주세요.") # Error Event pub
+        channel = await self._target_channel("먼저 채널을 선택해 주세요.")
+        if channel is None:
             return False
         
+        query = query or HistoryQuery()
+        scan_limit = self._default_limit(query)
         messages = []
         try:
-            async for msg in self.app_state.current_channel.history(limit=limit):
+            async for msg in self._history_window(channel, query, scan_limit):
                 if msg.author == self.bot.user:
-                    messages.append(msg)
+                    messages.append(MessageRecord.from_message(msg))
             logger.info("Successfully cached %d messages.", len(messages))
         except discord.errors.Forbidden:
             logger.warning(
                 "Failed to cache messages from channel %s due to Forbidden error.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, "채널 메시지 읽기 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
         except Exception as e:
             logger.exception(
                 "An unexpected error occurred while chaching messages from channel %s.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, f"메시지 가져오기 실패: {e}")
         
@@ -206,98 +468,174 @@ class DiscordBotService:
         await self.event_manager.publish(EventType.MESSAGES_SELF_UPDATED)
         return True
 
-    async def delete_self_message(self, index: int = 0):
-        """캐시된 자신의 메시지에서 해당하는 인덱스에 해당하는 메시지를 삭제합니다."""
-        if not self.app_state.recent_self_messages:
-            logger.warning("app_state.recent_self_messages is empty")
-            await self.event_manager.publish(EventType.ERROR, "먼저 /self_messages를 사용해 자신의 메시지를 캐싱해주세요.")
-            return
-        
+    def _partial_message(self, channel_id: int, message_id: int) -> discord.PartialMessage:
+        """ID만으로 PartialMessage를 만듭니다. (기록을 다시 읽거나 채널 캐시에 의존하지 않음)"""
+        return self.bot.get_partial_messageable(channel_id).get_partial_message(message_id)
+
+    def _forget_self_message(self, message_id: int):
+        """
+        캐시된 자신의 메시지 목록에서 해당 ID의 기록을 삭제 표시(None)로 바꿉니다.
+        목록에서 빼면 뒤의 메시지들의 번호가 바뀌어 '/edit N', '/delete N'이 다른 메시지를 가리키게 됩니다.
+        """
+        records = self.app_state.recent_self_messages
+        for idx, record in enumerate(records):
+            if record is not None and record.id == message_id:
+                records[idx] = None
+
+    def _is_cached_self_message(self, message_id: int) -> bool:
+        """'/self_messages'로 캐시된(자신이 보낸 것이 확인된) 메시지인지 확인합니다."""
+        return any(r is not None and r.id == message_id for r in self.app_state.recent_self_messages)
+
+    async def handle_message_deleted(self, message_id: int):
+        """다른 곳에서 삭제된 메시지도 캐시된 목록에서 삭제 표시합니다."""
+        self._forget_self_message(message_id)
+
+    async def _fetch_own_message(self, channel_id: int, message_id: int, action: str) -> discord.Message | None:
+        """메시지 하나를 가져와 자신이 보낸 메시지인지 확인합니다. 실패하면 오류를 알리고 None을 반환합니다."""
         try:
-            message = self.app_state.recent_self_messages[index]
-            m_id = message.id
-        except IndexError as e:
-            logger.exception("IndexError to get message at recent self messages (index %d)", index)
-        
+            message = await self._partial_message(channel_id, message_id).fetch()
+        except discord.errors.NotFound:
+            logger.warning("Message %d not found in channel %d", message_id, channel_id)
+            self._forget_self_message(message_id)
+            await self.event_manager.publish(EventType.ERROR, "메시지를 찾을 수 없습니다. ID 또는 링크를 확인해 주세요.")
+            return None
+        except discord.errors.Forbidden:
+            logger.warning("Forbidden to fetch message %d in channel %d", message_id, channel_id)
+            await self.event_manager.publish(EventType.ERROR, "메시지를 읽기 위한 권한이 없습니다.")
+            return None
+        except Exception as e:
+            logger.exception("An unexpected error occurred while fetching message %d.", message_id)
+            await self.event_manager.publish(EventType.ERROR, f"메시지 가져오기 실패: {e}")
+            return None
+        if message.author != self.bot.user:
+            logger.warning("Refusing to %s message %d by another user", action, message_id)
+            await self.event_manager.publish(EventType.ERROR, f"자신이 보낸 메시지만 {action}할 수 있습니다.")
+            return None
+        return message
+
+    async def fetch_message_content(self, channel_id: int, message_id: int) -> str | None:
+        """자신이 보낸 메시지 하나의 내용을 가져옵니다. 실패하면 오류를 알리고 None을 반환합니다."""
+        message = await self._fetch_own_message(channel_id, message_id, "수정")
+        return message.content if message else None
+
+    async def delete_message(self, channel_id: int, message_id: int) -> bool:
+        """
+        메시지를 ID로 삭제합니다. 캐시된 자신의 메시지는 한 번의 요청으로 처리하고, 그 밖의 ID나 링크는
+        먼저 메시지를 가져와 자신이 보낸 것인지 확인합니다. (관리 권한이 있으면 남의 메시지도 지워지기 때문)
+        """
+        if not self._is_cached_self_message(message_id) and not await self._fetch_own_message(channel_id, message_id, "삭제"):
+            return False
         try:
-            logger.debug("Trying to delete message %d", m_id)
-            await message.delete()
+            logger.debug("Trying to delete message %d", message_id)
+            await self._partial_message(channel_id, message_id).delete()
         except discord.errors.Forbidden:
-            logger.warning("Forbidden to delete message %d", message.id)
+            logger.warning("Forbidden to delete message %d", message_id)
             await self.event_manager.publish(EventType.ERROR, "메시지를 지우기 위한 권한이 없습니다.")
+            return False
         except discord.errors.NotFound:
-            logger.warning("NotFound to delete message %d", message.id)
+            logger.warning("NotFound to delete message %d", message_id)
+            self._forget_self_message(message_id)
             await self.event_manager.publish(EventType.ERROR, "메시지가 이미 삭제되었습니다.")
+            return False
         except Exception as e:
-            logger.exception("An unexpected error occurred during deleting message for index %d.", index)
+            logger.exception("An unexpected error occurred during deleting message %d.", message_id)
             await self.event_manager.publish(EventType.ERROR, f"메시지 삭제 중 예외 발생: {e}")
-            logger.info("Message with ID %s deleted successfully from Discord.", m_id)
-        
-        message = self.app_state.recent_self_messages.pop(index)
-        await self.event_manager.publish(EventType.MESSAGE_DELETE_COMPLETED, m_id)
-
-    async def edit_self_message(self, index: int, edited_message: str):
-        """캐시된 자신의 메시지에서 해당하는 인덱스에 해당하는 메시지를 수정합니다."""
-        if not self.app_state.recent_self_messages:
-            logger.warning("app_state.recent_self_messages is empty")
-            await self.event_manager.publish(EventType.ERROR, "먼저 /self_messages를 사용해 자신의 메시지를 캐싱해주세요.")
-            return
-        
-        try:
-            message = self.app_state.recent_self_messages[index]
-            m_id = message.id
-        except IndexError as e:
-            logger.exception("IndexError to get message at recent self messages (index %d)", index)
-        
-        if message.content == edited_message:
-            logger.debug("Message edit cancled")
-            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "메시지 편집이 취소되었습니다.")
-            return
-        
+            return False
+
+        logger.info("Message with ID %s deleted successfully from Discord.", message_id)
+        self._forget_self_message(message_id)
+        await self.event_manager.publish(EventType.MESSAGE_DELETE_COMPLETED, message_id)
+        return True
+
+    async def edit_message(self, channel_id: int, message_id: int, content: str, verified: bool = False) -> bool:
+        """
+        메시지를 ID로 수정합니다. 캐시된 기록은 제거하지 않고 제자리에서 갱신합니다. 캐시에 없으면 작성자를 먼저 확인하며,
+        호출자가 이미 확인했다면(verified, '/edit'이 원본을 가져올 때 확인) 다시 가져오지 않고 바로 수정합니다.
+        """
+        if not verified and not self._is_cached_self_message(message_id) and not await self._fetch_own_message(channel_id, message_id, "수정"):
+            return False
         try:
-            logger.debug("Trying to edit message %d", m_id)
-            await message.edit(content=edited_message)
+            logger.debug("Trying to edit message %d", message_id)
+            edited = await self._partial_message(channel_id, message_id).edit(content=content)
         except discord.errors.Forbidden:
-            logger.warning("Forbidden to edit message %d", message.id)
+            logger.warning("Forbidden to edit message %d", message_id)
             await self.event_manager.publish(EventType.ERROR, "메시지를 수정하기 위한 권한이 없습니다.")
+            return False
         except discord.errors.NotFound:
-            logger.warning("NotFound to edit message %d", message.id)
+            logger.warning("NotFound to edit message %d", message_id)
+            self._forget_self_message(message_id)
             await self.event_manager.publish(EventType.ERROR, "메시지가 이미 삭제되었습니다.")
+            return False
         except Exception as e:
-            logger.exception("An unexpected error occurred during editing message for index %d.", index)
+            logger.exception("An unexpected error occurred during editing message %d.", message_id)
             await self.event_manager.publish(EventType.ERROR, f"메시지 편집 중 예외 발생: {e}")
-        logger.info("Message with ID %s edit successfully from Discord.", m_id)
-        
-        message = self.app_state.recent_self_messages.pop(index)
-        await self.event_manager.publish(EventType.MESSAGE_EDIT_COMPLETED, m_id)
-
-    async def fetch_recent_files(self, limit: int = 50) -> bool:
-        """현재 채널의 최근 파일들을 가져와 file_cache에 캐싱하고 성공 여부를 반환합니다."""
-        logger.info("Fetching recent files from last %d messages in #%s.", limit, self.app_state.current_channel.name if self.app_state.current_channel else "None")
-        if not self.app_state.current_channel:
-            logger.warning(" 먼저 채널을 선택해 주세요.")
-            await self.event_manager.publish(EventType.ERROR, "먼저 채널을 선택해 주세요.") # Error Event pub
             return False
+
+        logger.info("Message with ID %s edit successfully from Discord.", message_id)
+        records = self.app_state.recent_self_messages
+        for idx, record in enumerate(records):
+            if record is not None and record.id == message_id:
+                records[idx] = MessageRecord.from_message(edited)
+                break
+        await self.event_manager.publish(EventType.MESSAGE_EDIT_COMPLETED, message_id)
+        return True
+
+    async def fetch_recent_files(self, query: FileQuery | None = None) -> bool:
+        """
+        현재 채널의 최근 메시지(기본 50개, 시간 범위가 있으면 범위 전체)에서 조건에 맞는 파일들을 가져와 file_cache에 캐싱하고 성공 여부를 반환합니다.
+        """
+        query = query or FileQuery()
+        scan_limit = self._default_limit(query)
+        channel = await self._target_channel("먼저 채널을 선택해 주세요.")
+        if channel is None:
+            return False
+        logger.info("Fetching recent files from last %d messages in #%s.", scan_limit, channel.name)
         
         files = []
         try:
-            async for msg in self.app_state.current_channel.history(limit=limit):
-                if msg.attachments:
-                    files.extend(msg.attachments)
+            async for msg in self._history_window(channel, query, scan_limit):
+                if not query.matches_author(msg.author):
+                    continue
+                for att in msg.attachments:
+                    record = AttachmentRecord.from_attachment(att, msg)
+                    if query.matches_attachment(record):
+                        files.append(record)
             
             self.app_state.file_cache = files # 최신 파일이 위로 오도록
             await self.event_manager.publish(EventType.FILES_LIST_UPDATED)
             return True
 
         except discord.errors.Forbidden:
-            logger.warning("Forbidden to read history in channel #%s", self.app_state.current_channel.name)
+            logger.warning("Forbidden to read history in channel #%s", channel.name)
             await self.event_manager.publish(EventType.ERROR, "채널 히스토리 읽기 권한이 없습니다.")
         except Exception as e:
-            logger.exception("Error fetching files from channel #%s", self.app_state.current_channel.name)
+            logger.exception("Error fetching files from channel #%s", channel.name)
             await self.event_manager.publish(EventType.ERROR, f"파일 목록 가져오기 실패: {e}")
         
         return False
 
+    async def _refresh_attachment_url(self, attachment: AttachmentRecord) -> str | None:
+        """첨부 파일이 달린 메시지를 다시 가져와 새 다운로드 URL을 반환합니다. 찾을 수 없으면 None입니다."""
+        try:
+            message = await self._partial_message(attachment.channel_id, attachment.message_id).fetch()
+        except discord.HTTPException as e:
+            logger.warning("Could not refresh URL for attachment %d: %s", attachment.id, e)
+            return None
+        fresh = discord.utils.get(message.attachments, id=attachment.id)
+        if fresh:
+            attachment.url = fresh.url
+            return fresh.url
+        return None
+
+    @contextlib.asynccontextmanager
+    async def _download_session(self):
+        """공유 세션이 있으면 그대로 쓰고, 없으면 이번 다운로드에만 쓸 세션을 만듭니다."""
+        if self.http_session is not None:
+            yield self.http_session
+            return
+        async with aiohttp.ClientSession() as session:
+            yield session
+
     async def download_file_by_index(self, index: int = 0):
         """인덱스를 사용하여 file_cache에서 파일을 다운로드합니다."""
         logger.info("Request to download file at index %d.", index)
@@ -313,8 +651,17 @@ class DiscordBotService:
             logger.info("Starting download for '%s' from URL: %s", attachment.filename, attachment.url)
             await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] '{attachment.filename}' 다운로드 시작...")
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(attachment.url) as resp:
+            import aiofiles # 다운로드할 때만 필요하므로 시작 시 임포트하지 않습니다.
+
+            async with self._download_session() as session:
+                resp = await session.get(attachment.url)
+                if resp.status in (403, 404):
+                    # 색인에서 가져온 오래된 CDN URL은 만료되었을 수 있으므로, 메시지를 다시 읽어 새 URL로 한 번 더 시도합니다.
+                    resp.release()
+                    fresh_url = await self._refresh_attachment_url(attachment)
+                    if fresh_url:
+                        resp = await session.get(fresh_url)
+                async with resp:
                     if resp.status == 200:
                         async with aiofiles.open(file_path, mode='wb') as f:
                             await f.write(await resp.read())
@@ -333,57 +680,111 @@ class DiscordBotService:
 
     async def send_message(self, content: str) -> bool:
         """현재 채널에 메시지를 전송하고 성공 여부를 반환합니다."""
-        if not self.app_state.current_channel:
-            logger.error("Cannot send message, no channel is selected.")
-            await self.event_manager.publish(EventType.ERROR, "메시지를 보낼 채널이 선택되지 않았습니다. 채널을 설정해 주세요.") # Error Event pub
+        channel = await self._target_channel("메시지를 보낼 채널이 선택되지 않았습니다. 채널을 설정해 주세요.")
+        if channel is None:
             return False
         
         try:
-            message = await self.app_state.current_channel.send(content)
+            message = await channel.send(content)
             await self.event_manager.publish(EventType.MESSAGE_SEND_COMPLETED, message)
             return True
         except discord.errors.Forbidden:
             logger.warning(
                 "Failed to send message to channel %s due to Forbidden error.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, "채널에 메시지를 보낼 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
         except Exception as e:
             logger.exception(
                 "An unexpected error occurred while sending message to channel %s.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, f"메시지 전송 실패: {e}")
         return False
 
     async def send_file(self, file_path: str, content: str | None = None) -> bool:
-        """지정된 파일을 현재 채널에 전송하고 성공 여부를 반환합니다."""
-        if not self.app_state.current_channel:
-            logger.error("Cannot send file, no channel is selected.")
-            await self.event_manager.publish(EventType.ERROR, "파일을 보낼 채널이 선택되지 않았습니다. 채널을 설정해 주세요.") # Error Event pub
+        """지정된 파일을 현재 채널에 전송하고 성공 여부를 반환합니다. 디렉터리는 압축하여 보냅니다."""
+        channel = await self._target_channel("파일을 보낼 채널이 선택되지 않았습니다. 채널을 설정해 주세요.")
+        if channel is None:
             return False
         
         if not os.path.exists(file_path):
             logger.error("File not found at path: %s", file_path)
             await self.event_manager.publish(EventType.ERROR, f"파일을 찾을 수 없습니다: '{file_path}'") # Error Event pub
             return False
+        if os.path.isdir(file_path):
+            return await self.send_directory(file_path, content, channel)
             
         try:
-            logger.info("Attempting to send file '%s' to #%s", file_path, self.app_state.current_channel.name)
+            logger.info("Attempting to send file '%s' to #%s", file_path, channel.name)
             discord_file = discord.File(file_path)
-            message = await self.app_state.current_channel.send(content=content, file=discord_file)
+            message = await channel.send(content=content, file=discord_file)
             await self.event_manager.publish(EventType.FILE_SEND_COMPLETED, message) # File sent success Event pub
             logger.info("Successfully sent file '%s'", file_path)
         except discord.errors.Forbidden:
             logger.warning(
                 "Failed to send file to channel %s due to Forbidden error.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, "채널에 파일을 첨부할 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
         except Exception as e:
             logger.exception(
                 "An unexpected error occurred while sending file to channel %s.",
-                self.app_state.current_channel.name
+                channel.name
             )
             await self.event_manager.publish(EventType.ERROR, f"파일 전송 실패: {e}")
-        return False
\ No newline at end of file
+        return False
+
+    async def send_directory(self, directory: str, content: str | None = None, channel: discord.abc.Messageable | None = None) -> bool:
+        """
+        디렉터리를 작업자 프로세스에서 zip으로 압축해 현재 채널에 보냅니다. 업로드 한도를 넘으면 여러 볼륨으로 나눠
+        순서대로 올리며(받은 쪽에서 이어 붙여 풂), 그동안 이벤트 루프는 막히지 않습니다.
+        업로드 도중 채널을 바꿔도 처음 채널에 계속 올립니다. 실행기 작업 안이면 채널 순서 키는 압축이 끝난 뒤
+        업로드하는 동안만 잡으므로, 압축하는 사이에 보낸 메시지는 기다리지 않고 먼저 전송됩니다.
+        channel을 주지 않으면 현재 채널에 보냅니다.
+        """
+        channel = channel or self.app_state.current_channel
+        volume_size = ATTACH_VOLUME_SIZE or channel.guild.filesize_limit - UPLOAD_OVERHEAD
+        name = os.path.basename(os.path.abspath(directory))
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] '{name}' 디렉터리를 압축하는 중입니다. 완료되면 업로드합니다.")
+        started = time.perf_counter()
+        try:
+            output_dir, paths, skipped = await build_archive_in_worker(directory, volume_size)
+        except ArchiveTooLarge:
+            logger.warning("Directory %s is too large to attach.", directory)
+            await self.event_manager.publish(EventType.ERROR, f"압축 결과가 너무 큽니다. (최대 {volume_size // (1024 * 1024)}MB 볼륨 {ATTACH_MAX_VOLUMES}개)")
+            return False
+        except Exception as e:
+            logger.exception("Failed to archive directory %s", directory)
+            await self.event_manager.publish(EventType.ERROR, f"디렉터리 압축 실패: {e}")
+            return False
+        logger.info("Archived %s into %d volume(s) in %.1f s", directory, len(paths), time.perf_counter() - started)
+        if skipped:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 읽을 수 없는 파일 {len(skipped)}개를 건너뛰었습니다: {', '.join(skipped[:5])}")
+
+        section = ordered_section.get()
+        try:
+            async with section(channel_ordering_key(channel.id)) if section else contextlib.nullcontext():
+                for idx, path in enumerate(paths, 1):
+                    caption = content if idx == 1 else None
+                    if len(paths) > 1:
+                        part = f"({idx}/{len(paths)})"
+                        caption = f"{caption} {part}" if caption else part
+                    message = await channel.send(content=caption, file=discord.File(path))
+                    await self.event_manager.publish(EventType.FILE_SEND_COMPLETED, message)
+            if len(paths) > 1:
+                await self.event_manager.publish(
+                    EventType.UI_TEXT_SHOW_REQUEST,
+                    f"[정보] {len(paths)}개 볼륨으로 나눠 보냈습니다. 모두 받은 뒤 이어 붙여 푸세요. (예: cat {name}.zip.* > {name}.zip)",
+                )
+            logger.info("Sent directory %s as %d volume(s) to #%s", directory, len(paths), channel.name)
+            return True
+        except discord.errors.Forbidden:
+            logger.warning("Failed to send archive to channel %s due to Forbidden error.", channel.name)
+            await self.event_manager.publish(EventType.ERROR, "채널에 파일을 첨부할 권한이 없습니다. 봇 역할 권한을 확인해 주세요.")
+        except discord.HTTPException as e:
+            logger.exception("Failed to upload archive volume of %s to channel %s.", directory, channel.name)
+            await self.event_manager.publish(EventType.ERROR, f"압축 파일 전송 실패: {e}")
+        finally:
+            await asyncio.to_thread(shutil.rmtree, output_dir, True)
+        return False
@@ -0,0 +1,261 @@
+import os
+import gzip
+import json
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+import discord
+
+from models import AppState, MessageRecord
+from core import EventManager, EventType
+from .bot_service import DiscordBotService
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = "exports"
+EXPORT_PAGE_SIZE = 100 # 요청 한 번에 가져오는 메시지 수 (API 최대값)
+EXPORT_PAGES_PER_SECOND = float(os.getenv("EXPORT_PAGES_PER_SECOND", "2")) # 모든 내보내기가 공유하는 요청 예산
+PROGRESS_EVERY_PAGES = 50 # 이 페이지 수마다 진행 상황을 알립니다.
+
+class RequestBudget:
+    """
+    동시에 실행되는 여러 작업이 나눠 쓰는 요청 예산(토큰 버킷)입니다.
+    내보낼 채널 수와 관계없이 전체 요청 속도가 rate를 넘지 않으므로, 대화형 요청이 쓸 rate limit이 남습니다.
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class ExportProgress:
+    """내보내기 한 건의 진행 상황입니다."""
+    channel: discord.TextChannel
+    path: str
+    messages: int = 0 # 이번 실행에서 기록한 메시지 수
+    total: int = 0 # 이전 실행을 포함한 전체 메시지 수
+    pages: int = 0
+    bytes_written: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.messages / self.elapsed if self.elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"#{self.channel.name}: {self.total:,}개 (이번 {self.messages:,}개, {self.pages}페이지), "
+                f"{self.bytes_written / 1024 / 1024:.2f} MB, {self.rate:.0f} 메시지/초")
+
+
+class ExportService:
+    """
+    채널의 전체 기록을 오래된 순으로 한 페이지씩 가져와 gzip으로 압축한 JSONL 파일에 이어 씁니다.
+
+    - 페이지를 쓰고 나면 바로 버리므로 채널 크기와 관계없이 메모리 사용량이 일정합니다.
+    - 페이지마다 마지막 메시지 ID와 파일 크기를 체크포인트 파일에 저장하므로, 중단된 내보내기는 다시 실행하면 이어서 진행하고
+      끝난 내보내기를 다시 실행하면 그 이후의 새 메시지만 덧붙입니다.
+    - 여러 채널을 동시에 내보내도 요청은 하나의 RequestBudget을 나눠 씁니다.
+    - 채널마다 백그라운드 태스크로 실행하므로 '/export' 명령어는 바로 끝나고, 진행 상황과 오류는 이벤트로 알립니다.
+      멈추려면 '/export stop'을 씁니다.
+    """
+    def __init__(self, bot_service: DiscordBotService, app_state: AppState, event_manager: EventManager, export_dir: str = EXPORT_DIR, wait: bool = False):
+        self.bot_service = bot_service
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.export_dir = export_dir
+        self.wait = wait # True면 명령어가 내보내기가 끝날 때까지 기다립니다. (입력이 끝나면 종료하는 헤드리스 모드)
+        self.budget = RequestBudget(EXPORT_PAGES_PER_SECOND)
+        self.active: dict[int, ExportProgress] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        logger.debug("Registering event listeners...")
+        self.event_manager.subscribe(EventType.EXPORT_REQUEST, self.export_channels)
+        self.event_manager.subscribe(EventType.EXPORT_STATUS_REQUEST, self.show_status)
+        self.event_manager.subscribe(EventType.EXPORT_STOP_REQUEST, self.stop)
+        logger.info("ExportService initialized.")
+
+    def _paths(self, channel_id: int) -> tuple[str, str]:
+        base = os.path.join(self.export_dir, str(channel_id))
+        return f"{base}.jsonl.gz", f"{base}.checkpoint.json"
+
+    @staticmethod
+    def _load_checkpoint(path: str) -> dict | None:
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_checkpoint(checkpoint_path: str, checkpoint: dict):
+        tmp_path = f"{checkpoint_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp_path, checkpoint_path)
+
+    @classmethod
+    def _append_page(cls, path: str, checkpoint_path: str, lines: list[str], checkpoint: dict) -> int:
+        """
+        페이지를 독립된 gzip 멤버로 파일 끝에 덧붙인 뒤, 멤버가 끝나는 위치를 담아 체크포인트를 교체합니다. (이벤트 루프 밖에서 실행)
+        데이터를 먼저 쓰므로 체크포인트가 가리키는 메시지까지는 항상 파일에 들어 있고, 그 뒤에 남은 바이트(쓰다 만 멤버)는
+        이어서 진행할 때 _rollback이 잘라 냅니다.
+        """
+        data = gzip.compress(("\n".join(lines) + "\n").encode('utf-8'))
+        with open(path, 'ab') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+            checkpoint['bytes'] = f.tell()
+        cls._write_checkpoint(checkpoint_path, checkpoint)
+        return checkpoint['bytes']
+
+    @staticmethod
+    def _rollback(path: str, checkpoint: dict) -> int:
+        """
+        파일을 체크포인트에 기록된 위치까지 잘라, 중단된 페이지의 일부가 남아 gzip 스트림이 깨지거나
+        같은 메시지가 두 번 기록되지 않게 합니다. 위치가 없는 이전 형식의 체크포인트는 현재 크기를 그대로 씁니다.
+        """
+        if not os.path.exists(path):
+            checkpoint['bytes'] = 0
+            return 0
+        size = os.path.getsize(path)
+        committed = checkpoint.setdefault('bytes', size)
+        if size > committed:
+            logger.warning("Discarding %d uncommitted bytes at the end of %s", size - committed, path)
+            os.truncate(path, committed)
+        return min(size, committed)
+
+    def _resolve(self, values: list[str]) -> list[discord.TextChannel] | str:
+        """채널 인덱스/ID/이름 목록을 채널로 바꿉니다. 찾지 못한 값이 있으면 오류 메시지를 반환합니다."""
+        if not values:
+            return [self.app_state.current_channel] if self.app_state.current_channel else "먼저 채널을 선택하거나 내보낼 채널을 입력해 주세요."
+        if not self.app_state.current_guild:
+            return "채널 이름이나 인덱스를 쓰려면 먼저 서버를 선택해 주세요."
+        channels = []
+        for value in values:
+            channel = self.bot_service.resolve_channel(value)
+            if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+                return f"내보낼 텍스트 채널이나 스레드를 찾을 수 없습니다: {value}"
+            if channel not in channels:
+                channels.append(channel)
+        return channels
+
+    async def export_channels(self, values: list[str]) -> bool:
+        """채널마다 내보내기 태스크를 시작하고 바로 반환합니다. (self.wait이면 모두 끝날 때까지 기다림) 완료와 실패는 이벤트로 알립니다."""
+        channels = self._resolve(values)
+        if isinstance(channels, str):
+            await self.event_manager.publish(EventType.ERROR, channels)
+            return False
+        busy = [ch for ch in channels if ch.id in self._tasks]
+        if busy:
+            names = ", ".join(f"#{ch.name}" for ch in busy)
+            await self.event_manager.publish(EventType.ERROR, f"이미 내보내는 중인 채널입니다: {names}")
+            return False
+        os.makedirs(self.export_dir, exist_ok=True)
+        for channel in channels:
+            task = asyncio.create_task(self._export_channel(channel))
+            self._tasks[channel.id] = task
+            task.add_done_callback(lambda _, channel_id=channel.id: self._tasks.pop(channel_id, None))
+        if self.wait:
+            results = await asyncio.gather(*(self._tasks[ch.id] for ch in channels))
+            return all(results)
+        return True
+
+    async def stop(self, values: list[str]) -> bool:
+        """진행 중인 내보내기(생략 시 전부)를 멈춥니다. 체크포인트까지 저장된 내용은 유지됩니다."""
+        if values:
+            channels = self._resolve(values)
+            if isinstance(channels, str):
+                await self.event_manager.publish(EventType.ERROR, channels)
+                return False
+            tasks = {ch.id: self._tasks[ch.id] for ch in channels if ch.id in self._tasks}
+        else:
+            tasks = dict(self._tasks)
+        if not tasks:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "[정보] 멈출 내보내기가 없습니다.")
+            return False
+        for task in tasks.values():
+            task.cancel()
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 내보내기 {len(tasks)}개를 멈췄습니다. 같은 명령어로 다시 실행하면 이어서 진행합니다.")
+        return True
+
+    async def _export_channel(self, channel: discord.TextChannel) -> bool:
+        path, checkpoint_path = self._paths(channel.id)
+        checkpoint = await asyncio.to_thread(self._load_checkpoint, checkpoint_path) or {
+            'channel_id': channel.id, 'guild_id': channel.guild.id, 'last_message_id': 0, 'messages': 0,
+        }
+        checkpoint.update(channel_name=channel.name, guild_name=channel.guild.name, complete=False)
+        progress = ExportProgress(channel, path, total=checkpoint['messages'])
+        progress.bytes_written = await asyncio.to_thread(self._rollback, path, checkpoint)
+        self.active[channel.id] = progress
+        if checkpoint['last_message_id']:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] #{channel.name} 내보내기를 이어서 진행합니다. (기존 {progress.total:,}개)")
+        else:
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] #{channel.name} 내보내기를 시작합니다. -> {path}")
+        logger.info("Exporting channel #%s (%d) to %s after message %d", channel.name, channel.id, path, checkpoint['last_message_id'])
+
+        try:
+            while True:
+                await self.budget.acquire()
+                page = await self.bot_service.fetch_history_page(channel, checkpoint['last_message_id'], EXPORT_PAGE_SIZE)
+                if not page:
+                    break
+                lines = [json.dumps(MessageRecord.from_message(msg).to_dict(), ensure_ascii=False) for msg in page]
+                checkpoint['last_message_id'] = page[-1].id
+                checkpoint['messages'] += len(page)
+                progress.bytes_written = await asyncio.to_thread(self._append_page, path, checkpoint_path, lines, checkpoint)
+                progress.messages += len(page)
+                progress.total = checkpoint['messages']
+                progress.pages += 1
+                if progress.pages % PROGRESS_EVERY_PAGES == 0:
+                    logger.info("Export progress %s", progress.summary())
+                    await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[정보] 내보내는 중 {progress.summary()}")
+                if len(page) < EXPORT_PAGE_SIZE:
+                    break
+            checkpoint['complete'] = True
+            await asyncio.to_thread(self._write_checkpoint, checkpoint_path, checkpoint)
+        except asyncio.CancelledError:
+            logger.info("Export of #%s paused at message %d", channel.name, checkpoint['last_message_id'])
+            raise
+        except discord.errors.Forbidden:
+            logger.warning("Forbidden to read history of #%s for export", channel.name)
+            await self.event_manager.publish(EventType.ERROR, f"#{channel.name} 채널 기록을 읽을 권한이 없습니다.")
+            return False
+        except Exception as e:
+            logger.exception("Export of #%s failed at message %d", channel.name, checkpoint['last_message_id'])
+            await self.event_manager.publish(EventType.ERROR, f"#{channel.name} 내보내기 실패: {e} (다시 실행하면 이어서 진행합니다)")
+            return False
+        finally:
+            self.active.pop(channel.id, None)
+
+        logger.info("Export finished %s", progress.summary())
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, f"[성공] 내보내기 완료 {progress.summary()} -> {path}")
+        return True
+
+    async def show_status(self, *args):
+        text = "\n--- 내보내기 상태 ---\n"
+        if not self.active:
+            text += "  진행 중인 내보내기가 없습니다.\n"
+        for progress in self.active.values():
+            text += f"  {progress.summary()}\n"
+        text += f"  요청 예산: 초당 {self.budget.rate:g}페이지 (페이지당 {EXPORT_PAGE_SIZE}개, 모든 내보내기 공유)\n"
+        text += "--------------------"
+        await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, text)
@@ -0,0 +1,103 @@
+import pickle
+import asyncio
+import logging
+
+from discord.ext import commands
+
+from models import AppState
+from core import EventManager, EventType, MemoryReport, CacheUsage, memory_profiler, deep_sizeof
+
+logger = logging.getLogger(__name__)
+
+class MemoryService:
+    """
+    '/mem' 요청을 처리합니다. 프로세스 RSS와 tracemalloc 스냅샷(상위 할당 위치, 이전 스냅샷과의 차이, 파일 저장)에
+    이 계정의 캐시 크기(AppState 목록, discord.py 내부 캐시, 이벤트 구독 수)를 더해 UI_MEMORY_SHOW_REQUEST로 발행합니다.
+    화면 스크롤백처럼 View가 가진 캐시는 View가 표시할 때 더합니다.
+    """
+    def __init__(self, bot: commands.Bot, app_state: AppState, event_manager: EventManager):
+        self.bot = bot
+        self.app_state = app_state
+        self.event_manager = event_manager
+        logger.debug("Registering event listeners...")
+        self.event_manager.subscribe(EventType.MEMORY_REPORT_REQUEST, self.report)
+        logger.info("MemoryService initialized.")
+
+    def _app_state_caches(self) -> list[CacheUsage]:
+        """AppState의 목록들. 크기는 기록이 붙잡고 있는 객체까지 따라가 잽니다. (이벤트 루프 밖에서 실행)"""
+        lists = {
+            'recent_messages': list(self.app_state.recent_messages),
+            'recent_self_messages': list(self.app_state.recent_self_messages),
+            'file_cache': list(self.app_state.file_cache),
+            'watchlist': list(self.app_state.watchlist),
+        }
+        return [CacheUsage(f"AppState.{name}", len(items), deep_sizeof(items)) for name, items in lists.items()]
+
+    def _discord_caches(self) -> list[CacheUsage]:
+        """discord.py 내부 캐시의 항목 수. 객체들이 서로를 참조하므로 바이트 수는 재지 않습니다."""
+        guilds = self.bot.guilds
+        return [
+            CacheUsage("discord.messages", len(self.bot.cached_messages), limit=self.bot.max_messages),
+            CacheUsage("discord.guilds", len(guilds)),
+            CacheUsage("discord.channels", sum(len(guild.channels) for guild in guilds)),
+            CacheUsage("discord.members", sum(len(guild.members) for guild in guilds)),
+            CacheUsage("discord.users", len(self.bot.users)),
+            CacheUsage("discord.emojis", len(self.bot.emojis)),
+            CacheUsage("discord.extra_events", sum(len(listeners) for listeners in self.bot.extra_events.values())),
+            CacheUsage("EventManager.listeners", self.event_manager.listener_count),
+        ]
+
+    async def report(self, action: str = "", value: str = "") -> bool:
+        """
+        action: ''(요약), 'start'(value: 프레임 수), 'stop', 'snapshot'(이전 스냅샷과 비교), 'diff'(value: 비교할 파일), 'dump'(파일로 저장)
+        """
+        if action == 'start':
+            memory_profiler.start(int(value) if value else 1)
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "[정보] tracemalloc 추적을 시작했습니다. '/mem snapshot'으로 스냅샷을 찍으세요.")
+            return True
+        if action == 'stop':
+            memory_profiler.stop()
+            await self.event_manager.publish(EventType.UI_TEXT_SHOW_REQUEST, "[정보] tracemalloc 추적을 멈췄습니다.")
+            return True
+
+        report = MemoryReport(
+            rss=memory_profiler.rss(),
+            peak_rss=memory_profiler.peak_rss(),
+            tracing=memory_profiler.tracing,
+            traced=memory_profiler.traced(),
+        )
+        report.caches = await asyncio.to_thread(self._app_state_caches) + self._discord_caches()
+
+        if action in ('snapshot', 'diff', 'dump'):
+            if not memory_profiler.tracing:
+                await self.event_manager.publish(EventType.ERROR, "tracemalloc이 꺼져 있습니다. '/mem start'로 켜거나 --tracemalloc으로 실행해 주세요.")
+                return False
+            try:
+                await self._snapshot(report, action, value)
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError) as e: # 잘못된 파일이나 MEMORY_DUMP_DIR 밖의 경로를 diff로 준 경우 포함
+                logger.warning("Failed to %s tracemalloc snapshot: %s", action, e)
+                await self.event_manager.publish(EventType.ERROR, f"스냅샷 처리 실패: {e}")
+                return False
+
+        logger.info("Memory report: rss=%s, tracing=%s", report.rss, report.tracing)
+        await self.event_manager.publish(EventType.UI_MEMORY_SHOW_REQUEST, report)
+        return True
+
+    async def _snapshot(self, report: MemoryReport, action: str, value: str):
+        # 스냅샷은 추적 중인 할당을 그대로 복사해야 하므로 루프에서 찍고, 통계 계산과 파일 입출력은 스레드에서 합니다.
+        snapshot = memory_profiler.take_snapshot()
+        if action == 'diff':
+            base = await asyncio.to_thread(memory_profiler.load, value)
+            report.diff_base = value
+        else:
+            base = memory_profiler.baseline
+            report.diff_base = memory_profiler.baseline_label
+        report.top = await asyncio.to_thread(memory_profiler.top, snapshot)
+        if base is not None:
+            report.diff = await asyncio.to_thread(memory_profiler.compare, snapshot, base)
+        if action == 'dump':
+            report.dump_path = await asyncio.to_thread(memory_profiler.dump, snapshot)
+        if action != 'diff':
+            # 다음 '/mem snapshot'은 이 스냅샷과 비교합니다.
+            memory_profiler.baseline = snapshot
+            memory_profiler.baseline_label = report.dump_path or "이전 스냅샷"
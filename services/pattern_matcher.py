@@ -0,0 +1,179 @@
+import re
+import logging
+from dataclasses import dataclass
+
+try:
+    from re import _parser as _sre_parse, _constants as _sre_constants # Python 3.11+
+except ImportError:
+    import sre_parse as _sre_parse, sre_constants as _sre_constants
+
+logger = logging.getLogger(__name__)
+
+# 한 번 이상 반복되는 부분의 리터럴은 필수입니다. (POSSESSIVE_REPEAT는 3.11+)
+_REPEATS = tuple(getattr(_sre_constants, name) for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT') if hasattr(_sre_constants, name))
+
+# re.IGNORECASE는 lower()만으로는 같아지지 않는 몇 문자도 ASCII 글자와 같게 봅니다. (İ, ı -> i, ſ -> s, K(켈빈) -> k는 lower()로 충분)
+# 오토마톤은 본문을 이 표로 접어서, 키워드와 필수 리터럴이 정규식과 같은 위치를 찾게 합니다.
+_CASE_FOLDS = {'\u0130': 'i', '\u0131': 'i', '\u017f': 's'}
+
+def _fold(char: str) -> str:
+    return _CASE_FOLDS.get(char) or char.lower()
+
+@dataclass(frozen=True)
+class PatternHit:
+    """본문에서 찾은 감시 패턴 하나의 위치입니다. (pattern_index는 등록 순서)"""
+    pattern_index: int
+    start: int
+    end: int
+
+
+class AhoCorasick:
+    """
+    여러 키워드를 하나의 오토마톤으로 묶어 본문을 한 번만 훑는 다중 문자열 검색기입니다.
+    검색 비용은 키워드 개수와 무관하게 본문 길이(+ 찾은 개수)에 비례합니다. 대소문자는 구분하지 않습니다.
+    """
+    def __init__(self, keywords: list[tuple[int, str]]):
+        # 상태 0은 루트입니다. 각 상태는 (문자 -> 다음 상태) 전이, 실패 링크, 출력 목록을 가집니다.
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[tuple[int, int], ...]] = [()] # (pattern_index, 키워드 길이)
+        for pattern_index, keyword in keywords:
+            self._insert(pattern_index, keyword)
+        self._build_fail_links()
+
+    def _insert(self, pattern_index: int, keyword: str):
+        if not keyword:
+            return
+        state = 0
+        # 문자 단위로 소문자화하여 본문의 위치가 원문과 어긋나지 않게 합니다.
+        for char in keyword:
+            char = _fold(char)
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] += ((pattern_index, len(keyword)),)
+
+    def _build_fail_links(self):
+        # BFS로 실패 링크를 계산하고, 실패 링크 쪽의 출력을 미리 합쳐 검색 중 링크를 따라갈 필요가 없게 합니다.
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] += self._output[self._fail[next_state]]
+
+    def search(self, text: str) -> list[PatternHit]:
+        hits = []
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for position, char in enumerate(text):
+            char = _fold(char)
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_index, length in output[state]:
+                hits.append(PatternHit(pattern_index, position + 1 - length, position + 1))
+        return hits
+
+
+def required_literal(pattern: str) -> str:
+    """
+    정규식의 모든 일치에 반드시 들어가는 가장 긴 연속 리터럴을 반환합니다. 없으면 빈 문자열입니다.
+    선택(|), 문자 클래스, 선택적 반복 안의 리터럴은 없을 수도 있으므로 쓰지 않고, 대소문자 접기가 lower()와 다를 수 있는
+    ASCII 밖의 문자에서는 리터럴을 끊습니다. 해석할 수 없는 정규식도 빈 문자열을 반환합니다.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, re.IGNORECASE)
+    except (re.error, RecursionError, TypeError):
+        return ""
+    runs: list[str] = []
+    _collect_literals(parsed, runs)
+    return max(runs, key=len, default="")
+
+def _collect_literals(items, runs: list[str]):
+    """items(해석된 정규식의 순서열)에서 연속한 리터럴을 runs에 모읍니다."""
+    run = []
+    def flush():
+        if run:
+            runs.append("".join(run))
+            run.clear()
+    for op, value in items:
+        if op is _sre_constants.LITERAL and value < 0x80:
+            run.append(chr(value))
+        elif op is _sre_constants.SUBPATTERN:
+            # 그룹 경계에서는 리터럴을 끊고 그룹 안쪽만 따로 모읍니다.
+            flush()
+            _collect_literals(value[-1], runs)
+        elif op in _REPEATS and value[0] >= 1:
+            flush()
+            _collect_literals(value[2], runs)
+        else:
+            flush()
+    flush()
+
+
+class MultiPatternMatcher:
+    """
+    키워드와 정규식을 섞은 감시 목록을 미리 컴파일해 두고 본문 하나를 검사합니다.
+
+    - 키워드와 각 정규식의 필수 리터럴(예: word\\d+의 'word')은 AhoCorasick 오토마톤 하나로 본문을 한 번만 훑어 찾습니다.
+    - 정규식은 필수 리터럴이 본문에 있을 때만 실행합니다. 대부분의 메시지는 어떤 리터럴도 포함하지 않으므로,
+      정규식 수와 관계없이 오토마톤 한 번으로 끝납니다.
+    - 필수 리터럴이 없는 정규식(예: \\d{6}, foo|bar)은 항상 따로 검사합니다.
+    """
+    def __init__(self, patterns: list[tuple[str, str]]):
+        """patterns: 등록 순서대로의 (종류, 패턴) 목록. 종류는 'keyword' 또는 'regex'입니다."""
+        self.size = len(patterns)
+        entries = [(idx, pattern) for idx, (kind, pattern) in enumerate(patterns) if kind == 'keyword']
+        # 필수 리터럴이 있는 정규식. 오토마톤에는 음수 인덱스(-1 - 위치)로 넣어 키워드와 구분합니다.
+        self._filtered: list[tuple[int, re.Pattern]] = []
+        self._unfiltered: list[tuple[int, re.Pattern]] = []
+        for idx, (kind, pattern) in enumerate(patterns):
+            if kind != 'regex':
+                continue
+            try:
+                regex = re.compile(pattern, re.IGNORECASE)
+            except re.error as e:
+                logger.warning("Skipping invalid watch regex %r: %s", pattern, e)
+                continue
+            literal = required_literal(pattern)
+            if literal:
+                entries.append((-1 - len(self._filtered), literal))
+                self._filtered.append((idx, regex))
+            else:
+                self._unfiltered.append((idx, regex))
+        if self._unfiltered:
+            logger.debug("%d watch regexes have no required literal and are scanned on every message.", len(self._unfiltered))
+        self._automaton = AhoCorasick(entries) if entries else None
+
+    def _scan(self, text: str) -> tuple[list[PatternHit], list[tuple[int, re.Pattern]]]:
+        """오토마톤으로 키워드 위치와, 필수 리터럴이 본문에 있어 실행해야 할 정규식을 (등록 순서대로) 찾습니다."""
+        keyword_hits, candidates = [], set()
+        for hit in self._automaton.search(text) if self._automaton else ():
+            if hit.pattern_index >= 0:
+                keyword_hits.append(hit)
+            else:
+                candidates.add(-1 - hit.pattern_index)
+        return keyword_hits, [self._filtered[position] for position in sorted(candidates)]
+
+    def search(self, text: str) -> list[PatternHit]:
+        """본문에서 찾은 모든 위치를 시작 위치 순으로 반환합니다."""
+        if not text:
+            return []
+        hits, candidates = self._scan(text)
+        for pattern_index, regex in candidates + self._unfiltered:
+            hits.extend(PatternHit(pattern_index, m.start(), m.end()) for m in regex.finditer(text) if m.end() > m.start())
+        hits.sort(key=lambda hit: (hit.start, hit.pattern_index))
+        return hits
@@ -0,0 +1,77 @@
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_THREAD_PAGE_SIZE = 50 # 한 번에 가져올 보관된 스레드 수 (요청 한 번, API 최대 100)
+ARCHIVED_THREAD_TTL = float(os.getenv("ARCHIVED_THREAD_TTL", "600")) # 보관된 스레드 목록을 다시 가져오기까지의 시간(초)
+
+@dataclass
+class ArchivedThreadPages:
+    """채널(또는 포럼) 하나의 보관된 스레드 중 지금까지 가져온 부분."""
+    threads: list[discord.Thread] = field(default_factory=list)
+    before: datetime | None = None # 다음 페이지의 커서 (마지막으로 받은 스레드의 보관 시각)
+    exhausted: bool = False
+    fetched_at: float = field(default_factory=time.monotonic)
+
+class ArchivedThreadCache:
+    """
+    채널/포럼별 보관된(archived) 공개 스레드 목록을 페이지 단위로 가져와 보관합니다.
+
+    활성 스레드는 Gateway 캐시(guild.threads)에 있지만 보관된 스레드는 REST로만 조회할 수 있고, 게시글이 수천 개인
+    포럼은 전부 가져오는 데 수십 번의 요청이 필요합니다. 그래서 요청받은 페이지만 가져오고, ARCHIVED_THREAD_TTL 동안은
+    같은 목록을 다시 요청하지 않습니다. 같은 채널의 페이지 요청이 겹치면 앞선 요청이 끝날 때까지 기다린 뒤 그 결과를 씁니다.
+    """
+    def __init__(self, page_size: int = ARCHIVED_THREAD_PAGE_SIZE, ttl: float = ARCHIVED_THREAD_TTL):
+        self.page_size = page_size
+        self.ttl = ttl
+        self._pages: dict[int, ArchivedThreadPages] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def get(self, channel_id: int) -> ArchivedThreadPages | None:
+        """만료되지 않은 캐시를 반환합니다. (요청하지 않음)"""
+        pages = self._pages.get(channel_id)
+        if pages is not None and time.monotonic() - pages.fetched_at > self.ttl:
+            del self._pages[channel_id]
+            return None
+        return pages
+
+    def find(self, value: int | str) -> discord.Thread | None:
+        """캐시된 보관 스레드 중 ID 또는 이름이 일치하는 스레드를 찾습니다."""
+        lowered = str(value).lower()
+        for pages in self._pages.values():
+            for thread in pages.threads:
+                if str(thread.id) == lowered or thread.name.lower() == lowered:
+                    return thread
+        return None
+
+    def invalidate(self, channel_id: int):
+        self._pages.pop(channel_id, None)
+
+    async def fetch_page(self, channel: discord.TextChannel | discord.ForumChannel, count: int) -> ArchivedThreadPages:
+        """
+        캐시된 스레드가 count개가 되도록(또는 더 없을 때까지) 다음 페이지를 가져옵니다.
+        이미 충분하면 요청하지 않습니다. 예외(권한 없음 등)는 호출자가 처리합니다.
+        """
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        async with lock:
+            pages = self.get(channel.id)
+            if pages is None:
+                pages = self._pages[channel.id] = ArchivedThreadPages()
+            while len(pages.threads) < count and not pages.exhausted:
+                started = time.perf_counter()
+                page = [thread async for thread in channel.archived_threads(limit=self.page_size, before=pages.before)]
+                logger.debug("Fetched %d archived threads of #%s in %.1f ms", len(page), channel.name, (time.perf_counter() - started) * 1000)
+                known = {thread.id for thread in pages.threads}
+                pages.threads.extend(thread for thread in page if thread.id not in known)
+                if len(page) < self.page_size:
+                    pages.exhausted = True
+                else:
+                    pages.before = page[-1].archive_timestamp
+            return pages
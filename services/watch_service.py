@@ -0,0 +1,138 @@
+import os
+import re
+import json
+import time
+import asyncio
+import logging
+
+import discord
+from discord.ext import commands
+
+from models import AppState, MessageRecord, WatchEntry
+from core import EventManager, EventType
+from .pattern_matcher import MultiPatternMatcher, PatternHit
+
+logger = logging.getLogger(__name__)
+
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", "watchlist.json")
+WATCH_THREAD_THRESHOLD = int(os.getenv("WATCH_THREAD_THRESHOLD", "4000")) # 이보다 긴 본문은 스레드에서 검사 (문자 수)
+
+class WatchService:
+    """
+    모든 서버의 새 메시지를 감시 목록(키워드/정규식)과 대조하여 일치하면 WATCH_ALERT를 발행합니다.
+
+    감시 목록은 바뀔 때마다 MultiPatternMatcher 하나로 다시 컴파일하므로, 메시지마다의 검사 비용은
+    (필수 리터럴이 없는 정규식을 빼면) 등록된 패턴 수와 무관하게 본문 길이에 비례합니다. 긴 본문은 스레드에서 검사합니다.
+    목록은 JSON 파일에 저장되어 재시작 후에도 유지됩니다.
+    """
+    def __init__(self, bot: commands.Bot, app_state: AppState, event_manager: EventManager, path: str = WATCHLIST_PATH):
+        self.bot = bot
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.path = path
+        self.app_state.watchlist = self._load()
+        self._matcher = self._compile(self.app_state.watchlist)
+        logger.debug("Registering event listeners...")
+        self.event_manager.subscribe(EventType.MESSAGE_RECEIVED, self.check_message)
+        self.event_manager.subscribe(EventType.WATCHLIST_ADD_REQUEST, self.add_entry)
+        self.event_manager.subscribe(EventType.WATCHLIST_REMOVE_REQUEST, self.remove_entry)
+        logger.info("WatchService initialized with %d patterns.", len(self.app_state.watchlist))
+
+    def _load(self) -> list[WatchEntry]:
+        if not os.path.exists(self.path):
+            return []
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return [WatchEntry.from_dict(item) for item in json.load(f)]
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.exception("Failed to load watchlist from %s. Starting with an empty watchlist.", self.path)
+            return []
+
+    def _write(self, payload: list[dict]):
+        # 쓰는 도중 종료되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    async def _save(self):
+        try:
+            await asyncio.to_thread(self._write, [entry.to_dict() for entry in self.app_state.watchlist])
+        except OSError as e:
+            logger.exception("Failed to save watchlist to %s.", self.path)
+            await self.event_manager.publish(EventType.ERROR, f"감시 목록 저장 실패: {e}")
+
+    def _compile(self, entries: list[WatchEntry]) -> MultiPatternMatcher | None:
+        if not entries:
+            return None
+        started = time.perf_counter()
+        matcher = MultiPatternMatcher([(entry.kind, entry.pattern) for entry in entries])
+        logger.debug("Compiled %d watch patterns in %.2f ms", len(entries), (time.perf_counter() - started) * 1000)
+        return matcher
+
+    async def _update(self, entries: list[WatchEntry]):
+        self.app_state.watchlist = entries
+        self._matcher = self._compile(entries)
+        await self._save()
+        await self.event_manager.publish(EventType.WATCHLIST_UPDATED)
+
+    async def add_entry(self, kind: str, pattern: str) -> bool:
+        """감시 목록에 키워드 또는 정규식을 추가합니다."""
+        pattern = pattern.strip()
+        if not pattern:
+            await self.event_manager.publish(EventType.ERROR, "감시할 키워드 또는 정규식을 입력해 주세요.")
+            return False
+        if kind == 'regex':
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                await self.event_manager.publish(EventType.ERROR, f"올바르지 않은 정규식입니다: {e}")
+                return False
+        entry = WatchEntry(kind, pattern)
+        if entry in self.app_state.watchlist:
+            await self.event_manager.publish(EventType.ERROR, f"이미 감시 중인 패턴입니다: {pattern}")
+            return False
+        logger.info("Adding watch %s: %s", kind, pattern)
+        await self._update(self.app_state.watchlist + [entry])
+        return True
+
+    async def remove_entry(self, index: int | None) -> bool:
+        """감시 목록에서 인덱스(0부터)의 항목을 제거합니다. None이면 모두 제거합니다."""
+        if index is None:
+            logger.info("Clearing watchlist (%d patterns).", len(self.app_state.watchlist))
+            await self._update([])
+            return True
+        if not (0 <= index < len(self.app_state.watchlist)):
+            await self.event_manager.publish(EventType.ERROR, "제거할 항목의 인덱스는 감시 목록 범위 안에 있어야 합니다.")
+            return False
+        entries = list(self.app_state.watchlist)
+        removed = entries.pop(index)
+        logger.info("Removing watch %s: %s", removed.kind, removed.pattern)
+        await self._update(entries)
+        return True
+
+    async def check_message(self, message: discord.Message):
+        """새 메시지를 감시 목록과 대조하고, 일치하면 WATCH_ALERT(기록, 위치, 일치 목록)를 발행합니다."""
+        matcher = self._matcher
+        if matcher is None or not message.content or message.author == self.bot.user:
+            return
+        if len(message.content) > WATCH_THREAD_THRESHOLD:
+            # 컴파일된 매처는 바뀌지 않으므로 스레드에서 검사해도 안전합니다.
+            hits: list[PatternHit] = await asyncio.to_thread(matcher.search, message.content)
+        else:
+            hits = matcher.search(message.content)
+        if not hits:
+            return
+        if not message.guild:
+            location = "DM"
+        elif isinstance(message.channel, discord.Thread):
+            # 스레드와 포럼 게시글은 부모 채널과 함께 표시합니다.
+            location = f"{message.guild.name}/#{message.channel.parent.name if message.channel.parent else message.channel.parent_id} › {message.channel.name}"
+        else:
+            location = f"{message.guild.name}/#{message.channel.name}"
+        logger.info(
+            "Watch alert in %s (message %d): %d hits",
+            location, message.id, len(hits),
+            extra={'event': 'WATCH_ALERT', 'channel_id': message.channel.id, 'message_id': message.id},
+        )
+        await self.event_manager.publish(EventType.WATCH_ALERT, MessageRecord.from_message(message), location, hits)
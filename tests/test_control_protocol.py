@@ -0,0 +1,56 @@
+import json
+import asyncio
+
+import pytest
+
+from control.protocol import build_command, validate_request
+from control.server import ClientConnection
+
+
+@pytest.mark.parametrize("request_", [
+    5, "x", [1], None,
+    {'id': [1], 'op': 'read'},
+    {'op': 5},
+    {'op': 'subscribe', 'channel_ids': 5},
+    {'op': 'subscribe', 'channel_ids': ["1"]},
+    {'op': 'send', 'text': 'hi', 'channel_id': "123"},
+])
+def test_malformed_requests_are_rejected(request_):
+    with pytest.raises(ValueError):
+        validate_request(request_)
+
+
+@pytest.mark.parametrize("request_", [
+    {'op': 'command', 'command': 5},
+    {'op': 'send', 'text': ['hi']},
+    {'op': 'read', 'limit': "20"},
+    {'op': 'read', 'limit': 1e999},
+    {'op': 'download', 'index': True},
+])
+def test_wrongly_typed_fields_are_rejected(request_):
+    with pytest.raises(ValueError):
+        build_command(request_)
+
+
+def test_valid_requests():
+    validate_request({'id': 1, 'op': 'send', 'text': 'hi', 'channel_id': 123})
+    assert build_command({'op': 'read', 'limit': 20}) == "/read 20"
+    assert build_command({'op': 'command', 'command': '/files 5'}) == "/files 5"
+
+
+def test_malformed_batch_elements_get_error_and_done():
+    connection = ClientConnection(server=None, reader=None, writer=None, max_inflight=1)
+
+    async def dispatch_all():
+        for request in [[5], "x", {'id': 7, 'op': 'command', 'command': 5}, {'id': 8, 'op': 'subscribe', 'channel_ids': 5}]:
+            await connection._dispatch(request)
+
+    asyncio.run(dispatch_all())
+    replies = []
+    while not connection._outbox.empty():
+        replies.append(json.loads(connection._outbox.get_nowait()))
+    assert [(reply['id'], reply['type']) for reply in replies] == [
+        (None, 'error'), (None, 'done'), (None, 'error'), (None, 'done'), (7, 'error'), (7, 'done'), (8, 'error'), (8, 'done'),
+    ]
+    assert all(reply['ok'] is False for reply in replies if reply['type'] == 'done')
+    assert connection.subscriptions == {}
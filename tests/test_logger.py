@@ -0,0 +1,33 @@
+import logging
+
+import pytest
+
+from core.logger import setup_logging, shutdown_logging
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+    for name in ('discord', 'discord.http'):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+
+
+def test_debug_is_disabled_on_loggers_under_info(monkeypatch, tmp_path, restore_logging):
+    monkeypatch.setenv('LOG_LEVEL', 'INFO')
+    setup_logging(str(tmp_path))
+    # 핫 패스의 isEnabledFor(DEBUG) 가드가 실제로 extra와 LogRecord 생성을 건너뛰어야 합니다.
+    for name in ('core.event_manager', 'cogs.chatbridge', 'views.tui_view', 'discord'):
+        assert not logging.getLogger(name).isEnabledFor(logging.DEBUG)
+    assert logging.getLogger('core.event_manager').isEnabledFor(logging.INFO)
+
+
+def test_debug_level_enables_debug(monkeypatch, tmp_path, restore_logging):
+    monkeypatch.setenv('LOG_LEVEL', 'DEBUG')
+    setup_logging(str(tmp_path))
+    assert logging.getLogger('core.event_manager').isEnabledFor(logging.DEBUG)
+    assert not logging.getLogger('discord.http').isEnabledFor(logging.INFO)
@@ -0,0 +1,99 @@
+import re
+
+from services.pattern_matcher import AhoCorasick, MultiPatternMatcher, PatternHit, required_literal
+
+
+def separate_hits(patterns: list[tuple[str, str]], text: str) -> list[PatternHit]:
+    """패턴을 하나씩 따로 검사한 결과. (MultiPatternMatcher가 돌려줘야 할 기준값)"""
+    hits = []
+    for idx, (kind, pattern) in enumerate(patterns):
+        regex = re.compile(re.escape(pattern) if kind == 'keyword' else pattern, re.IGNORECASE)
+        hits.extend(PatternHit(idx, m.start(), m.end()) for m in regex.finditer(text) if m.end() > m.start())
+    return sorted(hits, key=lambda hit: (hit.start, hit.pattern_index))
+
+
+def test_aho_corasick_reports_overlapping_keywords():
+    automaton = AhoCorasick([(0, "he"), (1, "she"), (2, "hers")])
+    assert sorted(automaton.search("uSHErs"), key=lambda hit: hit.pattern_index) == [
+        PatternHit(0, 2, 4), PatternHit(1, 1, 4), PatternHit(2, 2, 6),
+    ]
+
+
+def test_overlapping_regexes_are_all_reported():
+    patterns = [('regex', r'foo'), ('regex', r'foobar'), ('regex', r'o+b')]
+    text = "xx foobar foo"
+    assert MultiPatternMatcher(patterns).search(text) == separate_hits(patterns, text)
+
+
+def test_later_match_inside_earlier_regex_span_is_reported():
+    patterns = [('regex', r'a.*z'), ('regex', r'foo')]
+    text = "a foo z"
+    hits = MultiPatternMatcher(patterns).search(text)
+    assert PatternHit(1, 2, 5) in hits
+    assert hits == separate_hits(patterns, text)
+
+
+def test_required_literal_extraction():
+    assert required_literal(r'word\d+') == 'word'
+    assert required_literal(r'(?i)alert') == 'alert'
+    assert required_literal(r'(?:deploy)+-\d+ failed') == ' failed'
+    assert required_literal(r'colou?r') == 'colo'
+    assert required_literal(r'x(?:abcd)?y') == 'x'
+    # 선택, 문자 클래스만 있는 정규식과 ASCII 밖의 리터럴은 필수 리터럴이 없습니다.
+    assert required_literal(r'foo|bar') == ''
+    assert required_literal(r'\d{6}') == ''
+    assert required_literal(r'경보') == ''
+
+
+def test_regex_without_literal_is_scanned_on_every_message():
+    patterns = [('regex', r'foo|bar'), ('regex', r'deploy\d+')]
+    matcher = MultiPatternMatcher(patterns)
+    assert [idx for idx, _ in matcher._unfiltered] == [0]
+    assert [idx for idx, _ in matcher._filtered] == [1]
+    text = "bar: deploy42 failed"
+    assert matcher.search(text) == separate_hits(patterns, text)
+
+
+def test_global_flag_and_group_names_are_kept():
+    patterns = [('regex', r'(?i)alert'), ('regex', r'(?P<num>\d+)x'), ('regex', r'#(?P<num>\w+)'), ('regex', r'(\w)\1')]
+    text = "ALERT: 42x #ops book"
+    assert MultiPatternMatcher(patterns).search(text) == separate_hits(patterns, text)
+
+
+def test_regex_runs_only_when_its_literal_is_present():
+    patterns = [('regex', rf'word{i}\d+') for i in range(500)]
+    matcher = MultiPatternMatcher(patterns)
+    text = "lorem ipsum dolor sit amet " * 100
+    assert matcher._scan(text) == ([], [])
+    text += " WORD123456 "
+    _, candidates = matcher._scan(text)
+    # word1, word12, word123 ... 처럼 본문에 리터럴이 있는 정규식만 실행합니다.
+    assert [idx for idx, _ in candidates] == [1, 12, 123]
+    assert matcher.search(text) == separate_hits(patterns, text)
+
+
+def test_special_case_folds_match_like_re():
+    patterns = [('regex', r'status\d'), ('keyword', 'kiss')]
+    text = "STATUſ1 \u212a\u0131\u017fS"
+    assert MultiPatternMatcher(patterns).search(text) == separate_hits(patterns, text)
+
+
+def test_anchors_and_lookbehind_keep_their_meaning():
+    patterns = [('regex', r'zzz'), ('regex', r'^b'), ('regex', r'(?<=a)b'), ('regex', r'\bcat\b')]
+    for text in ("b ab cat", "ab concat b", "zzz ab"):
+        assert MultiPatternMatcher(patterns).search(text) == separate_hits(patterns, text)
+
+
+def test_keywords_and_regexes_mixed():
+    patterns = [('keyword', 'Release'), ('regex', r'v\d+\.\d+'), ('keyword', 'lease')]
+    text = "release v1.2 released"
+    assert MultiPatternMatcher(patterns).search(text) == separate_hits(patterns, text)
+
+
+def test_invalid_regex_is_skipped():
+    matcher = MultiPatternMatcher([('regex', r'('), ('regex', r'ok')])
+    assert matcher.search("ok") == [PatternHit(1, 0, 2)]
+
+
+def test_empty_matches_are_ignored():
+    assert MultiPatternMatcher([('regex', r'x*')]).search("abc") == []
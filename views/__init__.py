@@ -1 +1,17 @@
-from .tui_view import TUIView
+# View는 실행 모드에 따라 하나만 사용하므로, 실제로 접근할 때 임포트합니다.
+# (헤드리스 모드에서는 prompt_toolkit을 불러오지 않음)
+_LAZY_ATTRS = {
+    'TUIView': '.tui_view',
+    'HeadlessView': '.headless_view',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+def __getattr__(name: str):
+    if name in _LAZY_ATTRS:
+        import importlib
+        module = importlib.import_module(_LAZY_ATTRS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
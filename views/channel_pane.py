@@ -0,0 +1,63 @@
+import sys
+from typing import Callable
+
+from prompt_toolkit.document import Document
+from prompt_toolkit.layout.containers import HSplit, Window
+from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.widgets import TextArea
+
+class ChannelPane:
+    """
+    하나의 채널을 구독하는 메시지 창입니다.
+    최대 max_entries개의 항목만 보관하는 자체 버퍼를 가지며, 새 항목은 끝에 이어 붙이는 방식으로 반영합니다.
+    """
+    def __init__(self, title: Callable[[], str] | str, channel_id: int | None = None, max_entries: int = 1000):
+        self.channel_id = channel_id
+        self.max_entries = max_entries
+        # 매번 잘라내지 않도록 10% 여유분이 찰 때만 한 번에 잘라냅니다.
+        self._trim_threshold = max_entries + max(1, max_entries // 10)
+        self._entries: list[str] = []
+
+        self.text_area = TextArea(
+            scrollbar=True,
+            wrap_lines=True
+        )
+        self.title_control = FormattedTextControl(
+            lambda: [('class:pane.title', title() if callable(title) else title)]
+        )
+        self.container = HSplit([
+            Window(height=1, content=self.title_control, style='class:pane.title'),
+            self.text_area,
+        ])
+
+    @property
+    def buffer(self):
+        return self.text_area.buffer
+
+    def append(self, texts: list[str]):
+        """텍스트 항목들을 버퍼 끝에 추가합니다. 보관 한도를 넘으면 오래된 항목을 잘라냅니다."""
+        if not texts:
+            return
+        self._entries.extend(texts)
+        buffer = self.text_area.buffer
+        if len(self._entries) > self._trim_threshold:
+            del self._entries[:len(self._entries) - self.max_entries]
+            text = "".join(self._entries)
+            buffer.set_document(Document(text, cursor_position=len(text)), bypass_readonly=True)
+        else:
+            buffer.cursor_position = len(buffer.text)
+            buffer.insert_text("".join(texts))
+            buffer.cursor_position = len(buffer.text)
+
+    @property
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    def memory_usage(self) -> int:
+        """보관 중인 항목과 화면 버퍼의 텍스트가 차지하는 메모리(추정 바이트)입니다."""
+        return sum(sys.getsizeof(entry) for entry in self._entries) + sys.getsizeof(self.text_area.buffer.text)
+
+    def reset(self):
+        """버퍼의 모든 내용을 지웁니다."""
+        self._entries.clear()
+        self.text_area.buffer.reset()
@@ -0,0 +1,80 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+# <@id>, <@!id>, <@&id>, <#id>, <:name:id>, <a:name:id>, <t:unix[:style]> 를 한 번에 찾는 패턴
+_TOKEN_PATTERN = re.compile(
+    r"<(?:"
+    r"(?P<kind>@!?|@&|#)(?P<id>\d+)"
+    r"|a?:(?P<emoji>\w+):\d+"
+    r"|t:(?P<ts>-?\d+)(?::(?P<style>[tTdDfFR]))?"
+    r")>"
+)
+
+# 표시할 때마다 값이 달라지는 상대 시간 토큰 (<t:unix:R>)
+_RELATIVE_TIMESTAMP_PATTERN = re.compile(r"<t:-?\d+:R>")
+
+KST = timezone(timedelta(hours=9))
+
+_TIMESTAMP_FORMATS = {
+    't': "%H:%M",
+    'T': "%H:%M:%S",
+    'd': "%Y/%m/%d",
+    'D': "%Y년 %m월 %d일",
+    'f': "%Y/%m/%d %H:%M",
+    'F': "%Y/%m/%d (%a) %H:%M",
+}
+
+def _format_relative(moment: datetime, now: datetime) -> str:
+    seconds = int((now - moment).total_seconds())
+    suffix = "전" if seconds >= 0 else "후"
+    seconds = abs(seconds)
+    for unit_seconds, unit_name in ((86400, "일"), (3600, "시간"), (60, "분")):
+        if seconds >= unit_seconds:
+            return f"{seconds // unit_seconds}{unit_name} {suffix}"
+    return f"{seconds}초 {suffix}"
+
+def _format_timestamp(unix: str, style: str | None) -> str | None:
+    try:
+        moment = datetime.fromtimestamp(int(unix), tz=KST)
+    except (OverflowError, OSError, ValueError):
+        return None
+    if style == 'R':
+        return _format_relative(moment, datetime.now(tz=KST))
+    return moment.strftime(_TIMESTAMP_FORMATS.get(style or 'f', _TIMESTAMP_FORMATS['f']))
+
+def has_relative_timestamp(content: str) -> bool:
+    """본문에 상대 시간 토큰이 있는지 확인합니다. 이런 메시지의 포맷팅 결과는 시간이 지나면 달라지므로 캐시하지 않습니다."""
+    return '<t:' in content and _RELATIVE_TIMESTAMP_PATTERN.search(content) is not None
+
+def render_content(
+    content: str,
+    member_names: dict[int, str],
+    role_names: dict[int, str],
+    channel_names: dict[int, str],
+) -> str:
+    """
+    메시지 본문의 멘션/역할/채널/커스텀 이모지/타임스탬프 토큰을 한 번의 선형 스캔으로 치환합니다.
+    조회 딕셔너리에 없는 멘션은 원문 그대로 남겨둡니다.
+    """
+    if '<' not in content:
+        return content
+
+    def _substitute(match: re.Match) -> str:
+        kind = match.group('kind')
+        if kind is not None:
+            target_id = int(match.group('id'))
+            if kind == '#':
+                name = channel_names.get(target_id)
+                return f"#{name}" if name is not None else match.group(0)
+            names = role_names if kind == '@&' else member_names
+            name = names.get(target_id)
+            return f"@{name}" if name is not None else match.group(0)
+
+        emoji = match.group('emoji')
+        if emoji is not None:
+            return f":{emoji}:"
+
+        rendered = _format_timestamp(match.group('ts'), match.group('style'))
+        return rendered if rendered is not None else match.group(0)
+
+    return _TOKEN_PATTERN.sub(_substitute, content)
@@ -0,0 +1,57 @@
+import logging
+from collections import OrderedDict
+from datetime import datetime
+
+from core import deep_sizeof
+
+logger = logging.getLogger(__name__)
+
+class FormatCache:
+    """
+    포맷팅된 메시지 조각을 (message.id, edited_at) 기준으로 보관하는 LRU 캐시입니다.
+    같은 메시지를 다시 표시할 때(예: /read 재실행) 포맷팅 비용을 생략하기 위해 사용합니다.
+    상대 시간(<t:…:R>)이 있는 메시지는 결과가 시간에 따라 달라지므로 호출자(TUIView.format_message)가 넣지 않습니다.
+    """
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        # message.id -> (edited_at, formatted_list)
+        self._entries: OrderedDict[int, tuple[datetime | None, list]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def memory_usage(self) -> int:
+        """캐시된 조각이 차지하는 메모리(추정 바이트)입니다."""
+        return deep_sizeof(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get(self, message_id: int, edited_at: datetime | None) -> list | None:
+        """캐시된 조각을 반환합니다. 메시지가 그 사이에 수정되었다면 미스로 처리합니다."""
+        entry = self._entries.get(message_id)
+        if entry is None or entry[0] != edited_at:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(message_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, message_id: int, edited_at: datetime | None, formatted: list):
+        self._entries[message_id] = (edited_at, formatted)
+        self._entries.move_to_end(message_id)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, message_id: int):
+        """특정 메시지의 캐시를 제거합니다. (메시지 수정/삭제 시)"""
+        self._entries.pop(message_id, None)
+
+    def clear(self):
+        """모든 캐시를 제거합니다. (표시 이름, 역할, 채널 이름 변경 시)"""
+        logger.debug("Clearing format cache (%d entries).", len(self._entries))
+        self._entries.clear()
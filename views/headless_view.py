@@ -0,0 +1,154 @@
+import sys
+import json
+import time
+import asyncio
+import logging
+from typing import TextIO
+
+from models import AppState
+from core import EventManager, EventType, RequestContext
+from controllers import CommandExecutor
+
+from .json_event_bridge import JsonEventBridge
+
+logger = logging.getLogger(__name__)
+
+class HeadlessView:
+    """
+    터미널 UI 없이 stdin(또는 스크립트 파일)에서 명령어를 읽어 실행하고,
+    결과를 줄 단위 JSON(NDJSON)으로 stdout에 출력하는 View입니다.
+
+    입력 한 줄은 일반 텍스트('/read 20', '안녕하세요') 또는 JSON({"id": 1, "command": "/read 20"})입니다.
+    각 요청의 출력에는 요청 id가 붙고, 요청이 끝나면 {"id": ..., "type": "done"} 줄이 출력됩니다.
+    """
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        app_state: AppState,
+        event_manager: EventManager,
+        input_path: str | None = None,
+        follow: bool = False,
+        setup_commands: list[str] | None = None,
+        max_pending: int = 64,
+    ):
+        self.executor = executor
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.input_path = input_path
+        self.follow = follow
+        self.setup_commands = setup_commands or []
+        # 입력을 무한정 읽어 태스크를 쌓지 않도록 처리 중인 요청 수를 제한합니다.
+        self._pending_slots = asyncio.Semaphore(max_pending)
+        self.is_bot_ready = asyncio.Event()
+        self.is_running = True
+        self.bridge = JsonEventBridge(app_state, event_manager, self, self._write_unsolicited)
+
+    def register_event_listeners(self):
+        logger.debug("Registering headless event listeners...")
+        self.bridge.register_event_listeners()
+        self.event_manager.subscribe(EventType.BOT_STATUS_READY, self.handle_bot_ready)
+        self.event_manager.subscribe(EventType.ACCOUNT_SWITCH_REQUEST, self.handle_account_switch)
+        logger.info("Headless event listeners registered.")
+
+    async def handle_bot_ready(self, *args):
+        self.is_bot_ready.set()
+
+    async def handle_account_switch(self, *args):
+        await self.event_manager.publish(EventType.ERROR, "헤드리스 모드에서는 계정을 전환할 수 없습니다. 실행할 계정은 --account로 선택해 주세요.")
+
+    def _write(self, payload: dict, stream: TextIO | None = None):
+        stream = stream or sys.stdout
+        stream.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+        stream.flush()
+
+    def _write_unsolicited(self, payload: dict):
+        """요청과 무관한 이벤트: 새 메시지는 --follow일 때만 stdout으로, 나머지는 stderr로 출력합니다."""
+        if payload.get('type') == 'message_received':
+            if self.follow:
+                self._write(payload)
+        else:
+            self._write(payload, sys.stderr)
+
+    @staticmethod
+    def _parse_request(line: str, seq: int) -> tuple[object, str] | None:
+        """입력 한 줄을 (요청 id, 실행할 텍스트)로 변환합니다. 빈 줄과 '#' 주석은 무시합니다."""
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return None
+        if line.startswith('{'):
+            request = json.loads(line)
+            text = request.get('command') or request.get('text') or ""
+            return request.get('id', seq), text
+        return seq, line
+
+    def _submit(self, request_id, text: str) -> asyncio.Task:
+        started = time.perf_counter()
+        errors = []
+
+        def emit(payload: dict):
+            if payload.get('type') == 'error':
+                errors.append(payload)
+            self._write({'id': request_id, **payload})
+
+        task = self.executor.submit(text, RequestContext(request_id, emit, origin=self))
+
+        def on_done(task: asyncio.Task):
+            self._pending_slots.release()
+            failed = task.cancelled() or task.exception() is not None or bool(errors)
+            self._write({
+                'id': request_id,
+                'type': 'done',
+                'ok': not failed,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            })
+        task.add_done_callback(on_done)
+        return task
+
+    async def _read_lines(self):
+        """입력 스트림에서 한 줄씩 읽습니다. 블로킹 읽기는 스레드에서 수행합니다."""
+        stream = open(self.input_path, encoding='utf-8') if self.input_path else sys.stdin
+        try:
+            while True:
+                line = await asyncio.to_thread(stream.readline)
+                if not line:
+                    return
+                yield line
+        finally:
+            if self.input_path:
+                stream.close()
+
+    async def run(self):
+        logger.info("Headless mode waiting for bot to be ready.")
+        await self.is_bot_ready.wait()
+
+        for text in self.setup_commands:
+            await self._pending_slots.acquire()
+            await self._submit(f"setup:{text}", text)
+
+        seq = 0
+        quit_requested = False
+        async for line in self._read_lines():
+            seq += 1
+            try:
+                request = self._parse_request(line, seq)
+            except json.JSONDecodeError as e:
+                self._write({'id': seq, 'type': 'error', 'message': f"잘못된 JSON 입력입니다: {e}"})
+                continue
+            if request is None:
+                continue
+            await self._pending_slots.acquire()
+            task = self._submit(*request)
+            if self.executor.parse(request[1])[0] in ('/quit', '/q'):
+                quit_requested = True
+                await asyncio.wait([task])
+                break
+
+        await self.executor.drain()
+        logger.info("Headless input finished after %d lines.", seq)
+
+        if self.follow and not quit_requested:
+            # 입력이 끝난 뒤에도 종료 요청 전까지 새 메시지를 계속 출력합니다.
+            await asyncio.Event().wait()
+        if not quit_requested:
+            await self.executor.execute('/quit', '')
+        self.is_running = False
@@ -0,0 +1,214 @@
+import logging
+from typing import Callable
+
+import discord
+
+from models import AppState, MessageRecord
+from core import EventManager, EventType, MemoryReport, current_request, request_channel_id, loop_monitor
+from services.pattern_matcher import PatternHit
+
+logger = logging.getLogger(__name__)
+
+def message_to_dict(message: MessageRecord | discord.Message) -> dict:
+    """메시지(기록 또는 Discord 메시지 객체)를 JSON으로 직렬화할 수 있는 딕셔너리로 변환합니다."""
+    return MessageRecord.coerce(message).to_dict()
+
+class JsonEventBridge:
+    """
+    내부 이벤트를 JSON 딕셔너리로 변환하여 요청자에게 전달하는 View 계층 어댑터입니다.
+    헤드리스 모드와 로컬 제어 API가 공유합니다.
+
+    이벤트가 요청 처리 중에 발행되었다면(current_request) 해당 요청의 emit으로,
+    그렇지 않다면(예: 새 메시지 수신) unsolicited 콜백으로 전달합니다.
+    """
+    def __init__(self, app_state: AppState, event_manager: EventManager, owner: object, unsolicited: Callable[[dict], None]):
+        self.app_state = app_state
+        self.event_manager = event_manager
+        self.owner = owner
+        self.unsolicited = unsolicited
+
+    def emit(self, payload: dict):
+        context = current_request.get()
+        if context is None:
+            self.unsolicited(payload)
+        elif context.origin is self.owner:
+            context.emit(payload)
+        # 다른 View가 만든 요청의 이벤트는 그 View의 브리지가 전달합니다.
+
+    def register_event_listeners(self):
+        logger.debug("Registering JSON event bridge listeners...")
+        self.event_manager.subscribe(EventType.ERROR, self.handle_error)
+        self.event_manager.subscribe(EventType.UI_TEXT_SHOW_REQUEST, self.handle_show_text)
+        self.event_manager.subscribe(EventType.BOT_STATUS_READY, self.handle_bot_ready)
+        self.event_manager.subscribe(EventType.MESSAGE_RECEIVED, self.handle_new_incoming_message)
+        self.event_manager.subscribe(EventType.GUILDS_UPDATED, self.handle_guilds_updated)
+        self.event_manager.subscribe(EventType.GUILD_SELECTED, self.handle_guild_selected)
+        self.event_manager.subscribe(EventType.CHANNELS_UPDATED, self.handle_available_channels_updated)
+        self.event_manager.subscribe(EventType.THREADS_UPDATED, self.handle_threads_updated)
+        self.event_manager.subscribe(EventType.CHANNEL_SELECTED, self.handle_channel_selected)
+        self.event_manager.subscribe(EventType.MESSAGES_RECENT_UPDATED, self.handle_messages_updated)
+        self.event_manager.subscribe(EventType.MESSAGES_SEARCH_UPDATED, self.handle_search_results_updated)
+        self.event_manager.subscribe(EventType.MESSAGES_SELF_UPDATED, self.handle_self_messages_updated)
+        self.event_manager.subscribe(EventType.MESSAGE_SEND_COMPLETED, self.handle_message_sent)
+        self.event_manager.subscribe(EventType.FILE_SEND_COMPLETED, self.handle_message_sent)
+        self.event_manager.subscribe(EventType.MESSAGE_DELETE_COMPLETED, self.handle_delete_message_complete)
+        self.event_manager.subscribe(EventType.MESSAGE_EDIT_COMPLETED, self.handle_edit_message_complete)
+        self.event_manager.subscribe(EventType.FILES_LIST_UPDATED, self.handle_files_list_updated)
+        self.event_manager.subscribe(EventType.FILE_DOWNLOAD_COMPLETED, self.handle_file_download_complete)
+        self.event_manager.subscribe(EventType.UI_STATS_SHOW_REQUEST, self.handle_stats_show)
+        self.event_manager.subscribe(EventType.UI_MEMORY_SHOW_REQUEST, self.handle_memory_show)
+        self.event_manager.subscribe(EventType.WATCHLIST_UPDATED, self.handle_watchlist_updated)
+        self.event_manager.subscribe(EventType.WATCH_ALERT, self.handle_watch_alert)
+        self.event_manager.subscribe(EventType.UI_FILE_INPUT_REQUEST, self.handle_request_file_input)
+        self.event_manager.subscribe(EventType.UI_MULTILINE_INPUT_REQUEST, self.handle_unsupported_input)
+        self.event_manager.subscribe(EventType.UI_EDIT_INPUT_REQUEST, self.handle_unsupported_input)
+        self.event_manager.subscribe(EventType.UI_DISPLAY_CLEAR_REQUEST, self.handle_unsupported_input)
+        logger.info("JSON event bridge listeners registered.")
+
+    # --- Event Handlers ---
+
+    async def handle_error(self, error_message: str):
+        self.emit({'type': 'error', 'message': error_message.strip()})
+
+    async def handle_show_text(self, text: str):
+        self.emit({'type': 'info', 'text': text.strip()})
+
+    async def handle_bot_ready(self, *args):
+        self.emit({'type': 'ready'})
+
+    async def handle_new_incoming_message(self, message: discord.Message):
+        self.emit({'type': 'message_received', 'message': message_to_dict(message)})
+
+    async def handle_guilds_updated(self, *args):
+        self.emit({
+            'type': 'guilds',
+            'guilds': [{'index': idx + 1, 'id': g.id, 'name': g.name} for idx, g in enumerate(self.app_state.all_guilds)],
+        })
+
+    async def handle_guild_selected(self, guild_name: str):
+        guild = self.app_state.current_guild
+        self.emit({'type': 'guild_selected', 'id': guild.id if guild else None, 'name': guild_name})
+
+    async def handle_available_channels_updated(self, *args):
+        self.emit({
+            'type': 'channels',
+            'channels': [
+                {'index': idx + 1, 'id': ch.id, 'name': ch.name, 'kind': 'forum' if isinstance(ch, discord.ForumChannel) else 'text'}
+                for idx, ch in enumerate(self.app_state.available_channels)
+            ],
+        })
+
+    async def handle_threads_updated(self, has_more: bool = False):
+        parent = self.app_state.thread_parent
+        self.emit({
+            'type': 'threads',
+            'parent_id': parent.id if parent else None,
+            'threads': [
+                {
+                    'index': f"t{idx + 1}", 'id': thread.id, 'name': thread.name, 'archived': thread.archived,
+                    'archived_at': thread.archive_timestamp.isoformat() if thread.archived and thread.archive_timestamp else None,
+                }
+                for idx, thread in enumerate(self.app_state.available_threads)
+            ],
+            'has_more': has_more,
+        })
+
+    async def handle_channel_selected(self, channel_name: str):
+        channel = self.app_state.current_channel
+        self.emit({'type': 'channel_selected', 'id': channel.id if channel else None, 'name': channel_name})
+
+    async def handle_messages_updated(self, *args):
+        channel = self.app_state.current_channel
+        channel_id = request_channel_id()
+        self.emit({
+            'type': 'messages',
+            'channel_id': channel_id if channel_id is not None else (channel.id if channel else None),
+            'messages': [message_to_dict(msg) for msg in self.app_state.recent_messages],
+        })
+
+    async def handle_search_results_updated(self, query: str, results: list[MessageRecord]):
+        self.emit({
+            'type': 'search_results',
+            'query': query,
+            'messages': [message_to_dict(msg) for msg in results],
+        })
+
+    async def handle_self_messages_updated(self, *args):
+        self.emit({
+            'type': 'self_messages',
+            # 삭제된 메시지는 null로 두어 인덱스를 유지합니다.
+            'messages': [message_to_dict(msg) if msg is not None else None for msg in self.app_state.recent_self_messages],
+        })
+
+    async def handle_message_sent(self, message: discord.Message):
+        self.emit({'type': 'sent', 'message': message_to_dict(message)})
+
+    async def handle_delete_message_complete(self, m_id: int):
+        self.emit({'type': 'deleted', 'id': m_id})
+
+    async def handle_edit_message_complete(self, m_id: int):
+        self.emit({'type': 'edited', 'id': m_id})
+
+    async def handle_files_list_updated(self, scope: str | None = None):
+        self.emit({
+            'type': 'files',
+            'scope': scope,
+            'files': [
+                {
+                    'index': idx + 1, 'filename': att.filename, 'size': att.size, 'url': att.url,
+                    'content_type': att.content_type, 'channel_id': att.channel_id, 'message_id': att.message_id,
+                    'created_at': att.created_at.isoformat(),
+                }
+                for idx, att in enumerate(self.app_state.file_cache)
+            ],
+        })
+
+    async def handle_file_download_complete(self, file_path: str):
+        self.emit({'type': 'downloaded', 'path': file_path})
+
+    async def handle_stats_show(self, *args):
+        stats = {'event_loop': loop_monitor.stats()}
+        if loop_monitor.blocks:
+            _, stalled, stack = loop_monitor.blocks[-1]
+            stats['last_block'] = {'ms': round(stalled * 1000, 1), 'stack': stack}
+        self.emit({'type': 'stats', **stats})
+
+    async def handle_memory_show(self, report: MemoryReport):
+        self.emit({'type': 'memory', **report.to_dict()})
+
+    async def handle_watchlist_updated(self, *args):
+        self.emit({
+            'type': 'watchlist',
+            'entries': [{'index': idx + 1, **entry.to_dict()} for idx, entry in enumerate(self.app_state.watchlist)],
+        })
+
+    async def handle_watch_alert(self, record: MessageRecord, location: str, hits: list[PatternHit]):
+        watchlist = self.app_state.watchlist
+        self.emit({
+            'type': 'watch_alert',
+            'location': location,
+            'message': message_to_dict(record),
+            'hits': [
+                {
+                    'pattern': watchlist[hit.pattern_index].pattern if hit.pattern_index < len(watchlist) else None,
+                    'start': hit.start,
+                    'end': hit.end,
+                    'text': record.content[hit.start:hit.end],
+                }
+                for hit in hits
+            ],
+        })
+
+    async def handle_request_file_input(self, on_complete: Callable, initial_arg: str):
+        """대화형 입력 대신 인자('경로 [캡션]')를 그대로 사용해 파일을 전송합니다."""
+        context = current_request.get()
+        if context is None or context.origin is not self.owner:
+            return # TUI 등 다른 View에서 요청한 입력
+        parts = initial_arg.strip().split(' ', 1)
+        if not parts[0]:
+            self.emit({'type': 'error', 'message': "파일 경로를 입력해 주세요. 예: /attach ./a.png 캡션"})
+            return
+        await on_complete(parts[0], parts[1] if len(parts) > 1 else None)
+
+    async def handle_unsupported_input(self, *args):
+        self.emit({'type': 'error', 'message': "대화형 입력이 필요한 명령어는 이 모드에서 지원되지 않습니다."})
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+class RenderScheduler:
+    """
+    화면 갱신 요청을 모아 최대 FPS 이하로 한 번에 반영하는 스케줄러입니다.
+    메시지가 폭주할 때 메시지마다 다시 그리지 않고, 한 프레임에 모아서 그리도록 합니다.
+
+    - 마지막 프레임 이후 프레임 간격이 지났다면(= 한가한 상태) 다음 루프 턴에 바로 반영합니다.
+    - 그렇지 않다면 남은 간격만큼 기다린 뒤 모인 항목을 한 번에 반영합니다.
+    - 대기 중인 항목이 max_pending을 넘으면 가장 오래된 항목부터 버립니다.
+    """
+    def __init__(self, flush_callback: Callable[[list[Any], int], None], max_fps: float = 30.0, max_pending: int = 5000):
+        self.flush_callback = flush_callback
+        self.frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.max_pending = max_pending
+
+        self._pending: list[Any] = []
+        self._dropped_since_flush = 0
+        self._handle: asyncio.Handle | None = None
+        self._last_flush = 0.0
+
+        # 통계
+        self.frames_rendered = 0
+        self.frames_merged = 0
+        self.frames_dropped = 0
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def submit(self, item: Any):
+        """반영할 항목을 대기열에 추가하고, 필요하면 다음 프레임을 예약합니다."""
+        self._pending.append(item)
+        if len(self._pending) > self.max_pending:
+            overflow = len(self._pending) - self.max_pending
+            del self._pending[:overflow]
+            self._dropped_since_flush += overflow
+            self.frames_dropped += overflow
+
+        if self._handle is not None:
+            self.frames_merged += 1
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖에서는 모을 이유가 없으므로 즉시 반영합니다.
+            self.flush()
+            return
+
+        delay = self.frame_interval - (time.monotonic() - self._last_flush)
+        if delay <= 0:
+            self._handle = loop.call_soon(self.flush)
+        else:
+            self._handle = loop.call_later(delay, self.flush)
+
+    def flush(self):
+        """대기 중인 항목을 즉시 반영합니다."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pending and not self._dropped_since_flush:
+            return
+
+        items, self._pending = self._pending, []
+        dropped, self._dropped_since_flush = self._dropped_since_flush, 0
+        self._last_flush = time.monotonic()
+        self.frames_rendered += 1
+        try:
+            self.flush_callback(items, dropped)
+        except Exception:
+            logger.exception("Error while flushing %d pending render items.", len(items))
+
+    def clear(self):
+        """대기 중인 항목을 반영하지 않고 모두 버립니다."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pending.clear()
+        self._dropped_since_flush = 0
@@ -3,6 +3,9 @@ from .normal_state import NormalState
 from .multi_line_state import MultilineState
 from .file_input_state import FileInputState
 from .edit_msg_state import EditState
+from .connecting_state import ConnectingState
+from .guild_select_state import GuildSelectState
+from .channel_select_state import ChannelSelectState
 
 __all__ = [
     'AbstractTUIState',
@@ -10,4 +13,7 @@ __all__ = [
     'MultilineState',
     'FileInputState',
     'EditState',
+    'ConnectingState',
+    'GuildSelectState',
+    'ChannelSelectState',
 ]
\ No newline at end of file
@@ -0,0 +1,37 @@
+import asyncio
+from core import EventType
+from .abstract_tui_state import AbstractTUIState
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import AnyContainer
+
+class ChannelSelectState(AbstractTUIState):
+    """초기 설정: 채널을 선택하는 상태입니다. 선택 결과는 view가 selected 퓨처로 전달합니다."""
+    def __init__(self, view, selected: asyncio.Future):
+        super().__init__(view)
+        self.selected = selected
+
+    async def on_enter(self):
+        self.logger.debug("Entered ChannelSelect State")
+        self.view._add_message_to_log([('class:info', "\n--- 초기 설정: 채널 선택 ---")])
+
+    async def on_exit(self):
+        pass
+
+    async def on_accept(self, text: str):
+        if not text:
+            self.view._add_message_to_log([('class:error', "[실패] 채널 인덱스, ID 또는 이름을 입력하세요.")])
+            return
+        if text.startswith('/'):
+            self.view.submit_input(text)
+            return
+        self.logger.debug("User entering channel: '%s'", text)
+        await self.view.event_manager.publish(EventType.CHANNEL_SELECT_REQUEST, text)
+
+    def get_prompt_text(self):
+        return [('class:prompt.multiline', '채널 인덱스, ID 또는 이름 > ')]
+
+    def get_layout_container(self) -> AnyContainer:
+        return super().get_layout_container()
+
+    def get_key_bindings(self) -> KeyBindings:
+        return super().get_key_bindings()
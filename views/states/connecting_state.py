@@ -0,0 +1,28 @@
+from .abstract_tui_state import AbstractTUIState
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.layout import AnyContainer
+
+class ConnectingState(AbstractTUIState):
+    """봇이 Discord에 연결되어 READY가 될 때까지의 상태입니다. 명령어(/help, /quit 등)만 처리합니다."""
+    async def on_enter(self):
+        self.logger.debug("Entered Connecting State")
+        self.view._add_message_to_log([('class:info', "[정보] Discord에 연결하는 중입니다. 연결이 완료되면 서버 선택을 시작합니다.")])
+
+    async def on_exit(self):
+        pass
+
+    async def on_accept(self, text: str):
+        if not text: return
+        if text.startswith('/'):
+            self.view.submit_input(text)
+        else:
+            self.view._add_message_to_log([('class:info', "[정보] 아직 연결 중입니다. 잠시 후 다시 시도해 주세요.")])
+
+    def get_prompt_text(self):
+        return [('class:info', '[연결 중...]> ')]
+
+    def get_layout_container(self) -> AnyContainer:
+        return super().get_layout_container()
+
+    def get_key_bindings(self) -> KeyBindings:
+        return super().get_key_bindings()
@@ -24,7 +24,8 @@ class EditState(AbstractTUIState):
         self.view._add_message_to_log([('class:info', "[정보] 메시지 편집 모드 종료")])
 
     async def on_accept(self, text: str):
-        await self.on_complete(text)
+        executor = self.view.executor
+        executor.run(lambda: self.on_complete(text), "메시지 편집", keys=['self_messages', executor.channel_key()])
         await self.view.transition_to(NormalState(self.view))
     
     def get_prompt_text(self):
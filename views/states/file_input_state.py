@@ -34,7 +34,11 @@ class FileInputState(AbstractTUIState):
 
         # 2단계: 캡션 입력
         self.caption = text
-        await self.on_complete(self.file_path, self.caption)
+        # 업로드는 실행기에서 진행하여 그동안에도 입력을 받을 수 있게 합니다.
+        # 디렉터리는 압축하는 동안 채널 순서를 잡지 않고, 업로드할 때만 잡습니다. (DiscordBotService.send_directory)
+        file_path, caption, executor = self.file_path, self.caption, self.view.executor
+        keys = [] if executor.attach_keys_deferred(file_path) else [executor.channel_key()]
+        executor.run(lambda: self.on_complete(file_path, caption), f"파일 전송: {file_path}", keys=keys)
         await self.view.transition_to(NormalState(self.view))
 
     def get_prompt_text(self):
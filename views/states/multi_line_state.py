@@ -4,7 +4,6 @@ from .abstract_tui_state import AbstractTUIState
 from .normal_state import NormalState
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.layout import AnyContainer
-import asyncio
 
 class MultilineState(AbstractTUIState):
     def __init__(self, view, on_complete):
@@ -43,12 +42,13 @@ class MultilineState(AbstractTUIState):
             
             full_message = "\n".join(self.lines)
             
-            asyncio.create_task(self._submit_message(full_message))
+            self.view.enqueue_input(lambda: self._submit_message(full_message))
             
             self.view.input_buffer.text = ""
         
         return kb
     
     async def _submit_message(self, message):
-        await self.on_complete(message)
+        executor = self.view.executor
+        executor.run(lambda: self.on_complete(message), "여러 줄 메시지 전송", keys=[executor.channel_key()])
         await self.view.transition_to(NormalState(self.view))
\ No newline at end of file
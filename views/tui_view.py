@@ -1,44 +1,93 @@
+import os
 import asyncio
 import logging
+import functools
 import discord
 from datetime import timedelta
 from typing import Callable, List
 
-from prompt_toolkit import PromptSession
 from prompt_toolkit.application import Application
 from prompt_toolkit.buffer import Buffer
 from prompt_toolkit.key_binding import KeyBindings, merge_key_bindings
-from prompt_toolkit.layout.containers import HSplit, Window
-from prompt_toolkit.layout.controls import FormattedTextControl
+from prompt_toolkit.layout.containers import DynamicContainer, HSplit, VSplit, Window
 from prompt_toolkit.layout.layout import Layout
 from prompt_toolkit.styles import Style
 from prompt_toolkit.widgets import TextArea
 
-from models import AppState
-from core import EventManager, EventType
-from controllers import CommandController
-
-from .states import AbstractTUIState, NormalState, MultilineState, FileInputState, EditState
+from models import MessageRecord
+from core import (
+    EventType, current_request, startup_profiler, loop_monitor,
+    MemoryReport, CacheUsage, format_bytes, metrics,
+)
+from controllers import Account
+from controllers.command_executor import IMMEDIATE_COMMANDS
+from services.pattern_matcher import PatternHit
+
+from .states import (
+    AbstractTUIState, NormalState, MultilineState, FileInputState, EditState,
+    ConnectingState, GuildSelectState, ChannelSelectState,
+)
+from .format_cache import FormatCache
+from .render_scheduler import RenderScheduler
+from .channel_pane import ChannelPane
+from .content_renderer import has_relative_timestamp, render_content
 
 logger = logging.getLogger(__name__)
 
+WATCH_CONTEXT_CHARS = 40 # 감시 알림에서 일치 구간 앞뒤로 보여 줄 글자 수
+LIST_THREADS_PER_CHANNEL = 3 # 채널 목록에서 채널마다 미리 보여 줄 활성 스레드 수
+
+def channel_label(channel) -> str:
+    """채널 표시 이름. 스레드와 포럼 게시글은 부모 채널 이름을 앞에 붙입니다. (예: #공지 › 질문)"""
+    if isinstance(channel, discord.Thread):
+        parent = channel.parent.name if channel.parent else channel.parent_id
+        return f"#{parent} › {channel.name}"
+    return f"#{channel.name}"
+
 class TUIView:
-    def __init__(self, controller: CommandController, app_state: AppState, event_manager: EventManager):
-        self.controller = controller
-        self.app_state = app_state
-        self.event_manager = event_manager
+    """
+    터미널 UI입니다. 여러 계정을 함께 실행하면 그중 선택된 계정(self.account) 하나를 다루며,
+    controller/executor/app_state/event_manager는 항상 선택된 계정의 것을 가리킵니다. ('/account'로 전환)
+    """
+    def __init__(self, accounts: list[Account], account: Account):
+        self.accounts = accounts
+        self.account: Account | None = None
         self.is_running = True
         self.app = None
         
-        # 초기 설정을 위한 컴포넌트
-        self.session = PromptSession()
+        # 입력 처리 대기열: 입력 한 줄은 현재 상태의 on_accept로 순서대로 처리되고,
+        # 오래 걸리는 작업(명령어, 전송)은 실행기에 맡겨 입력이 막히지 않게 합니다.
+        self._input_queue: asyncio.Queue[Callable] = asyncio.Queue()
+        for acc in accounts:
+            acc.executor.on_jobs_changed = self._invalidate
+        
+        # 초기 설정을 위한 컴포넌트 (선택된 계정 기준, 계정을 전환하면 새로 만듭니다)
         self.is_bot_ready = asyncio.Event()
+        self._setup_task: asyncio.Task | None = None
+        
+        # 포맷팅된 메시지 캐시 (message.id, edited_at 기준)
+        self.format_cache = FormatCache()
+        
+        # 메시지 폭주 시 화면 갱신을 프레임 단위로 모아서 처리하는 스케줄러
+        self.max_fps = float(os.getenv('TUI_MAX_FPS', '30'))
+        self.render_scheduler = RenderScheduler(self._flush_message_log, max_fps=self.max_fps)
+        self._register_metrics()
         
         # TUI 컴포넌트
-        self.message_window = TextArea(
-            scrollbar=True,
-            wrap_lines=True
+        # 메인 창: 현재 채널의 메시지와 각종 안내/알림을 표시합니다.
+        self.main_pane = ChannelPane(
+            self._get_main_pane_title,
+            max_entries=int(os.getenv('TUI_MAIN_MAX_ENTRIES', '5000'))
         )
+        self.message_window = self.main_pane.text_area
+        # 추가 창: 각각 하나의 채널을 구독합니다. (/pane) 창 목록은 계정별로 따로 두고 선택된 계정의 것을 표시합니다.
+        self.pane_max_entries = int(os.getenv('TUI_PANE_MAX_ENTRIES', '500'))
+        self._account_panes: dict[str, list[ChannelPane]] = {}
+        # 계정 이름 -> (채널 ID -> 해당 채널을 표시하는 창 목록)
+        self._account_routes: dict[str, dict[int, list[ChannelPane]]] = {}
+        self.panes: list[ChannelPane] = []
+        self._pane_routes: dict[int, list[ChannelPane]] = {}
+        self._activate(account)
         
         self.input_field = TextArea(
             multiline=False,
@@ -49,7 +98,7 @@ class TUIView:
         self.input_field.buffer.accept_handler = self._accept_input_wrapper
         
         self.root_container = HSplit([
-            self.message_window,
+            DynamicContainer(self._get_panes_container),
             Window(height=1, char='-'),
             self.input_field
         ])
@@ -63,6 +112,9 @@ class TUIView:
             'error': 'bg:#ff0000 #ffffff',
             'info': '#0088ff',
             'prompt.multiline': 'bg:#00aaff #ffffff',
+            'pane.title': 'reverse',
+            'watch.alert': 'bold #ffaa00',
+            'watch.hit': 'bold reverse #ffaa00',
         })
         
         self.global_bindings = KeyBindings()
@@ -70,7 +122,7 @@ class TUIView:
         self.global_bindings.add('c-d')(self._handle_exit)
         self.global_bindings.add('tab')(self._focus_next)
         
-        self.current_state: AbstractTUIState = NormalState(self)
+        self.current_state: AbstractTUIState = ConnectingState(self)
 
     def _get_merged_key_bindings(self):
         state_bindings = self.current_state.get_key_bindings()
@@ -93,154 +145,304 @@ class TUIView:
     def _get_prompt_text(self):
         return self.current_state.get_prompt_text()
 
+    def _get_main_pane_title(self) -> str:
+        channel = self.app_state.current_channel
+        title = f" {channel_label(channel)} (메인) " if channel else " 메인 "
+        return f" [{self.account.name}]{title}" if len(self.accounts) > 1 else title
+
+    def _activate(self, account: Account):
+        """선택된 계정을 바꿉니다. 메인 창은 새 계정의 현재 채널을 구독하고, 추가 창은 새 계정의 창 목록으로 바뀝니다."""
+        self._unbind_pane(self.main_pane.channel_id, self.main_pane)
+        self.main_pane.channel_id = None
+        self.account = account
+        self.controller = account.controller
+        self.executor = account.executor
+        self.app_state = account.app_state
+        self.event_manager = account.event_manager
+        self.panes = self._account_panes.setdefault(account.name, [])
+        self._pane_routes = self._account_routes.setdefault(account.name, {})
+        self.is_bot_ready = asyncio.Event()
+        if account.app_state.is_bot_ready:
+            self.is_bot_ready.set()
+        self._rebind_main_pane()
+
+    def _get_panes_container(self):
+        """메인 창과 추가 창들을 좌우로 나란히 배치합니다."""
+        if not self.panes:
+            return self.main_pane.container
+        children = [self.main_pane.container]
+        for pane in self.panes:
+            children.append(Window(width=1, char='|'))
+            children.append(pane.container)
+        return VSplit(children)
+
+    def _bind_pane(self, channel_id: int, pane: ChannelPane):
+        self._pane_routes.setdefault(channel_id, []).append(pane)
+
+    def _unbind_pane(self, channel_id: int | None, pane: ChannelPane):
+        if channel_id is None:
+            return
+        routes = self._pane_routes.get(channel_id)
+        if routes and pane in routes:
+            routes.remove(pane)
+            if not routes:
+                del self._pane_routes[channel_id]
+
+    def _rebind_main_pane(self):
+        """현재 채널이 바뀌었을 때 메인 창의 구독 채널을 갱신합니다."""
+        channel = self.app_state.current_channel
+        new_id = channel.id if channel else None
+        if self.main_pane.channel_id == new_id:
+            return
+        self._unbind_pane(self.main_pane.channel_id, self.main_pane)
+        self.main_pane.channel_id = new_id
+        if new_id is not None:
+            self._bind_pane(new_id, self.main_pane)
+
     def _accept_input_wrapper(self, buffer: Buffer) -> bool:
         user_input = buffer.text.strip()
-        asyncio.create_task(self.current_state.on_accept(user_input))
+        # 입력 시점이 아닌 처리 시점의 상태로 처리합니다. (앞선 입력이 상태를 바꿀 수 있음)
+        self.enqueue_input(lambda: self.current_state.on_accept(user_input))
 
         buffer.text = ""
         return True
 
-    async def _process_input_async(self, user_input: str):
-        try:
-            if user_input.startswith('/'):
-                parts = user_input.split(' ', 1)
-                command = parts[0].lower()
-                arg = parts[1] if len(parts) > 1 else ""
-                if await self.controller.handle_command(command, arg):
-                    self.is_running = False
-                    if self.app: self.app.exit()
-            else:
-                await self.event_manager.publish(EventType.MESSAGE_SEND_REQUEST, user_input)
-        except Exception as e:
-            logger.exception("Error processing user input: %s", user_input)
-            await self.handle_error(f"Input processing error: {e}")
+    def enqueue_input(self, factory: Callable):
+        """입력 처리 코루틴을 대기열에 넣습니다. 입력 루프가 들어온 순서대로 하나씩 실행합니다."""
+        self._input_queue.put_nowait(factory)
+
+    async def _input_loop(self):
+        while True:
+            factory = await self._input_queue.get()
+            try:
+                await factory()
+            except Exception as e:
+                logger.exception("Error processing user input")
+                await self.handle_error(f"Input processing error: {e}")
+
+    def _on_first_render(self, _):
+        startup_profiler.mark("first_frame")
+        self.app.after_render -= self._on_first_render
+
+    def _invalidate(self):
+        if self.app and self.app.is_running:
+            self.app.invalidate()
 
     def _handle_exit(self, _):
         self.is_running = False
         if self.app: self.app.exit()
 
+    def _local_only(self, callback: Callable) -> Callable:
+        """
+        외부 요청(헤드리스/제어 API 등, current_request가 설정된 경우)으로 발생한 이벤트는 무시하도록 감쌉니다.
+        출력이나 입력 모드 전환처럼 요청자에게만 의미가 있는 핸들러에 사용합니다.
+        """
+        @functools.wraps(callback)
+        async def wrapper(*args, **kwargs):
+            if current_request.get() is not None:
+                return
+            result = callback(*args, **kwargs)
+            if asyncio.iscoroutine(result):
+                await result
+        return wrapper
+
+    def _for_account(self, account: Account, callback: Callable, background: Callable | None = None) -> Callable:
+        """
+        선택된 계정에서 발행된 이벤트만 callback으로 처리하도록 감쌉니다.
+        다른 계정의 이벤트는 background(account, ...)가 있으면 그것으로 처리하고, 없으면 무시합니다.
+        """
+        @functools.wraps(callback)
+        async def wrapper(*args, **kwargs):
+            if account is self.account:
+                result = callback(*args, **kwargs)
+            elif background is not None:
+                result = background(account, *args, **kwargs)
+            else:
+                return
+            if asyncio.iscoroutine(result):
+                await result
+        return wrapper
+
     def register_event_listeners(self):
         logger.debug("Registering TUI event listeners...")
-        self.event_manager.subscribe(EventType.BOT_STATUS_READY, self.handle_bot_ready)
-        self.event_manager.subscribe(EventType.ERROR, self.handle_error)
-        self.event_manager.subscribe(EventType.UI_TEXT_SHOW_REQUEST, self.handle_show_text)
-        self.event_manager.subscribe(EventType.UI_DISPLAY_CLEAR_REQUEST, self.handle_clear_display)
-        self.event_manager.subscribe(EventType.MESSAGE_RECEIVED, self.handle_new_incoming_message)
-        self.event_manager.subscribe(EventType.GUILDS_UPDATED, self.handle_guilds_updated)
-        self.event_manager.subscribe(EventType.GUILD_SELECTED, self.handle_guild_selected)
-        self.event_manager.subscribe(EventType.CHANNELS_UPDATED, self.handle_available_channels_updated)
-        self.event_manager.subscribe(EventType.CHANNEL_SELECTED, self.handle_channel_selected)
-        self.event_manager.subscribe(EventType.MESSAGES_RECENT_UPDATED, self.handle_messages_updated)
-        self.event_manager.subscribe(EventType.MESSAGES_SELF_UPDATED, self.handle_self_messages_updated)
-        self.event_manager.subscribe(EventType.MESSAGE_DELETE_COMPLETED, self.handle_delete_message_complete)
-        self.event_manager.subscribe(EventType.UI_EDIT_INPUT_REQUEST, self._handle_edit_message)
-        self.event_manager.subscribe(EventType.MESSAGE_EDIT_COMPLETED, self._handle_edit_message_complete)
-        self.event_manager.subscribe(EventType.UI_MULTILINE_INPUT_REQUEST, self.handle_request_multiline_input)
-        self.event_manager.subscribe(EventType.UI_FILE_INPUT_REQUEST, self.handle_request_file_input)
-        self.event_manager.subscribe(EventType.FILES_LIST_UPDATED, self.handle_files_list_updated)
-        self.event_manager.subscribe(EventType.FILE_DOWNLOAD_COMPLETED, self.handle_file_download_complete)
+        for account in self.accounts:
+            self._register_account_listeners(account)
+        logger.info("TUI event listeners registered for %d accounts.", len(self.accounts))
+
+    def _register_account_listeners(self, account: Account):
+        subscribe = account.event_manager.subscribe
+        local = self._local_only
+        active = functools.partial(self._for_account, account)
+        # 포맷 캐시 무효화: 메시지 ID는 계정과 무관하므로 모든 계정의 이벤트를 처리합니다.
+        subscribe(EventType.MESSAGE_UPDATED, self.handle_message_updated)
+        subscribe(EventType.MESSAGE_DELETED, self.handle_message_deleted)
+        subscribe(EventType.DISPLAY_NAMES_UPDATED, self.handle_display_names_updated)
+        # 상태 동기화 핸들러: 요청 출처와 관계없이 항상 처리합니다. (다른 계정의 연결/새 메시지/감시 알림은 따로 처리)
+        subscribe(EventType.BOT_STATUS_READY, active(self.handle_bot_ready, self._handle_background_ready))
+        subscribe(EventType.MESSAGE_RECEIVED, active(self.handle_new_incoming_message, self._handle_background_message))
+        subscribe(EventType.WATCH_ALERT, active(self.handle_watch_alert, self._handle_background_watch_alert))
+        subscribe(EventType.GUILD_SELECTED, active(self.handle_guild_selected))
+        subscribe(EventType.CHANNEL_SELECTED, active(self.handle_channel_selected))
+        subscribe(EventType.PANE_OPENED, active(self.handle_pane_opened))
+        subscribe(EventType.PANE_CLOSED, active(self.handle_pane_closed))
+        # 출력/입력 핸들러: TUI에서 요청한 경우에만 처리합니다.
+        # 안내와 오류는 다른 계정에서 끝난 작업(예: /export)의 결과일 수 있으므로 계정 이름을 붙여 표시합니다.
+        subscribe(EventType.ERROR, local(active(self.handle_error, self._handle_background_error)))
+        subscribe(EventType.UI_TEXT_SHOW_REQUEST, local(active(self.handle_show_text, self._handle_background_text)))
+        subscribe(EventType.ACCOUNT_SWITCH_REQUEST, local(active(self.handle_account_switch)))
+        subscribe(EventType.UI_DISPLAY_CLEAR_REQUEST, local(active(self.handle_clear_display)))
+        subscribe(EventType.GUILDS_UPDATED, local(active(self.handle_guilds_updated)))
+        subscribe(EventType.CHANNELS_UPDATED, local(active(self.handle_available_channels_updated)))
+        subscribe(EventType.THREADS_UPDATED, local(active(self.handle_threads_updated)))
+        subscribe(EventType.MESSAGES_RECENT_UPDATED, local(active(self.handle_messages_updated)))
+        subscribe(EventType.MESSAGES_SEARCH_UPDATED, local(active(self.handle_search_results_updated)))
+        subscribe(EventType.MESSAGES_SELF_UPDATED, local(active(self.handle_self_messages_updated)))
+        subscribe(EventType.MESSAGE_DELETE_COMPLETED, local(active(self.handle_delete_message_complete)))
+        subscribe(EventType.UI_EDIT_INPUT_REQUEST, local(active(self._handle_edit_message)))
+        subscribe(EventType.MESSAGE_EDIT_COMPLETED, local(active(self._handle_edit_message_complete)))
+        subscribe(EventType.UI_MULTILINE_INPUT_REQUEST, local(active(self.handle_request_multiline_input)))
+        subscribe(EventType.UI_FILE_INPUT_REQUEST, local(active(self.handle_request_file_input)))
+        subscribe(EventType.FILES_LIST_UPDATED, local(active(self.handle_files_list_updated)))
+        subscribe(EventType.FILE_DOWNLOAD_COMPLETED, local(active(self.handle_file_download_complete)))
+        subscribe(EventType.UI_STATS_SHOW_REQUEST, local(active(self.handle_stats_show)))
+        subscribe(EventType.UI_MEMORY_SHOW_REQUEST, local(active(self.handle_memory_show)))
+        subscribe(EventType.WATCHLIST_UPDATED, local(active(self.handle_watchlist_updated)))
         # self.event_manager.subscribe(EventType.UI_FILE_PREVIEW_SHOW, self.handle_unsupported_feature)
-        logger.info("TUI event listeners registered.")
 
     async def run_tui(self):
-        # 1. 봇 준비 대기
-        print("Waiting for bot to be ready...")
-        await self.is_bot_ready.wait()
-        print("Bot is ready. Starting initial setup.")
-
-        # 2. 초기 설정 (CLI 방식)
-        if not await self._initial_setup():
-            logger.error("Initial setup failed. Exiting application.")
-            print("초기 설정에 실패하여 프로그램을 종료합니다.")
-            return
-
-        # 3. TUI 애플리케이션 실행
-        self._add_message_to_log([('class:info', "[정보] 명령어 도움말은 '/help'를 입력해 주세요.")])
+        # 1. TUI 애플리케이션을 즉시 띄웁니다. (gateway READY를 기다리지 않음)
         self.app = Application(
             layout=self.layout,
             key_bindings=self._get_merged_key_bindings(),
             style=self.style,
             full_screen=True,
-            mouse_support=True
+            mouse_support=True,
+            min_redraw_interval=1.0 / self.max_fps if self.max_fps > 0 else None,
         )
+        await self.current_state.on_enter()
+        if startup_profiler.enabled:
+            self.app.after_render += self._on_first_render
+
+        # 2. 초기 설정 (TUI 내부 상태로 진행)
+        self._start_initial_setup()
+        input_task = asyncio.create_task(self._input_loop())
+
         logger.info("TUI main loop starting.")
-        await self.app.run_async()
+        try:
+            await self.app.run_async()
+        finally:
+            self._setup_task.cancel()
+            input_task.cancel()
         logger.info("TUI main loop finished.")
 
+    def _start_initial_setup(self):
+        """선택된 계정의 초기 설정(서버/채널 선택)을 시작합니다. 진행 중이던 다른 계정의 초기 설정은 취소합니다."""
+        if self._setup_task is not None:
+            self._setup_task.cancel()
+        self._setup_task = asyncio.create_task(self._initial_setup())
+
     async def _initial_setup(self) -> bool:
-        logger.debug("Starting initial setup process.")
-        logger.debug("--- Initial Setup: Select Guild ---")
-        print("\n--- 초기 설정: 서버 선택 ---")
-        await self.controller._list_guilds("")
-        
-        while True:
-            guild_input = await self.session.prompt_async("서버 인덱스, ID 또는 이름을 입력하세요: ")
-            guild_input = guild_input.strip()
-            
-            if not guild_input:
-                print("[실패] 서버 인덱스, ID 또는 이름을 입력하세요.")
-                continue
-            
-            logger.debug("User entereing guild: '%s'", guild_input)
-            await self.event_manager.publish(EventType.GUILD_SELECT_REQUEST, guild_input)
-            await asyncio.sleep(0) # 이벤트 핸들러가 app_state를 업데이트할 시간을 줌
-            
-            if self.app_state.current_guild:
-                logger.info("Guild '%s' selected successfully.", self.app_state.current_guild.name)
-                break
-            logger.warning("Failed to select guild with input: '%s'. Retrying", guild_input)
-            print("[실패] 다시 시도해 주세요.")
-
-        logger.debug("--- Initial Setup: Select Channel ---")
-        print("\n--- 초기 설정: 채널 선택 ---")
-        while True:
-            channel_input = await self.session.prompt_async("채널 인덱스, ID 또는 이름을 입력하세요: ")
-            channel_input = channel_input.strip()
-            
-            if not channel_input:
-                print("[실패] 채널 인덱스, ID 또는 이름을 입력하세요.")
-                continue
-            
-            logger.debug("User entereing channel: '%s'", channel_input)
-            await self.event_manager.publish(EventType.CHANNEL_SELECT_REQUEST, channel_input)
-            await asyncio.sleep(0) # 이벤트 핸들러가 app_state를 업데이트할 시간
-            
-            if self.app_state.current_channel:
-                logger.info("Channel '%s' selected successfully.", self.app_state.current_channel.name)
-                return True
-            logger.warning("Failed to select channel with input: '%s'. Retrying.", channel_input)
-            print("[실패] 다시 시도해 주세요.")
-        return False
+        """봇이 준비되면 서버와 채널 선택 상태를 차례로 거쳐 일반 상태로 전환합니다."""
+        try:
+            await self.is_bot_ready.wait()
+            loop = asyncio.get_running_loop()
+
+            logger.debug("--- Initial Setup: Select Guild ---")
+            guild_selected = loop.create_future()
+            await self.transition_to(GuildSelectState(self, guild_selected))
+            await self.controller._list_guilds("")
+            guild_name = await guild_selected
+            logger.info("Guild '%s' selected successfully.", guild_name)
+
+            logger.debug("--- Initial Setup: Select Channel ---")
+            channel_selected = loop.create_future()
+            await self.transition_to(ChannelSelectState(self, channel_selected))
+            channel_name = await channel_selected
+            logger.info("Channel '%s' selected successfully.", channel_name)
+
+            await self.transition_to(NormalState(self))
+            self._add_message_to_log([('class:info', "[정보] 명령어 도움말은 '/help'를 입력해 주세요.")])
+            return True
+        except asyncio.CancelledError:
+            logger.debug("Initial setup cancelled.")
+            return False
+
+    def submit_input(self, text: str) -> bool:
+        """
+        명령어 또는 일반 메시지를 실행기에 제출하고 바로 반환합니다.
+        처리 중인 작업이 너무 많으면 제출하지 않고 False를 반환합니다.
+        """
+        command, _ = self.executor.parse(text)
+        if self.executor.is_saturated and command not in IMMEDIATE_COMMANDS | {'/quit', '/q'}:
+            self._display_info(f"[ERROR] 처리 중인 작업이 너무 많습니다({self.executor.in_flight}개). 잠시 후 다시 시도하거나 '/cancel'로 작업을 취소하세요.", 'class:error')
+            return False
+        task = self.executor.submit(text)
+        task.add_done_callback(self._on_input_task_done)
+        return True
+
+    def _on_input_task_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+        if task.exception():
+            # 상세 내용은 실행기가 로그로 남깁니다.
+            self._display_info(f"[ERROR] Input processing error: {task.exception()}", 'class:error')
+            return
+        if task.result():
+            self.is_running = False
+            if self.app: self.app.exit()
 
-    def _add_message_to_log(self, message_parts: List[tuple]):
-        buffer = self.message_window.buffer
-        buffer.cursor_position = len(buffer.text)
+    def _add_message_to_log(self, message_parts: List[tuple], pane: ChannelPane | None = None):
         plain_text = "".join(part[1] for part in message_parts) + "\n"
-        buffer.insert_text(plain_text)
-        buffer.cursor_position = len(buffer.text)
+        item = (pane or self.main_pane, plain_text)
+        if self.app and self.app.is_running:
+            # 실행 중에는 스케줄러가 모아서 프레임 단위로 한 번에 반영합니다.
+            self.render_scheduler.submit(item)
+        else:
+            self._flush_message_log([item], 0)
+
+    def _flush_message_log(self, items: List[tuple], dropped: int):
+        """모인 텍스트를 창별로 묶어 창마다 한 번의 삽입으로 반영합니다."""
+        batches: dict[ChannelPane, list[str]] = {}
+        if dropped:
+            batches[self.main_pane] = [f"[정보] 화면 갱신이 밀려 {dropped}줄을 생략했습니다.\n"]
+        for pane, text in items:
+            batches.setdefault(pane, []).append(text)
+        for pane, texts in batches.items():
+            pane.append(texts)
 
     def _display_info(self, text: str, style: str = ''):
-        if self.app and self.app.is_running:
+        # 앱이 시작되기 전에는 창 버퍼에 쌓아 두었다가 화면이 뜰 때 보여 주고, 앱이 종료된 뒤에는 터미널에 출력합니다.
+        if self.app is None or self.app.is_running:
             self._add_message_to_log([(style, text)])
         else:
             print(text)
 
-    def format_message(self, message: discord.Message) -> list:
-        """Discord 메시지 객체를 TUI에 표시할 서식 있는 텍스트 튜플 리스트로 포맷팅합니다."""
-        timestamp = (message.created_at + timedelta(hours=9)).strftime("%m/%d %H:%M:%S")
+    def format_message(self, message: MessageRecord | discord.Message) -> list:
+        """
+        메시지(기록 또는 Discord 메시지 객체)를 TUI에 표시할 서식 있는 텍스트 튜플 리스트로 포맷팅합니다.
+        같은 (message.id, edited_at)에 대해서는 캐시된 결과를 반환합니다. 상대 시간(<t:…:R>)이 있는 메시지는 매번 포맷팅합니다.
+        """
+        if has_relative_timestamp(message.content or ""):
+            return self._render_message(MessageRecord.coerce(message))
+        formatted_list = self.format_cache.get(message.id, message.edited_at)
+        if formatted_list is None:
+            formatted_list = self._render_message(MessageRecord.coerce(message))
+            self.format_cache.put(message.id, message.edited_at, formatted_list)
+        return formatted_list
+
+    def _render_message(self, record: MessageRecord) -> list:
+        """캐시를 거치지 않고 메시지 기록을 포맷팅합니다."""
+        timestamp = (record.created_at + timedelta(hours=9)).strftime("%m/%d %H:%M:%S")
         
-        content = message.content or ""
-        # --- Content & Mentions
-        for member in message.mentions:
-            display_name = member.display_name
-            content = content.replace(f"<@{member.id}>", f"@{display_name}")
-            content = content.replace(f"<@!{member.id}>", f"@{display_name}")
-        for role in message.role_mentions:
-            content = content.replace(f"<@&{role.id}>", f"@{role.name}")
-        for channel in message.channel_mentions:
-            content = content.replace(f"<#{channel.id}>", f"#{channel.name}")
+        # --- Content & Mentions (단일 패스 치환)
+        content = render_content(
+            record.content or "",
+            dict(record.mention_names),
+            dict(record.role_names),
+            dict(record.channel_names),
+        )
         
-        author_display = message.author.display_name
+        author_display = record.author_name
         
         # TUI용 포맷팅된 리스트 생성
         formatted_list = [
@@ -252,30 +454,29 @@ class TUIView:
             formatted_list.append(('',content))
         
         # --- Attachments ---
-        if message.attachments:
-            attachment_texts = [f"📁 {att.filename}" for att in message.attachments]
+        if record.attachments:
+            attachment_texts = [f"📁 {att.filename}" for att in record.attachments]
             separator = "\n" if content else ""
             attachment_str = f"{separator}[Attachment(s): {', '.join(attachment_texts)}]";
             formatted_list.append(('class:attachment', attachment_str))
         
         # --- Embeds ---
-        if message.embeds:
-            for embed in message.embeds:
-                # Title
-                if embed.title:
-                    formatted_list.append(('class:embed_title', f"\n📌 {embed.title}"))
-                
-                # Description
-                if embed.description:
-                    formatted_list.append(('class:embed_desc', f"\n{embed.description}"))
-
-                # Fields
-                for field in embed.fields:
-                    formatted_list.append(('class:embed_field', f"\n-{field.name}: {field.value}"))
-                
-                # Footer
-                if embed.footer and embed.footer.text:
-                    formatted_list.append(('class:embed_footer', f"\n*{embed.footer.text}*"))
+        for embed in record.embeds:
+            # Title
+            if embed.title:
+                formatted_list.append(('class:embed_title', f"\n📌 {embed.title}"))
+            
+            # Description
+            if embed.description:
+                formatted_list.append(('class:embed_desc', f"\n{embed.description}"))
+
+            # Fields
+            for name, value in embed.fields:
+                formatted_list.append(('class:embed_field', f"\n-{name}: {value}"))
+            
+            # Footer
+            if embed.footer:
+                formatted_list.append(('class:embed_footer', f"\n*{embed.footer}*"))
         
         return formatted_list
 
@@ -296,13 +497,90 @@ class TUIView:
     async def handle_clear_display(self, *args):
         logger.debug("Handling CLEAR_DISPLAY event.")
         if self.message_window:
-            self.message_window.buffer.reset()
+            self.render_scheduler.clear()
+            self.main_pane.reset()
+            for pane in self.panes:
+                pane.reset()
         self._add_message_to_log([('class:info', "[정보] 화면의 모든 메시지가 지워졌습니다.")])
 
     async def handle_bot_ready(self, *args):
-        logger.info("Handling BOT_READY event. TUI is now unblocked.")
+        logger.info("Handling BOT_READY event. Initial setup is now unblocked.")
+        if not self.is_bot_ready.is_set():
+            self._add_message_to_log([('class:info', "[정보] 봇이 준비되었습니다.")])
         self.is_bot_ready.set()
 
+    async def _handle_background_ready(self, account: Account, *args):
+        self._display_info(f"[정보] [{account.name}] 봇이 준비되었습니다. '/account {account.name}'으로 전환할 수 있습니다.", 'class:info')
+
+    async def _handle_background_text(self, account: Account, text: str):
+        self._display_info(f"[{account.name}] {text.lstrip()}", 'class:info')
+
+    async def _handle_background_error(self, account: Account, error_message: str):
+        self._display_info(f"[ERROR] [{account.name}] {error_message}", 'class:error')
+
+    async def _handle_background_message(self, account: Account, message):
+        """선택되지 않은 계정의 새 메시지는 그 계정의 추가 창에만 반영하고 알림은 띄우지 않습니다."""
+        self._route_message(self._account_routes.get(account.name, {}), message)
+
+    def _route_message(self, routes: dict[int, list[ChannelPane]], message) -> bool:
+        """
+        메시지를 그 채널을 표시하는 창들에 추가하고, 표시한 창이 있으면 True를 반환합니다.
+        스레드 메시지는 스레드를 연 창이 없으면 부모 채널의 창에 스레드 이름을 붙여 표시합니다.
+        """
+        panes = routes.get(message.channel.id)
+        if panes:
+            formatted_message = self.format_message(message)
+        elif isinstance(message.channel, discord.Thread) and routes.get(message.channel.parent_id):
+            panes = routes[message.channel.parent_id]
+            # 포맷 캐시의 리스트는 공유되므로 새 리스트를 만듭니다.
+            formatted_message = [('class:info', f"[스레드: {message.channel.name}] "), *self.format_message(message)]
+        else:
+            return False
+        for pane in panes:
+            self._add_message_to_log(formatted_message, pane)
+        return True
+
+    async def _handle_background_watch_alert(self, account: Account, record: MessageRecord, location: str, hits: list[PatternHit]):
+        await self.handle_watch_alert(record, f"{account.name}:{location}", hits)
+
+    async def handle_account_switch(self, value: str):
+        """계정 목록을 표시하거나(값이 없을 때), 인덱스 또는 이름으로 선택한 계정으로 전환합니다."""
+        if not value:
+            text = "\n--- 계정 목록 ---\n"
+            for idx, account in enumerate(self.accounts):
+                current_indicator = " (현재 선택됨)" if account is self.account else ""
+                status = "" if account.app_state.is_bot_ready else " [연결 중]"
+                text += f"  [{idx + 1}] {account.label}{status}{current_indicator}\n"
+            text += "전환하려면 '/account <인덱스|이름>'을 입력하세요.\n"
+            text += "-----------------"
+            self._display_info(text)
+            return
+        if value.isdigit() and 1 <= int(value) <= len(self.accounts):
+            account = self.accounts[int(value) - 1]
+        else:
+            account = next((acc for acc in self.accounts if acc.name == value), None)
+        if account is None:
+            await self.handle_error(f"계정을 찾을 수 없습니다: {value} ('/account'로 목록을 확인하세요)")
+            return
+        if account is self.account:
+            self._display_info(f"[정보] 이미 선택된 계정입니다: {account.label}")
+            return
+
+        logger.info("Switching TUI account from '%s' to '%s'.", self.account.name, account.name)
+        self._activate(account)
+        self.layout.focus(self.input_field)
+        self._display_info(f"\n[성공] 계정을 전환했습니다: {account.label}")
+        if account.app_state.current_channel is None:
+            # 서버/채널을 아직 고르지 않은 계정이면 그 계정의 초기 설정을 진행합니다.
+            if not self.is_bot_ready.is_set():
+                await self.transition_to(ConnectingState(self))
+            self._start_initial_setup()
+        else:
+            if self._setup_task is not None:
+                self._setup_task.cancel()
+            await self.transition_to(NormalState(self))
+        self._invalidate()
+
     async def handle_guilds_updated(self, *args):
         logger.debug("Handling GUILDS_UPDATED event.")
         text = "\n--- 서버 목록 ---\n"
@@ -316,41 +594,135 @@ class TUIView:
 
     async def handle_guild_selected(self, guild_name: str):
         logger.debug("Handling GUILD_SELECTED event for guild: %s", guild_name)
+        self._rebind_main_pane()
         self._display_info(f"\n[성공] 서버가 설정되었습니다: {guild_name}")
+        if isinstance(self.current_state, GuildSelectState) and not self.current_state.selected.done():
+            self.current_state.selected.set_result(guild_name)
 
     async def handle_available_channels_updated(self, *args):
-        text = f"\n--- 채널 목록 (서버: {self.app_state.current_guild.name}) ---\n"
+        """
+        텍스트/포럼 채널 목록을 표시합니다. 활성 스레드는 Gateway 캐시에서 채널마다 몇 개만 미리 보여 주며,
+        전체 목록과 보관된 스레드는 '/threads'로 봅니다. (목록을 표시할 때 요청을 보내지 않습니다.)
+        """
+        guild = self.app_state.current_guild
+        text = f"\n--- 채널 목록 (서버: {guild.name}) ---\n"
         channels = self.app_state.available_channels
+        current = self.app_state.current_channel
+        threads_by_parent: dict[int, list[discord.Thread]] = {}
+        for thread in sorted(guild.threads, key=lambda thread: thread.id, reverse=True):
+            if not thread.archived:
+                threads_by_parent.setdefault(thread.parent_id, []).append(thread)
         if not channels:
             text += "  사용 가능한 텍스트 채널이 없습니다."
         else:
             for idx, channel in enumerate(channels):
-                current_indicator = " (현재 선택됨)" if self.app_state.current_channel and self.app_state.current_channel.id == channel.id else ""
-                text += f"  [{idx + 1}] #{channel.name} (ID: {channel.id}){current_indicator}\n"
+                current_indicator = " (현재 선택됨)" if current and current.id == channel.id else ""
+                kind = " [포럼]" if isinstance(channel, discord.ForumChannel) else ""
+                text += f"  [{idx + 1}] #{channel.name}{kind} (ID: {channel.id}){current_indicator}\n"
+                threads = threads_by_parent.get(channel.id, [])
+                for thread in threads[:LIST_THREADS_PER_CHANNEL]:
+                    current_indicator = " (현재 선택됨)" if current and current.id == thread.id else ""
+                    text += f"        › {thread.name} (ID: {thread.id}){current_indicator}\n"
+                if len(threads) > LIST_THREADS_PER_CHANNEL:
+                    text += f"        › ... 활성 스레드 {len(threads) - LIST_THREADS_PER_CHANNEL}개 더 ('/threads {idx + 1}')\n"
+        text += "스레드와 포럼 게시글은 '/threads <채널>'로 목록을 보고 '/setchannel t<번호>'로 선택하세요.\n"
+        text += "-------------------------------------------"
+        self._display_info(text)
+
+    async def handle_threads_updated(self, has_more: bool = False):
+        """'/threads' 결과를 표시합니다. 번호는 '/setchannel t<번호>', '/pane add t<번호>'에 씁니다."""
+        logger.debug("Handling THREADS_UPDATED event.")
+        parent = self.app_state.thread_parent
+        threads = self.app_state.available_threads
+        current = self.app_state.current_channel
+        kind = "게시글" if isinstance(parent, discord.ForumChannel) else "스레드"
+        text = f"\n--- {kind} 목록 (#{parent.name}) ---\n"
+        if not threads:
+            text += f"  {kind}이(가) 없습니다.\n"
+        for idx, thread in enumerate(threads):
+            if thread.archived and thread.archive_timestamp:
+                status = f"보관됨 {thread.archive_timestamp.astimezone():%Y-%m-%d}"
+            else:
+                status = "활성"
+            current_indicator = " (현재 선택됨)" if current and current.id == thread.id else ""
+            text += f"  [t{idx + 1}] {thread.name} ({status}, ID: {thread.id}){current_indicator}\n"
+        if has_more:
+            text += f"보관된 {kind}이(가) 더 있습니다. '/threads more'로 다음 페이지를 가져옵니다.\n"
         text += "-------------------------------------------"
         self._display_info(text)
 
     async def handle_channel_selected(self, channel_name: str):
         logger.debug("Handling CHANNEL_SELECTED event.")
-        self._display_info(f"\n[성공] 채널이 설정되었습니다: #{channel_name}")
+        self._rebind_main_pane()
+        self._display_info(f"\n[성공] 채널이 설정되었습니다: {channel_label(self.app_state.current_channel) if self.app_state.current_channel else '#' + channel_name}")
+        if isinstance(self.current_state, ChannelSelectState) and not self.current_state.selected.done():
+            self.current_state.selected.set_result(channel_name)
 
     async def handle_messages_updated(self, *args):
         logger.debug("Handling MESSAGES_UPDATED event for channel: %s", self.app_state.current_channel.name)
+        self._rebind_main_pane()
         self._add_message_to_log([('class:info', f"--- 최근 메시지 (채널: #{self.app_state.current_channel.name}) ---")])
         for msg in self.app_state.recent_messages:
             formatted_msg = self.format_message(msg)
             self._add_message_to_log(formatted_msg)
 
     async def handle_new_incoming_message(self, message):
-        logger.debug("Handling NEW_INCOMING_MESSAGE event from channel #%s", message.channel.name)
-        if self.app_state.current_channel and message.channel.id == self.app_state.current_channel.id:
-            formatted_message = self.format_message(message)
-            self._add_message_to_log(formatted_message)
-        else:
-            notification = [('class:info', f"[새 메시지 @{message.guild.name}/#{message.channel.name}]")]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Handling NEW_INCOMING_MESSAGE event from channel #%s", message.channel.name,
+                extra={'event': 'MESSAGE_RECEIVED', 'channel_id': message.channel.id, 'message_id': message.id},
+            )
+        if not self._route_message(self._pane_routes, message):
+            notification = [('class:info', f"[새 메시지 @{message.guild.name}/{channel_label(message.channel)}]")]
             self._add_message_to_log(notification)
             self._add_message_to_log([('class:info', "----------------------------------------")])
 
+    async def handle_watchlist_updated(self, *args):
+        """감시 목록을 TUI에 표시합니다."""
+        logger.debug("Handling WATCHLIST_UPDATED event.")
+        text = "\n--- 감시 목록 ---\n"
+        if not self.app_state.watchlist:
+            text += "  감시 중인 패턴이 없습니다. '/watch add <키워드>' 또는 '/watch regex <정규식>'으로 추가하세요.\n"
+        for idx, entry in enumerate(self.app_state.watchlist):
+            kind = "정규식" if entry.kind == 'regex' else "키워드"
+            text += f"  [{idx + 1}] ({kind}) {entry.pattern}\n"
+        text += "-----------------"
+        self._display_info(text)
+
+    async def handle_watch_alert(self, record: MessageRecord, location: str, hits: list[PatternHit]):
+        """감시 패턴과 일치한 메시지를 일치한 부분을 강조하여 주변 문맥과 함께 표시합니다."""
+        logger.debug("Handling WATCH_ALERT event for message %s", record.id)
+        content = record.content
+        matched = sorted({content[hit.start:hit.end] for hit in hits}, key=str.lower)
+        self._add_message_to_log([
+            ('class:watch.alert', f"[감시 알림 @{location}] {record.author_name}: "),
+            ('class:watch.alert', ", ".join(matched)),
+        ])
+        # 첫 일치 위치부터 마지막 일치 위치까지에 앞뒤 문맥을 붙여 보여 줍니다.
+        start = max(0, hits[0].start - WATCH_CONTEXT_CHARS)
+        end = min(len(content), max(hit.end for hit in hits) + WATCH_CONTEXT_CHARS)
+        line = [('', "  " + ("…" if start > 0 else ""))]
+        cursor = start
+        for hit in hits:
+            if hit.start < cursor: # 겹치는 일치는 이미 강조된 구간에 포함됩니다.
+                continue
+            line.append(('', content[cursor:hit.start]))
+            line.append(('class:watch.hit', content[hit.start:hit.end]))
+            cursor = hit.end
+        line.append(('', content[cursor:end] + ("…" if end < len(content) else "")))
+        self._add_message_to_log(line)
+        self._add_message_to_log([('class:timestamp', f"  (ID: {record.id}, 채널 ID: {record.channel_id})")])
+
+    async def handle_search_results_updated(self, query: str, results: list[MessageRecord]):
+        """검색 결과 메시지를 TUI에 표시합니다."""
+        logger.debug("Handling MESSAGES_SEARCH_UPDATED event.")
+        self._add_message_to_log([('class:info', f"--- 검색 결과: '{query}' ({len(results)}건) ---")])
+        if not results:
+            self._add_message_to_log([('', "  최근 메시지에서 검색어를 찾지 못했습니다.")])
+        for msg in results:
+            self._add_message_to_log(self.format_message(msg))
+        self._add_message_to_log([('class:info', "--------------------------------------------------")])
+
     async def handle_self_messages_updated(self, *args):
         """캐시된 자신의 메시지 목록을 TUI에 표시합니다."""
         logger.debug("Handling SELF_MESSAGES_UPDATED event.")
@@ -359,10 +731,13 @@ class TUIView:
             self._add_message_to_log([('', "  최근 메시지에서 찾은 자신의 메시지가 없습니다.")])
         else:
             for idx, msg in enumerate(self.app_state.recent_self_messages):
+                if msg is None:
+                    self._add_message_to_log([('class:timestamp', f"  [{idx + 1}] (삭제됨)")])
+                    continue
                 # 메시지의 내용이 너무 길 수 있으므로 최대 20자까지만 표시하도록 함
-                self._add_message_to_log([('', f"  [{idx + 1}] {msg.content[:20]}")])
+                self._add_message_to_log([('', f"  [{idx + 1}] {msg.content[:20]}"), ('class:timestamp', f"  (ID: {msg.id})")])
             self._add_message_to_log([('class:info', "--------------------------------------------------")])
-            self._add_message_to_log([('', "편집하기 위해서는 '/edit <인덱스>'를 삭제하기 위해서는 '/delete <인덱스>'를 입력하세요.")])
+            self._add_message_to_log([('', "편집하기 위해서는 '/edit <인덱스|ID|링크>'를 삭제하기 위해서는 '/delete <인덱스|ID|링크>'를 입력하세요.")])
 
     async def handle_delete_message_complete(self, m_id: int):
         logger.debug("Handling DELETE_MESSAGE_COMPLETE event.")
@@ -372,32 +747,54 @@ class TUIView:
         logger.debug("Handling MESSAGE_EDIT_COMPLETED event.")
         self._display_info(f"\n[Success] edit message id: {m_id}")
 
+    def _in_initial_setup(self) -> bool:
+        """
+        서버/채널 선택 중이면 안내를 표시하고 True를 반환합니다.
+        선택 상태를 벗어나면 초기 설정이 기다리는 selected 퓨처가 완료되지 않으므로 입력 상태로 전환하지 않습니다.
+        """
+        if isinstance(self.current_state, (GuildSelectState, ChannelSelectState)):
+            self._display_info("[ERROR] 초기 설정(서버/채널 선택)을 마친 뒤에 사용할 수 있습니다.", 'class:error')
+            return True
+        return False
+
     async def _handle_edit_message(self, on_complete: Callable, message_to_edit: str):
         """메시지 수정 상태에 진입합니다."""
         logger.debug("Handling UI_EDIT_INPUT_REQUEST event.")
+        if self._in_initial_setup():
+            return
         await self.transition_to(EditState(self, on_complete, message_to_edit))
 
     async def handle_request_file_input(self, on_complete: Callable, initial_arg: str):
         """파일 첨부 상태에 진입합니다."""
         logger.debug("Handling UI_FILE_INPUT_REQUEST event.")
+        if self._in_initial_setup():
+            return
         await self.transition_to(FileInputState(self, on_complete, initial_arg))
 
     async def handle_request_multiline_input(self, on_complete: Callable):
         """다중 라인 입력 상태에 진입합니다."""
         logger.debug("Handling UI_MULTILINE_INPUT_REQUEST event.")
+        if self._in_initial_setup():
+            return
         await self.transition_to(MultilineState(self, on_complete))
 
-    async def handle_files_list_updated(self, *args):
-        """캐시된 파일 목록을 TUI에 표시합니다."""
+    async def handle_files_list_updated(self, scope: str | None = None):
+        """캐시된 파일 목록을 TUI에 표시합니다. scope가 있으면(로컬 색인 검색) 파일마다 채널과 날짜를 함께 표시합니다."""
         logger.debug("Handling FILES_LIST_UPDATED event.")
-        self._add_message_to_log([('class:info', f"--- 최근 파일 목록 (채널: #{self.app_state.current_channel.name}) ---")])
+        title = scope or f"채널: #{self.app_state.current_channel.name}"
+        self._add_message_to_log([('class:info', f"--- 최근 파일 목록 ({title}) ---")])
         if not self.app_state.file_cache:
-            self._add_message_to_log([('', "  최근 메시지에서 찾은 파일이 없습니다.")])
+            self._add_message_to_log([('', "  조건에 맞는 파일이 없습니다.")])
         else:
+            channel_names = {ch.id: ch.name for ch in [*self.app_state.available_channels, *self.app_state.available_threads]}
             for idx, attachment in enumerate(self.app_state.file_cache):
                 size_kb = attachment.size / 1024
                 size_str = f"{size_kb / 1024:.2f} MB" if size_kb > 1024 else f"{size_kb:.2f} KB"
-                self._add_message_to_log([('', f"  [{idx + 1}] {attachment.filename} ({size_str})")])
+                line = [('', f"  [{idx + 1}] {attachment.filename} ({size_str})")]
+                if scope:
+                    channel = channel_names.get(attachment.channel_id, attachment.channel_id)
+                    line.append(('class:timestamp', f"  #{channel} {attachment.created_at.astimezone():%Y-%m-%d %H:%M}"))
+                self._add_message_to_log(line)
             self._add_message_to_log([('class:info', "--------------------------------------------------")])
             self._add_message_to_log([('', "다운로드하려면 '/download <인덱스>'를 입력하세요.")])
 
@@ -405,3 +802,114 @@ class TUIView:
         """파일 다운로드 완료 메시지를 TUI에 표시합니다."""
         logger.info("Handling FILE_DOWNLOAD_COMPLETE event for path: %s", file_path)
         self._add_message_to_log([('class:info', f"\n[성공] 파일이 성공적으로 다운로드 되었습니다. -> 저장 경로: {file_path}")])
+
+    async def handle_message_updated(self, message: discord.Message):
+        logger.debug("Handling MESSAGE_UPDATED event for message %s", message.id)
+        self.format_cache.invalidate(message.id)
+
+    async def handle_message_deleted(self, message_id: int):
+        logger.debug("Handling MESSAGE_DELETED event for message %s", message_id)
+        self.format_cache.invalidate(message_id)
+
+    async def handle_display_names_updated(self, *args):
+        """멤버 표시 이름, 역할 이름, 채널 이름이 바뀌면 포맷 캐시 전체를 비웁니다."""
+        logger.debug("Handling DISPLAY_NAMES_UPDATED event.")
+        self.format_cache.clear()
+
+    async def handle_stats_show(self, *args):
+        """TUI 내부 통계를 표시합니다."""
+        logger.debug("Handling UI_STATS_SHOW_REQUEST event.")
+        cache = self.format_cache
+        text = "\n--- TUI 통계 ---\n"
+        text += f"  메시지 포맷 캐시: {len(cache)}/{cache.max_size}개, "
+        text += f"적중 {cache.hits} / 미스 {cache.misses} (적중률 {cache.hit_rate:.1%})\n"
+        scheduler = self.render_scheduler
+        text += f"  화면 갱신: 최대 {self.max_fps:g} FPS, 렌더 {scheduler.frames_rendered}프레임, "
+        text += f"병합 {scheduler.frames_merged}건, 생략 {scheduler.frames_dropped}줄, 대기 {scheduler.pending_count}줄\n"
+        if loop_monitor.enabled:
+            loop = loop_monitor.stats()
+            text += f"  이벤트 루프({loop['loop']}): 지연 평균 {loop['mean_ms']}ms / p99 {loop['p99_ms']}ms / 최대 {loop['max_ms']}ms, "
+            text += f"차단 {loop['blocks']}회 (기준 {loop_monitor.block_threshold * 1000:.0f}ms)\n"
+            if loop_monitor.blocks:
+                _, stalled, stack = loop_monitor.blocks[-1]
+                # 스택의 마지막 프레임들이 루프를 막고 있던 코드입니다.
+                text += f"  최근 차단({stalled * 1000:.0f}ms) 위치:\n" + "".join(stack.splitlines(keepends=True)[-6:])
+        else:
+            text += "  이벤트 루프: 측정하지 않음 (--loop-monitor로 실행)\n"
+        text += "----------------"
+        self._display_info(text)
+
+    def _register_metrics(self):
+        """화면 갱신 대기열과 포맷 캐시를 지표로 내보냅니다. (수집할 때 읽으므로 평소 비용은 없습니다.)"""
+        cache, scheduler = self.format_cache, self.render_scheduler
+        metrics.gauge("tui_render_pending_lines", "Lines waiting for the next TUI frame.").set_function(lambda: scheduler.pending_count)
+        metrics.counter("tui_render_frames_total", "TUI frames rendered.").set_function(lambda: scheduler.frames_rendered)
+        metrics.counter("tui_render_dropped_lines_total", "Lines dropped because rendering fell behind.").set_function(lambda: scheduler.frames_dropped)
+        metrics.gauge("tui_format_cache_entries", "Formatted messages in the TUI format cache.").set_function(lambda: len(cache))
+        metrics.counter("tui_format_cache_hits_total", "TUI format cache hits.").set_function(lambda: cache.hits)
+        metrics.counter("tui_format_cache_misses_total", "TUI format cache misses.").set_function(lambda: cache.misses)
+
+    def _view_caches(self) -> list[CacheUsage]:
+        """View가 보관하는 캐시: 모든 계정의 채널 창 스크롤백, 메시지 포맷 캐시, 화면 갱신 대기열."""
+        panes = [self.main_pane] + [pane for panes in self._account_panes.values() for pane in panes]
+        return [
+            CacheUsage("TUI.scrollback", sum(pane.entry_count for pane in panes), sum(pane.memory_usage() for pane in panes)),
+            CacheUsage("TUI.format_cache", len(self.format_cache), self.format_cache.memory_usage(), self.format_cache.max_size),
+            CacheUsage("TUI.render_queue", self.render_scheduler.pending_count),
+        ]
+
+    async def handle_memory_show(self, report: MemoryReport):
+        """'/mem' 결과를 표시합니다."""
+        logger.debug("Handling UI_MEMORY_SHOW_REQUEST event.")
+        text = "\n--- 메모리 ---\n"
+        text += f"  RSS: {format_bytes(report.rss)} (최대 {format_bytes(report.peak_rss)})\n"
+        if report.traced:
+            text += f"  tracemalloc: 현재 {format_bytes(report.traced[0])} / 최대 {format_bytes(report.traced[1])}\n"
+        else:
+            text += "  tracemalloc: 꺼짐 ('/mem start' 또는 --tracemalloc으로 실행)\n"
+        text += "  캐시:\n"
+        for cache in report.caches + self._view_caches():
+            limit = f"/{cache.limit}" if cache.limit else ""
+            size = f", {format_bytes(cache.size)}" if cache.size is not None else ""
+            text += f"    {cache.name}: {cache.count}{limit}개{size}\n"
+        if report.top:
+            text += "  할당 상위 위치:\n"
+            for stat in report.top:
+                frame = stat.traceback[0]
+                text += f"    {format_bytes(stat.size):>10} ({stat.count}개) {frame.filename}:{frame.lineno}\n"
+        if report.top or report.diff_base:
+            if report.diff:
+                text += f"  변화량 (기준: {report.diff_base}):\n"
+                for stat in report.diff:
+                    frame = stat.traceback[0]
+                    text += f"    {'+' if stat.size_diff > 0 else '-'}{format_bytes(abs(stat.size_diff)):>10} ({stat.count_diff:+d}개) {frame.filename}:{frame.lineno}\n"
+            elif report.diff_base:
+                text += f"  변화량 (기준: {report.diff_base}): 없음\n"
+            else:
+                text += "  변화량: 비교할 이전 스냅샷이 없습니다. 다시 '/mem snapshot'을 실행하면 비교합니다.\n"
+        if report.dump_path:
+            text += f"  스냅샷 저장: {report.dump_path}\n"
+        text += "-------------"
+        self._display_info(text)
+
+    async def handle_pane_opened(self, channel: discord.TextChannel | discord.Thread, messages: list[MessageRecord]):
+        """채널(또는 스레드)을 구독하는 추가 창을 열고, 처음 한 번만 가져온 최근 메시지를 채웁니다."""
+        logger.debug("Handling PANE_OPENED event for channel #%s", channel.name)
+        title = f" {channel_label(channel)} ({channel.guild.name}) "
+        pane = ChannelPane(title, channel_id=channel.id, max_entries=self.pane_max_entries)
+        self.panes.append(pane)
+        self._bind_pane(channel.id, pane)
+        for msg in messages:
+            self._add_message_to_log(self.format_message(msg), pane)
+        self._display_info(f"[성공] {channel_label(channel)} 채널 창을 열었습니다. (창 {len(self.panes)}개)")
+
+    async def handle_pane_closed(self, channel_id: int):
+        """해당 채널을 구독하는 추가 창을 닫습니다."""
+        logger.debug("Handling PANE_CLOSED event for channel %s", channel_id)
+        for pane in list(self.panes):
+            if pane.channel_id == channel_id:
+                self._unbind_pane(channel_id, pane)
+                self.panes.remove(pane)
+        # 닫힌 창에 포커스가 남아있지 않도록 입력창으로 되돌립니다.
+        self.layout.focus(self.input_field)
+        self._display_info(f"[성공] 채널 창을 닫았습니다. (창 {len(self.panes)}개)")